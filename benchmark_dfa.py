@@ -0,0 +1,182 @@
+# benchmark_dfa.py
+# Este archivo mide el rendimiento de los AFD de dfa_validators.py: compara el recorrido sobre la
+# tabla compilada (DFA.validate) con el recorrido original sobre el diccionario de transiciones,
+# con millones de cadenas sintéticas, y comprueba que ambos den exactamente los mismos resultados.
+# También compara CreditCardDFA.validate, de un solo recorrido, con la validación anterior de cuatro
+# pasadas (expresión regular, split, int y AFD), y comprueba que den los mismos veredictos, y mide el
+# costo de la verificación del dígito verificador (check_digit=True) en ambos validadores.
+#
+# Uso: python benchmark_dfa.py [cantidad_de_cadenas] [semilla]
+# Por omisión se generan 1,000,000 de cadenas por validador (tarjeta de crédito y CURP). Si NumPy está
+# instalado, también se mide DFA.validate_batch sobre las mismas cadenas y se comparan sus resultados.
+
+import random # Generador reproducible de las cadenas de prueba.
+import re
+import sys
+import time
+from typing import Callable, List, Tuple
+from dfa_validators import DFA, CreditCardDFA, CURPDFA, error_code
+
+DEFAULT_COUNT = 1_000_000
+INVALID_FRACTION = 0.5 # Fracción de cadenas que se alteran para que fallen en alguna posición.
+
+def validate_with_dict(dfa: DFA, input_string: str) -> Tuple[bool, str, int]:
+    """
+    Recorrido original de DFA.validate, sobre el diccionario de transiciones: una búsqueda en el
+    alfabeto y otra en el diccionario (con una tupla como clave) por carácter. Es la referencia
+    contra la que se mide, y se comparan, los resultados de la tabla compilada.
+    """
+    current_state = dfa.start_state
+    for i, char in enumerate(input_string):
+        if char not in dfa.alphabet:
+            return False, f"Carácter inválido: '{char}'", i
+        current_state = dfa.transitions.get((current_state, char), 'E')
+        if current_state == 'E' and 'E' not in dfa.accept_states:
+            return False, f"Transición a estado de error en '{char}'", i
+    if current_state in dfa.accept_states:
+        return True, "", -1
+    return False, f"Estado final {current_state} no es de aceptación", len(input_string)
+
+def validate_card_in_four_passes(card: CreditCardDFA, input_string: str) -> Tuple[bool, str, int]:
+    """
+    Validación anterior de CreditCardDFA.validate: la expresión regular del formato, split e int para la
+    fecha, y el recorrido del AFD. Solo se llega al AFD con formato y fecha válidos, donde el AFD de
+    card (que ya incluye las reglas de la fecha) da el mismo resultado que el AFD de entonces.
+    """
+    if not re.match(r'^\d{4} \d{4} \d{4} \d{4} \d{2}/\d{4} \d{3}$', input_string):
+        return False, "Formato inválido: debe ser dddd dddd dddd dddd mm/aaaa cvv", 0
+    month_str, year_str = input_string.split(' ')[4].split('/')
+    try:
+        month, year = int(month_str), int(year_str)
+    except ValueError:
+        return False, "Formato de fecha inválido (no numérico)", input_string.find('/')
+    if not (1 <= month <= 12 and year >= 2025):
+        return False, "Mes o año inválido", input_string.find('/')
+    return card.dfa.validate(input_string)
+
+def luhn_check_digit(digits: str) -> str:
+    """El dígito que completa los 15 dígitos dados a un número válido según Luhn."""
+    total = 0
+    for i, char in enumerate(reversed(digits)): # Se duplican los dígitos en posiciones pares desde la derecha.
+        value = int(char) * (2 if i % 2 == 0 else 1)
+        total += value - 9 if value > 9 else value
+    return str(-total % 10)
+
+def curp_check_digit(curp: str) -> str:
+    """El dígito verificador de RENAPO para los primeros 17 caracteres de una CURP."""
+    values = '0123456789ABCDEFGHIJKLMNÑOPQRSTUVWXYZ'
+    return str(-sum(values.index(char) * (18 - i) for i, char in enumerate(curp[:17])) % 10)
+
+def random_credit_card(rnd: random.Random) -> str:
+    """Una tarjeta con el formato dddd dddd dddd dddd mm/aaaa cvv y un número válido según Luhn."""
+    digits = ''.join(rnd.choice('0123456789') for _ in range(15))
+    digits += luhn_check_digit(digits)
+    groups = ' '.join(digits[i:i + 4] for i in range(0, 16, 4))
+    return f"{groups} {rnd.randint(1, 12):02d}/{rnd.randint(2025, 2035)} {rnd.randint(0, 999):03d}"
+
+def random_curp(rnd: random.Random) -> str:
+    """Una CURP con el formato AAAAmmddHXXCCCNNDV y el dígito verificador correcto."""
+    letters = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+    curp = (''.join(rnd.choice(letters) for _ in range(4)) + f"{rnd.randint(0, 999999):06d}" + rnd.choice('HM')
+            + ''.join(rnd.choice(letters) for _ in range(5)) + rnd.choice(letters + '0123456789'))
+    return curp + curp_check_digit(curp)
+
+def generate_inputs(make_valid: Callable[[random.Random], str], alphabet: str, count: int, seed: int) -> List[str]:
+    """
+    Genera `count` cadenas: válidas, y una fracción INVALID_FRACTION alteradas en una posición al azar
+    (un símbolo del alfabeto, un carácter fuera de él o un corte), para que los errores caigan en
+    todas las posiciones y el recorrido se detenga en cualquier punto.
+    """
+    rnd = random.Random(seed)
+    inputs = []
+    for _ in range(count):
+        text = make_valid(rnd)
+        if rnd.random() < INVALID_FRACTION:
+            i = rnd.randrange(len(text))
+            change = rnd.random()
+            if change < 0.6:
+                text = text[:i] + rnd.choice(alphabet) + text[i + 1:]
+            elif change < 0.8:
+                text = text[:i] + rnd.choice('-.ñx') + text[i + 1:]
+            else:
+                text = text[:i]
+        inputs.append(text)
+    return inputs
+
+def measure(validate: Callable[[str], Tuple[bool, str, int]], inputs: List[str]) -> Tuple[float, list]:
+    """Valida todas las cadenas y retorna los segundos transcurridos y la lista de resultados."""
+    start = time.perf_counter()
+    results = [validate(text) for text in inputs]
+    return time.perf_counter() - start, results
+
+def benchmark(name: str, dfa: DFA, inputs: List[str]):
+    dict_seconds, dict_results = measure(lambda text: validate_with_dict(dfa, text), inputs)
+    table_seconds, table_results = measure(dfa.validate, inputs)
+    if table_results != dict_results:
+        mismatch = next(i for i, pair in enumerate(zip(table_results, dict_results)) if pair[0] != pair[1])
+        sys.exit(f"{name}: resultados distintos para '{inputs[mismatch]}': "
+                 f"tabla {table_results[mismatch]}, diccionario {dict_results[mismatch]}")
+    valid = sum(1 for is_valid, _, _ in table_results if is_valid)
+    print(f"{name}: {len(inputs):,} cadenas ({valid:,} válidas), resultados idénticos")
+    for label, seconds in (("diccionario", dict_seconds), ("tabla", table_seconds)):
+        print(f"  {label:11}: {seconds:7.2f} s, {len(inputs) / seconds:12,.0f} cadenas/s")
+    print(f"  aceleración : x{dict_seconds / table_seconds:.2f}")
+
+    try:
+        import numpy # noqa: F401 -- validate_batch lo importa; aquí solo se comprueba que esté instalado.
+    except ImportError:
+        return
+    start = time.perf_counter()
+    valid, codes, positions = dfa.validate_batch(inputs)
+    batch_seconds = time.perf_counter() - start
+    # Los códigos de validate_batch, comparados con los mensajes de validate.
+    expected_codes = [error_code(error_msg) for _, error_msg, _ in table_results]
+    if (valid.tolist() != [is_valid for is_valid, _, _ in table_results] or codes.tolist() != expected_codes
+            or positions.tolist() != [error_pos for _, _, error_pos in table_results]):
+        sys.exit(f"{name}: validate_batch no coincide con validate")
+    print(f"  {'lote':11}: {batch_seconds:7.2f} s, {len(inputs) / batch_seconds:12,.0f} cadenas/s "
+          f"(x{dict_seconds / batch_seconds:.1f} sobre el diccionario)")
+
+def benchmark_card_passes(inputs: List[str], examples_file: str = 'credit_cards.txt'):
+    """
+    Compara CreditCardDFA.validate con validate_card_in_four_passes: el tiempo sobre `inputs` y los veredictos
+    sobre `inputs` y sobre las líneas de examples_file. Las posiciones y mensajes de error pueden diferir:
+    la validación de un solo recorrido señala el carácter exacto del error.
+    """
+    card = CreditCardDFA()
+    passes_seconds, passes_results = measure(lambda text: validate_card_in_four_passes(card, text), inputs)
+    fused_seconds, fused_results = measure(card.validate, inputs)
+    with open(examples_file, 'r', encoding='utf-8') as file:
+        examples = [line.strip() for line in file if line.strip()]
+    for text, old, new in zip(inputs + examples, passes_results + [validate_card_in_four_passes(card, text) for text in examples],
+                              fused_results + [card.validate(text) for text in examples]):
+        if old[0] != new[0]:
+            sys.exit(f"Credit Card: veredictos distintos para '{text}': cuatro pasadas {old}, un recorrido {new}")
+    print(f"Credit Card (validate completo): {len(inputs):,} cadenas y {len(examples)} de {examples_file}, mismos veredictos")
+    for label, seconds in (("4 pasadas", passes_seconds), ("1 recorrido", fused_seconds)):
+        print(f"  {label:11}: {seconds:7.2f} s, {len(inputs) / seconds:12,.0f} cadenas/s")
+    print(f"  aceleración : x{passes_seconds / fused_seconds:.2f}")
+    for text in examples:
+        is_valid, error_msg, error_pos = card.validate(text)
+        print(f"  '{text}': " + ("válida" if is_valid else f"inválida en la posición {error_pos} ({error_msg})"))
+
+def benchmark_check_digit(name: str, validator_class, inputs: List[str]):
+    """Mide validate con y sin check_digit sobre las mismas cadenas."""
+    seconds = {}
+    for check_digit in (False, True):
+        seconds[check_digit], results = measure(validator_class(check_digit=check_digit).validate, inputs)
+        valid = sum(1 for is_valid, _, _ in results if is_valid)
+        print(f"{name}, check_digit={check_digit!s:5}: {seconds[check_digit]:7.2f} s, "
+              f"{len(inputs) / seconds[check_digit]:12,.0f} cadenas/s, {valid:,} válidas")
+    print(f"  costo del dígito verificador: {(seconds[True] / seconds[False] - 1) * 100:+.1f} %")
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COUNT
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    card_inputs = generate_inputs(random_credit_card, '0123456789 /', count, seed)
+    benchmark("Credit Card", CreditCardDFA().dfa, card_inputs)
+    benchmark_card_passes(card_inputs)
+    curp_inputs = generate_inputs(random_curp, 'ABHMZ0189', count, seed)
+    benchmark("CURP", CURPDFA().dfa, curp_inputs)
+    benchmark_check_digit("Credit Card", CreditCardDFA, card_inputs)
+    benchmark_check_digit("CURP", CURPDFA, curp_inputs)
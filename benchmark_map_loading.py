@@ -0,0 +1,67 @@
+"""
+Compares loading a map from JSON and from the binary format of universe_binary.py: the time and
+peak resident memory of reading the file alone, of building InterstellarMissionCore from it, and of
+building it plus the per-cell search tables that the first solve builds (see _ensure_search_tables).
+
+Usage: python benchmark_map_loading.py [map.json ...]
+Without maps, the bundled matriz_universo.json is used. Each map is converted to a temporary .umap
+file first. Every measurement runs in a fresh interpreter, so its peak RSS belongs to that load
+only; the "+RSS" column subtracts the interpreter's peak once the modules are imported (NumPy
+included, for both formats). Reading a binary map is lazy: the grid is only paged in by the core.
+"""
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+REPEATS = 3
+
+def _measure(map_path: str, stage: str):
+    """Child process: loads map_path once and prints seconds, peak RSS and RSS growth in KiB as JSON."""
+    import numpy # noqa: F401 -- imported up front so its own footprint is not charged to the load
+    from interstellar_core import InterstellarMissionCore
+    from universe_binary import is_universe_file, load_universe
+    baseline_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    if stage == "core":
+        InterstellarMissionCore(config_filepath=map_path)
+    elif stage == "tables":
+        InterstellarMissionCore(config_filepath=map_path)._ensure_search_tables()
+    elif is_universe_file(map_path):
+        load_universe(map_path)
+    else:
+        with open(map_path, 'r') as f:
+            json.load(f)
+    seconds = time.perf_counter() - start
+    peak_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"seconds": seconds, "peak_kib": peak_kib, "growth_kib": peak_kib - baseline_kib}))
+
+def _run(map_path: str, stage: str) -> dict:
+    runs = []
+    for _ in range(REPEATS):
+        output = subprocess.run([sys.executable, os.path.abspath(__file__), "--measure", stage, map_path],
+                                check=True, capture_output=True, text=True).stdout
+        runs.append(json.loads(output.splitlines()[-1])) # The core prints nothing on load, but be safe
+    return min(runs, key=lambda run: run["seconds"])
+
+def benchmark(json_path: str):
+    from universe_binary import convert_json_to_universe
+    with tempfile.TemporaryDirectory() as temp_dir:
+        binary_path = convert_json_to_universe(json_path, os.path.join(temp_dir, "map.umap"))
+        print(f"{json_path}: JSON {os.path.getsize(json_path) / 2**20:.1f} MiB, "
+              f"binary {os.path.getsize(binary_path) / 2**20:.1f} MiB")
+        for stage in ("read", "core", "tables"):
+            for label, path in (("json", json_path), ("binary", binary_path)):
+                run = _run(path, stage)
+                print(f"  {stage:6} {label:6}: {run['seconds'] * 1000:9.1f} ms, "
+                      f"peak RSS {run['peak_kib'] / 1024:7.1f} MiB, +RSS {run['growth_kib'] / 1024:7.1f} MiB")
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--measure"]:
+        _measure(sys.argv[3], sys.argv[2])
+    else:
+        for map_path in sys.argv[1:] or ["matriz_universo.json"]:
+            benchmark(map_path)
@@ -0,0 +1,37 @@
+"""
+Times InterstellarMissionCore.solve() with 1..N worker processes.
+
+Usage: python benchmark_parallel.py [max_workers] [map.json ...]
+Without maps, the bundled matriz_universo.json is used. Speedups only show on maps large enough
+for the search to dominate the cost of starting the pool and loading the map in every worker.
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+from interstellar_core import InterstellarMissionCore
+
+REPEATS = 3
+
+def benchmark(map_path: str, max_workers: int, mode: str = "astar", objective: str = "steps"):
+    mission = InterstellarMissionCore(config_filepath=map_path)
+    print(f"{map_path} ({mission.rows}x{mission.cols}), mode={mode}, objective={objective}")
+    baseline = None
+    for workers in range(1, max_workers + 1):
+        best = float('inf')
+        for _ in range(REPEATS):
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()): # solve() prints its own summary
+                mission.solve(mode=mode, objective=objective, workers=workers)
+            best = min(best, time.perf_counter() - start)
+        if baseline is None:
+            baseline = best
+        path_length = len(mission.solutions[0]) - 1 if mission.solutions else None
+        print(f"  workers={workers}: {best * 1000:.1f} ms, speedup x{baseline / best:.2f}, "
+              f"expanded={mission.search_stats['expanded']}, moves={path_length}")
+
+if __name__ == "__main__":
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else (os.cpu_count() or 1)
+    for map_path in sys.argv[2:] or ["matriz_universo.json"]:
+        benchmark(map_path, max_workers)
@@ -0,0 +1,135 @@
+"""
+Benchmarks the solver on synthetic universes (universe_generator.py) across map sizes, seeds and
+solver modes, and writes a JSON report: solve time, expansions, peak memory and the quality of
+the path found (moves and energy left), per case.
+
+Usage: python benchmark_solver.py [--sizes 35x40 100x100] [--seeds 0 1 2] [--modes astar/steps dfs/steps]
+                                  [--time-budget 60] [--out report.json] [--compare old_report.json]
+With --compare, each case is also printed next to the same case of an earlier report (time and
+expansion ratios, and any change in path quality), to spot regressions between versions.
+
+Every case runs in a fresh interpreter, so the peak RSS is that of one load and one search.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+DEFAULT_SIZES = ["35x40", "70x80", "140x160"]
+DEFAULT_SEEDS = [0, 1, 2]
+DEFAULT_MODES = ["astar/steps", "astar/energy", "poi/steps", "poi/energy", "bidir/steps", "dfs/steps"]
+DEFAULT_TIME_BUDGET_S = 60
+
+def _measure(map_path: str, mode: str, objective: str, time_budget: float):
+    """Child process: loads map_path, solves it once and prints the case's metrics as JSON."""
+    from interstellar_core import InterstellarMissionCore
+    start = time.perf_counter()
+    mission = InterstellarMissionCore(config_filepath=map_path)
+    load_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in mission.iter_solutions(k=1, mode=mode, objective=objective, time_budget=time_budget):
+        pass
+    solve_seconds = time.perf_counter() - start
+    solution = mission.solutions[0] if mission.solutions else None
+    print(json.dumps({
+        "load_seconds": load_seconds,
+        "solve_seconds": solve_seconds,
+        "peak_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "stop_reason": mission.search_stop_reason,
+        "moves": len(solution) - 1 if solution else None,
+        "energy_left": solution.energy_after(-1) if solution else None,
+        **mission.search_stats,
+    }))
+
+def run_benchmark(sizes, seeds, modes, time_budget: float) -> dict:
+    from universe_generator import write_generated_universe
+    results = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for size in sizes:
+            rows, cols = map(int, size.split("x"))
+            for seed in seeds:
+                map_path = write_generated_universe(os.path.join(temp_dir, f"{size}_{seed}.json"), rows, cols, seed)
+                for mode_objective in modes:
+                    mode, objective = mode_objective.split("/")
+                    output = subprocess.run(
+                        [sys.executable, os.path.abspath(__file__), "--measure", map_path, mode, objective, str(time_budget)],
+                        check=True, capture_output=True, text=True).stdout
+                    result = {"size": size, "seed": seed, "mode": mode, "objective": objective,
+                              **json.loads(output.splitlines()[-1])}
+                    results.append(result)
+                    print(_format_result(result))
+    return {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "time_budget_s": time_budget,
+        "results": results,
+    }
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+                              check=True, capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def _case_key(result: dict) -> tuple:
+    return result["size"], result["seed"], result["mode"], result["objective"]
+
+def _format_result(result: dict) -> str:
+    case = f"{result['mode']}/{result['objective']}"
+    text = (f"{result['size']:>9} seed={result['seed']} {case:12}: "
+            f"{result['solve_seconds'] * 1000:9.1f} ms, expanded={result['expanded']}, "
+            f"peak RSS {result['peak_rss_kib'] / 1024:.1f} MiB, moves={result['moves']}, energy left={result['energy_left']}")
+    if result["stop_reason"]:
+        text += f" ({result['stop_reason']})"
+    return text
+
+def compare_reports(report: dict, baseline: dict):
+    """Prints each case of report against the same case of baseline."""
+    baseline_results = {_case_key(result): result for result in baseline["results"]}
+    print(f"Compared with {baseline.get('revision')} ({baseline.get('created')}):")
+    for result in report["results"]:
+        old = baseline_results.get(_case_key(result))
+        size, seed, mode, objective = _case_key(result)
+        label = f"{size:>9} seed={seed} {mode + '/' + objective:12}"
+        if old is None:
+            print(f"{label}: not in the baseline")
+            continue
+        time_ratio = result["solve_seconds"] / old["solve_seconds"] if old["solve_seconds"] else float('inf')
+        expanded_ratio = result["expanded"] / old["expanded"] if old["expanded"] else float('inf')
+        text = f"{label}: time x{time_ratio:.2f}, expanded x{expanded_ratio:.2f}"
+        if (result["moves"], result["energy_left"]) != (old["moves"], old["energy_left"]):
+            text += (f", PATH CHANGED: moves {old['moves']} -> {result['moves']}, "
+                     f"energy left {old['energy_left']} -> {result['energy_left']}")
+        if result["stop_reason"] != old["stop_reason"]:
+            text += f", stop reason {old['stop_reason']} -> {result['stop_reason']}"
+        print(text)
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--measure"]:
+        _measure(sys.argv[2], sys.argv[3], sys.argv[4], float(sys.argv[5]))
+        sys.exit()
+    parser = argparse.ArgumentParser(description="Benchmarks the solver on synthetic universes.")
+    parser.add_argument("--sizes", nargs="+", default=DEFAULT_SIZES, help="map sizes as ROWSxCOLS")
+    parser.add_argument("--seeds", nargs="+", type=int, default=DEFAULT_SEEDS)
+    parser.add_argument("--modes", nargs="+", default=DEFAULT_MODES, help="cases as MODE/OBJECTIVE")
+    parser.add_argument("--time-budget", type=float, default=DEFAULT_TIME_BUDGET_S, help="seconds per search")
+    parser.add_argument("--out", default="benchmark_report.json")
+    parser.add_argument("--compare", help="earlier report to compare against")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.sizes, args.seeds, args.modes, args.time_budget)
+    with open(args.out, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {args.out}")
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            compare_reports(report, json.load(f))
@@ -2,8 +2,29 @@
 # Este archivo contiene la lógica de los autómatas finitos deterministas (AFD)
 # para la validación de formatos, sin lógica de ejecución directa.
 
-import re # Importa el módulo 're' para usar expresiones regulares (útil para validaciones preliminares de formato).
-from typing import Set, Dict, Tuple # Importa tipos para mejorar la legibilidad y validación de parámetros (type hinting) en las definiciones de funciones y clases.
+from typing import Set, Dict, Tuple, List, Sequence, Callable, Optional # Importa tipos para mejorar la legibilidad y validación de parámetros (type hinting) en las definiciones de funciones y clases.
+
+# Códigos de error de validate_batch: uno por cada mensaje que puede retornar validate.
+ERROR_NONE = 0          # Cadena válida.
+ERROR_INVALID_CHAR = 1  # "Carácter inválido: ..."
+ERROR_TRANSITION = 2    # "Transición a estado de error en ..."
+ERROR_FINAL_STATE = 3   # "Estado final ... no es de aceptación"
+ERROR_LENGTH = 4        # CURP: "Longitud inválida: debe tener 18 caracteres"
+ERROR_DATE = 5          # Tarjeta: "Mes o año inválido"
+ERROR_CHECK_DIGIT = 6   # Con check_digit=True: "Dígito verificador inválido ..."
+# Inicio de cada mensaje de validate -> código, para las cadenas que validate_batch valida una por una.
+_MESSAGE_CODES = (
+    ("Carácter inválido", ERROR_INVALID_CHAR),
+    ("Transición a estado de error", ERROR_TRANSITION),
+    ("Estado final", ERROR_FINAL_STATE),
+    ("Longitud inválida", ERROR_LENGTH),
+    ("Mes o año inválido", ERROR_DATE),
+    ("Dígito verificador inválido", ERROR_CHECK_DIGIT),
+)
+
+# validate_batch procesa las cadenas en bloques de este tamaño, para que la memoria de los arreglos
+# intermedios no crezca con la cantidad de cadenas.
+BATCH_CHUNK_ROWS = 65536
 
 # Clase base para el Autómata Finito Determinista (AFD)
 # Esta clase genérica implementa la lógica fundamental de un AFD.
@@ -33,6 +54,82 @@ class DFA:
         self.transitions = transitions  # Almacena el diccionario de transiciones (la función delta)
         self.start_state = start_state  # Almacena el estado inicial
         self.accept_states = accept_states  # Almacena el conjunto de estados de aceptación
+        self._compile() # Compila el diccionario de transiciones a una tabla densa de enteros (ver _compile).
+        self._batch_tables = None # Las tablas de _compile como arreglos de NumPy, creadas por el primer validate_batch.
+
+    def _compile(self):
+        """
+        Compila la función de transición a una tabla densa de enteros, una sola vez por AFD.
+
+        - Clases de caracteres: los símbolos del alfabeto con la misma columna de transiciones
+          (el mismo estado siguiente desde cada estado) comparten una clase, numeradas desde 1;
+          la clase 0 es "carácter fuera del alfabeto". En la tarjeta de crédito, por ejemplo,
+          quedan cinco clases: fuera del alfabeto, '0'-'1', '2'-'9', espacio y barra.
+        - Estados: cada estado recibe un entero. Los dos estados que detienen el recorrido, el de
+          error 'E' (si no es de aceptación) y el pseudo-estado de "carácter inválido", reciben los
+          números más altos, así que basta una comparación por carácter para detectarlos.
+        - Tabla: una fila por estado, con `stride` columnas (una por clase) que guardan el número del
+          estado siguiente: el paso del recorrido son dos índices, sin tuplas ni comparaciones de
+          cadenas. Con menos de 257 estados, todos los números son enteros pequeños que Python no
+          necesita crear, también en los AFD producto del dígito verificador (ver check_digit).
+        - Mapa de clases: una tabla de 256 bytes para `bytes.translate`, que convierte toda la
+          cadena (codificada en latin-1) a números de clase en C antes del recorrido.
+        """
+        # Los estados de la tabla: los declarados, más el estado inicial, los destinos de las transiciones
+        # y 'E', al que va toda transición no definida. Ordenados para que la compilación sea reproducible.
+        names = set(self.states) | {self.start_state, 'E'} | set(self.transitions.values())
+        error_is_dead = 'E' not in self.accept_states # 'E' solo detiene el recorrido si no es de aceptación.
+        live_names = sorted(names - {'E'} if error_is_dead else names)
+        state_names = live_names + (['E'] if error_is_dead else []) + [None] # None: pseudo-estado de carácter inválido.
+        state_ids = {name: i for i, name in enumerate(state_names)}
+
+        # Agrupa los símbolos del alfabeto por su columna de transiciones.
+        column_classes: Dict[Tuple[str, ...], int] = {}
+        self._char_classes: Dict[str, int] = {} # Símbolo del alfabeto -> número de clase (>= 1).
+        for char in sorted(self.alphabet):
+            column = tuple(self.transitions.get((name, char), 'E') for name in live_names)
+            self._char_classes[char] = column_classes.setdefault(column, len(column_classes) + 1)
+        stride = len(column_classes) + 1 # Columnas por fila: la clase 0 más una por cada clase del alfabeto.
+
+        invalid_state = state_ids[None]
+        table = []
+        for i, name in enumerate(state_names):
+            if i >= len(live_names):
+                # Los estados que detienen el recorrido son absorbentes: validate se detiene al llegar a ellos,
+                # y validate_batch, que recorre todas las columnas, termina en el estado del primer error.
+                table.append([i] * stride)
+                continue
+            row = [invalid_state] * stride # La clase 0 (fuera del alfabeto) siempre va al pseudo-estado inválido.
+            for column, cls in column_classes.items():
+                row[cls] = state_ids[column[i]]
+            table.append(row)
+
+        # Tabla de bytes.translate: byte -> clase. Solo existe si todo el alfabeto cabe en latin-1;
+        # si no, cada cadena se clasifica con el diccionario _char_classes.
+        byte_classes = bytearray(256)
+        for char, cls in self._char_classes.items():
+            if ord(char) > 255:
+                byte_classes = None
+                break
+            byte_classes[ord(char)] = cls
+
+        self._state_names = state_names  # Número de estado -> nombre, para los mensajes de error.
+        self._stride = stride
+        self._table = table              # _table[estado][clase] = estado siguiente.
+        self._start = state_ids[self.start_state]
+        self._stop = len(live_names)     # Todo estado desde este número detiene el recorrido.
+        self._invalid = invalid_state
+        self._accepting = [name in self.accept_states for name in state_names] # Por número de estado.
+        self._byte_classes = bytes(byte_classes) if byte_classes is not None else None
+
+    def _classify(self, input_string: str):
+        """Convierte la cadena en su secuencia de números de clase (bytes, o una lista si no cabe en latin-1)."""
+        if self._byte_classes is not None:
+            try:
+                return input_string.encode('latin-1').translate(self._byte_classes)
+            except UnicodeEncodeError: # Algún carácter fuera de latin-1: no puede estar en el alfabeto.
+                pass
+        return [self._char_classes.get(char, 0) for char in input_string]
 
     def validate(self, input_string: str) -> Tuple[bool, str, int]:
         """
@@ -60,51 +157,172 @@ class DFA:
             - str: Un mensaje descriptivo del error si la cadena es inválida (vacío si es válida).
             - int: La posición (índice basado en 0) en la cadena donde se detectó el error (-1 si es válida).
         """
-        current_state = self.start_state # El AFD siempre comienza en su estado inicial.
-        
-        # Itera sobre cada carácter de la cadena de entrada, obteniendo tanto el índice (i) como el carácter (char).
-        for i, char in enumerate(input_string):
-            # Paso 2a: Verifica si el carácter actual es parte del alfabeto definido para este AFD.
-            if char not in self.alphabet:
-                # Si el carácter no está en el alfabeto, la cadena es inválida inmediatamente.
-                return False, f"Carácter inválido: '{char}'", i 
-            
-            # Paso 2b y 2c: Obtiene el siguiente estado basándose en el estado actual y el carácter leído.
-            # `self.transitions.get((current_state, char), 'E')` busca la transición.
-            # Si no se encuentra una transición explícitamente definida para esa combinación (estado, carácter),
-            # se asume que el AFD transiciona al estado de error 'E'.
-            next_state = self.transitions.get((current_state, char), 'E')
-            
-            current_state = next_state # Paso 2d: Actualiza el estado actual al estado recién determinado.
-            
-            # Paso 2e: Si el AFD ha entrado en el estado de error 'E', y 'E' no está configurado
-            # como un estado de aceptación (que es el caso normal para 'E'),
-            # significa que la cadena no es válida en este punto.
-            if current_state == 'E' and 'E' not in self.accept_states:
-                return False, f"Transición a estado de error en '{char}'", i # Retorna False con un mensaje de error y la posición.
-            
-        # Paso 3: Una vez que todos los caracteres de la cadena han sido procesados,
-        # se verifica si el estado en el que el AFD ha terminado es uno de los estados de aceptación.
-        if current_state in self.accept_states:
-            return True, "", -1 # Si el estado final es de aceptación, la cadena es válida. Se retorna True, sin mensaje de error y -1 en posición.
-        else:
-            # Si el estado final no es de aceptación, la cadena es inválida. Se retorna False con un mensaje que indica el estado final.
-            return False, f"Estado final {current_state} no es de aceptación", len(input_string) # La posición de error es el final de la cadena.
+        # El recorrido se hace sobre la tabla compilada en _compile: la cadena se traduce de una vez a
+        # números de clase, y cada carácter cuesta dos índices. Los pasos 2a y 2e son la misma comparación:
+        # el carácter fuera del alfabeto y la transición a 'E' llevan a estados >= _stop.
+        table = self._table
+        stop = self._stop
+        state = self._start # El AFD siempre comienza en su estado inicial.
+
+        for i, cls in enumerate(self._classify(input_string)):
+            state = table[state][cls] # Pasos 2b a 2d: el estado siguiente.
+            if state >= stop:
+                char = input_string[i]
+                if state == self._invalid: # Paso 2a: el carácter no pertenece al alfabeto.
+                    return False, f"Carácter inválido: '{char}'", i
+                # Paso 2e: se llegó al estado de error 'E', que no es de aceptación.
+                return False, f"Transición a estado de error en '{char}'", i
+
+        # Paso 3: la cadena se aceptó si el estado final es de aceptación.
+        if self._accepting[state]:
+            return True, "", -1 # Cadena válida: sin mensaje de error y -1 en posición.
+        # La posición de error es el final de la cadena.
+        return False, f"Estado final {self._state_names[state]} no es de aceptación", len(input_string)
+
+
+    def validate_batch(self, strings: Sequence[str]):
+        """
+        Valida muchas cadenas a la vez con NumPy: las cadenas de una misma longitud se empaquetan en una
+        matriz (N, L) de uint8, se traducen a clases con la tabla de _compile y se recorren columna por
+        columna, con una suma y un índice vectorizados por columna para las N cadenas a la vez.
+
+        Da los mismos veredictos y posiciones que validate; en lugar del mensaje retorna un código de
+        error (ERROR_*). Las cadenas con caracteres fuera de latin-1 se validan una por una con validate.
+
+        Parámetros:
+        - strings (Sequence[str]): Las cadenas a validar.
+
+        Retorna:
+        - Una tupla de tres arreglos de NumPy de longitud N, en el orden de los valores de validate:
+            - valid (bool): True para las cadenas aceptadas.
+            - codes (int8): El código de error de cada cadena (ERROR_NONE si es válida).
+            - positions (int32): La posición del error (-1 si es válida).
+        """
+        return _validate_in_chunks(strings, self._validate_chunk)
+
+    def _validate_chunk(self, strings: List[str]):
+        """Valida un bloque de validate_batch: agrupa las cadenas por longitud y recorre cada grupo."""
+        import numpy as np # Solo validate_batch necesita NumPy.
+        valid, codes, positions = _empty_results(len(strings))
+        if self._byte_classes is None: # El alfabeto no cabe en latin-1: no hay tabla de bytes.
+            _validate_one_by_one(self.validate, strings, range(len(strings)), valid, codes, positions)
+            return valid, codes, positions
+        lengths = np.fromiter(map(len, strings), dtype=np.int64, count=len(strings))
+        for length in np.unique(lengths).tolist():
+            rows = np.flatnonzero(lengths == length)
+            data, packed_rows, other_rows = _pack(strings, rows)
+            valid[packed_rows], codes[packed_rows], positions[packed_rows] = self._walk(data, len(packed_rows), length)
+            _validate_one_by_one(self.validate, strings, other_rows, valid, codes, positions)
+        return valid, codes, positions
+
+    def _walk(self, data: bytes, count: int, length: int):
+        """
+        Recorre `count` cadenas de `length` caracteres, codificadas en latin-1 y unidas en `data`.
+        Retorna los tres arreglos de validate_batch para esas cadenas.
+        """
+        import numpy as np # Solo validate_batch necesita NumPy.
+        stride = self._stride
+        if self._batch_tables is None:
+            # La tabla de _compile como un arreglo plano: delta[fila + clase] = fila del estado siguiente, donde
+            # la fila de un estado es su número por stride. Así cada columna es una suma y un solo índice.
+            delta = (np.array(self._table, dtype=np.int32) * stride).ravel()
+            self._batch_tables = (delta, np.array(self._accepting, dtype=bool))
+        delta, accepting = self._batch_tables
+        stop_row, invalid_row = self._stop * stride, self._invalid * stride
+
+        # Matriz de clases transpuesta (L, N): cada columna de la entrada queda contigua en memoria.
+        classes = np.frombuffer(data.translate(self._byte_classes), dtype=np.uint8).reshape(count, length)
+        classes = np.ascontiguousarray(classes.T)
+        row = np.full(count, self._start * stride, dtype=np.int32) # Fila del estado actual de cada cadena.
+        index = np.empty(count, dtype=np.int32)
+        steps = np.zeros(count, dtype=np.int32) # Caracteres leídos antes de llegar a un estado que detiene.
+        for column in classes:
+            np.add(row, column, out=index)
+            np.take(delta, index, out=row)
+            steps += row < stop_row
+        # Los estados que detienen son absorbentes (ver _compile): el estado final dice si hubo un error en el
+        # recorrido y de qué tipo, y `steps` es su posición, porque hasta él no se había detenido.
+        valid = accepting[row // stride]
+        codes = np.where(valid, ERROR_NONE, ERROR_FINAL_STATE).astype(np.int8)
+        codes[row >= stop_row] = ERROR_TRANSITION
+        codes[row == invalid_row] = ERROR_INVALID_CHAR
+        positions = np.where(valid, -1, steps).astype(np.int32)
+        return valid, codes, positions
+
+
+# Producto de un AFD con un dígito verificador módulo 10 (Luhn en la tarjeta, RENAPO en la CURP).
+# El residuo de la suma de control forma parte del estado, así que el dígito verificador se comprueba
+# en el mismo recorrido de la tabla compilada, sin ningún cálculo adicional por carácter.
+def _product_with_check_digit(transitions: Dict[Tuple[str, str], str], start_state: str,
+                              step: Callable[[str, str, int], Optional[int]]) -> Tuple[Set[str], Dict[Tuple[str, str], str], str]:
+    """
+    Construye el AFD producto de un AFD con el residuo (0 a 9) de una suma de control.
+
+    Parámetros:
+    - transitions (Dict[Tuple[str, str], str]): La función de transición del AFD original.
+    - start_state (str): El estado inicial del AFD original. El recorrido empieza con residuo 0.
+    - step (Callable): step(estado, carácter, residuo) da el residuo tras una transición válida del AFD
+      original: 0 a 9 para seguir sumando, None cuando ya no hace falta (el dígito verificador fue correcto
+      o la transición está fuera de la suma), o -1 si el carácter es un dígito verificador incorrecto,
+      lo que lleva la transición al estado de error 'E'.
+
+    Retorna:
+    - Tuple con los estados, las transiciones y el estado inicial del AFD producto. Los estados que llevan
+      un residuo se llaman 'estado(residuo)', por ejemplo 'S7(3)'; los demás conservan su nombre, así que
+      los estados de aceptación del AFD original siguen siéndolo.
+    """
+    alphabet = {char for _, char in transitions}
+    start = (start_state, 0)
+    name = lambda node: node[0] if node[1] is None else f'{node[0]}({node[1]})'
+    product_transitions = {}
+    seen = {start}
+    pending = [start] # Recorrido en anchura de los pares (estado, residuo) alcanzables.
+    while pending:
+        state, residue = node = pending.pop()
+        for char in alphabet:
+            next_state = transitions.get((state, char), 'E')
+            if next_state == 'E':
+                continue # Las transiciones no definidas ya van a 'E'.
+            next_residue = step(state, char, residue) if residue is not None else None
+            if next_residue == -1:
+                continue # Dígito verificador incorrecto: transición a 'E'.
+            next_node = (next_state, next_residue)
+            product_transitions[(name(node), char)] = name(next_node)
+            if next_node not in seen:
+                seen.add(next_node)
+                pending.append(next_node)
+    return {name(node) for node in seen} | {'E'}, product_transitions, name(start)
 
 
 # Implementación específica de un AFD para validar números de tarjeta de crédito
 # Cumple con el requisito 1 del proyecto: "Número de tarjeta de crédito".
 class CreditCardDFA:
-    def _init_(self):
+    # Año de vencimiento mínimo (regla de negocio arbitraria), de 4 dígitos: las tarjetas anteriores se rechazan.
+    MIN_EXPIRY_YEAR = 2025
+    # Posiciones del mes y del año en la cadena: un dígito rechazado en ellas es una fecha fuera de rango.
+    _DATE_POSITIONS = (20, 21, 23, 24, 25, 26)
+    # Estados que leen los 16 dígitos del número, en orden; el último lee el dígito verificador (posición 18).
+    _NUMBER_DIGIT_STATES = {f'S{i}': k for k, i in enumerate([*range(0, 4), *range(5, 9), *range(10, 14), *range(15, 19)])}
+    _CHECK_DIGIT_POSITION = 18
+
+    def __init__(self, check_digit: bool = False):
         """
         Inicializa el AFD diseñado para validar el formato de números de tarjeta de crédito.
         
         El formato esperado es: dddd dddd dddd dddd mm/aaaa cvv
         (16 dígitos en 4 grupos, espacio, fecha de 2 dígitos de mes / 4 dígitos de año, espacio, 3 dígitos de CVV).
+        Las reglas de la fecha (mes de 01 a 12 y año no anterior a MIN_EXPIRY_YEAR) también están en los
+        estados del AFD, así que un solo recorrido valida toda la cadena.
+
+        Parámetros:
+        - check_digit (bool): Si es True, también se verifica el dígito verificador del número (algoritmo de
+          Luhn), en el mismo recorrido: el AFD se combina con el residuo de la suma (ver _luhn_step).
         """
+        self.check_digit = check_digit
         # Define el conjunto de estados para el AFD de tarjeta de crédito.
         # Se necesitan 31 estados para el recorrido de la cadena (S0 a S31), más el estado de error 'E'.
-        states = {f'S{i}' for i in range(32)} | {'E'} 
+        # Los estados S21D y S24L a S26L son los caminos alternativos del mes y del año (ver la sección 5).
+        states = {f'S{i}' for i in range(32)} | {'S21D', 'S24L', 'S25L', 'S26L'} | {'E'}
         # Define el alfabeto permitido: dígitos (0-9), espacio (' ') y barra ('/').
         alphabet = set('0123456789 /')
         transitions = {} # Se inicializa un diccionario vacío para definir las transiciones.
@@ -135,21 +353,32 @@ class CreditCardDFA:
                 transitions[(f'S{i}', c)] = f'S{i+1}'
         transitions[('S19', ' ')] = 'S20' # Después de 4 dígitos, espera un espacio antes de la fecha.
 
-        # 5. Fecha de expiración (mm/aaaa) (S20 a S27)
-        # Primer dígito del mes (0 o 1)
-        for m1 in '01':
-            transitions[('S20', m1)] = 'S21'
-        # Segundo dígito del mes (0-9)
-        for m2 in '0123456789': 
+        # 5. Fecha de expiración (mm/aaaa) (S20 a S27), con las reglas de negocio en los estados.
+        # Mes de 01 a 12: el primer dígito es 0 o 1, y el segundo depende de él.
+        transitions[('S20', '0')] = 'S21'  # Mes 0x: el segundo dígito va de 1 a 9 (el mes 00 no existe).
+        transitions[('S20', '1')] = 'S21D' # Mes 1x: el segundo dígito va de 0 a 2.
+        for m2 in '123456789':
             transitions[('S21', m2)] = 'S22'
-        
+        for m2 in '012':
+            transitions[('S21D', m2)] = 'S22'
+
         transitions[('S22', '/')] = 'S23' # Espera la barra separadora entre mes y año.
 
-        # 4 dígitos del año
-        for i in range(23, 27): # Estados S23, S24, S25, S26
+        # 4 dígitos del año, que no puede ser anterior a MIN_EXPIRY_YEAR. Se compara dígito a dígito:
+        # mientras los dígitos leídos coinciden con los de MIN_EXPIRY_YEAR (estados S23 a S26), un dígito
+        # menor hace el año anterior (error), uno igual sigue comparando y uno mayor hace el año posterior,
+        # así que los dígitos que faltan quedan libres (estados S24L a S26L). Ambos caminos terminan en S27.
+        for k, min_digit in enumerate(str(self.MIN_EXPIRY_YEAR)): # k: posición del dígito en el año (0 a 3).
+            next_state = f'S{24 + k}'                     # Siguiente estado del camino que sigue comparando.
+            next_free = f'S{24 + k}L' if k < 3 else 'S27' # Siguiente estado del camino libre.
             for y in '0123456789':
-                transitions[(f'S{i}', y)] = f'S{i+1}'
-        
+                if y == min_digit:
+                    transitions[(f'S{23 + k}', y)] = next_state
+                elif y > min_digit:
+                    transitions[(f'S{23 + k}', y)] = next_free
+                if k > 0: # En el camino libre cualquier dígito es válido.
+                    transitions[(f'S{23 + k}L', y)] = next_free
+
         transitions[('S27', ' ')] = 'S28' # Espera un espacio antes del CVV.
 
         # 6. Código de verificación CVV (3 dígitos) (S28 a S31)
@@ -168,50 +397,78 @@ class CreditCardDFA:
         for c in alphabet:
             transitions[('E', c)] = 'E'
 
+        # Con check_digit, los estados del número llevan además el residuo de la suma de Luhn.
+        start_state = 'S0'
+        if check_digit:
+            states, transitions, start_state = _product_with_check_digit(transitions, start_state, self._luhn_step)
+
         # Inicializa una instancia de la clase base DFA con la configuración específica de la tarjeta de crédito.
         # El estado final de aceptación para el formato de la tarjeta es S31.
-        self.dfa = DFA(states, alphabet, transitions, 'S0', {'S31'})
+        self.dfa = DFA(states, alphabet, transitions, start_state, {'S31'})
+
+    @classmethod
+    def _luhn_step(cls, state: str, char: str, residue: int) -> Optional[int]:
+        """
+        Paso de la suma de Luhn para _product_with_check_digit. De derecha a izquierda se duplica uno de cada
+        dos dígitos empezando por el penúltimo (en 16 dígitos: los de índice par) y se resta 9 si el doble
+        pasa de 9; el número es válido si la suma, con el dígito verificador, es múltiplo de 10.
+        """
+        k = cls._NUMBER_DIGIT_STATES.get(state)
+        if k is None: # Un espacio entre grupos: el residuo no cambia.
+            return residue
+        value = int(char)
+        if k % 2 == 0:
+            value = value * 2 - 9 if value > 4 else value * 2
+        residue = (residue + value) % 10
+        if k == 15: # El dígito verificador: la suma debe quedar en 0, y después ya no hace falta.
+            return None if residue == 0 else -1
+        return residue
 
     def validate(self, input_string: str) -> Tuple[bool, str, int]:
         """
         Valida una cadena de tarjeta de crédito.
         
-        Realiza una serie de validaciones:
-        1. Validación preliminar del formato general y longitud usando una expresión regular.
-        2. Validación semántica de la fecha de vencimiento (mes válido y año no expirado).
-        3. Validación estructural completa utilizando el AFD (self.dfa.validate).
+        Un solo recorrido del AFD (self.dfa.validate) valida el formato y la fecha de vencimiento (mes
+        válido y año no expirado), y detecta cada error en la posición exacta del carácter que lo causa.
+        Si ese carácter es un dígito del mes o del año, el error se reporta como "Mes o año inválido", y
+        con check_digit, si es un dígito verificador incorrecto, como "Dígito verificador inválido (Luhn)".
         """
-        # 1. Validación preliminar con expresiones regulares:
-        # Esta regex verifica la estructura general (número de dígitos, espacios y barra)
-        # de forma rápida antes de involucrar al DFA. Es más eficiente para un chequeo de formato inicial.
-        if not re.match(r'^\d{4} \d{4} \d{4} \d{4} \d{2}/\d{4} \d{3}$', input_string):
-            return False, "Formato inválido: debe ser dddd dddd dddd dddd mm/aaaa cvv", 0
-        
-        # 2. Validación semántica de la fecha de vencimiento:
-        # El DFA solo valida la estructura (dos dígitos, barra, cuatro dígitos).
-        # Las reglas de negocio (mes 1-12, año >= 2025) son validaciones semánticas
-        # que se manejan aquí.
-        parts = input_string.split(' ') # Divide la cadena por espacios.
-        date_part = parts[4] # La parte de la fecha es el quinto elemento (índice 4).
-        month_str, year_str = date_part.split('/') # Divide la fecha en mes y año.
+        is_valid, error_msg, error_pos = self.dfa.validate(input_string)
+        # En las posiciones del mes, del año y del dígito verificador el AFD solo rechaza un dígito por esas reglas.
+        if not is_valid and error_msg.startswith("Transición") and input_string[error_pos] in '0123456789':
+            if error_pos in self._DATE_POSITIONS:
+                return False, "Mes o año inválido", error_pos
+            if self.check_digit and error_pos == self._CHECK_DIGIT_POSITION:
+                return False, "Dígito verificador inválido (Luhn)", error_pos
+        return is_valid, error_msg, error_pos
+
+    def validate_batch(self, strings: Sequence[str]):
+        """
+        Valida muchas tarjetas a la vez con NumPy, con los mismos veredictos y posiciones que validate
+        y un código de error en lugar del mensaje (ver DFA.validate_batch, que retorna lo mismo): el
+        recorrido por columnas del AFD, con ERROR_DATE para los dígitos rechazados en el mes o el año, y
+        ERROR_CHECK_DIGIT para un dígito verificador incorrecto.
+        """
+        return _validate_in_chunks(strings, self._validate_chunk)
+
+    def _validate_chunk(self, strings: List[str]):
+        import numpy as np # Solo validate_batch necesita NumPy.
+        valid, codes, positions = self.dfa._validate_chunk(strings)
+        rule_positions = self._DATE_POSITIONS + ((self._CHECK_DIGIT_POSITION,) if self.check_digit else ())
+        for i in np.flatnonzero((codes == ERROR_TRANSITION) & np.isin(positions, rule_positions)).tolist():
+            if strings[i][positions[i]] in '0123456789': # Como en validate: un dígito rechazado por la fecha o Luhn.
+                codes[i] = ERROR_DATE if positions[i] in self._DATE_POSITIONS else ERROR_CHECK_DIGIT
+        return valid, codes, positions
+
 
-        try:
-            month = int(month_str) # Convierte el mes a entero.
-            year = int(year_str)   # Convierte el año a entero.
-            # Verifica que el mes esté entre 1 y 12, y que el año no sea anterior a 2025 (regla de negocio arbitraria).
-            if not (1 <= month <= 12 and year >= 2025): 
-                return False, "Mes o año inválido", input_string.find('/') # Retorna error si la fecha es semánticamente inválida.
-        except ValueError: # Captura si month_str o year_str no son convertibles a enteros.
-            return False, "Formato de fecha inválido (no numérico)", input_string.find('/')
-
-        # 3. Validación estructural con el AFD:
-        # Si todas las validaciones preliminares y semánticas pasan, se pasa la cadena
-        # al AFD para la validación de la secuencia exacta de transiciones.
-        return self.dfa.validate(input_string)
 # Implementación específica de un AFD para validar la CURP de México
 # Cumple con el requisito 2 del proyecto: "CURP de México".
 class CURPDFA:
-    def _init_(self):
+    # Valor de cada carácter en la suma del dígito verificador de RENAPO (la Ñ va entre la N y la O).
+    _CHECK_DIGIT_VALUES = {char: value for value, char in enumerate('0123456789ABCDEFGHIJKLMNÑOPQRSTUVWXYZ')}
+    _CHECK_DIGIT_POSITION = 17
+
+    def __init__(self, check_digit: bool = False):
         """
         Inicializa el AFD diseñado para validar el formato de la CURP de México.
         
@@ -223,7 +480,13 @@ class CURPDFA:
         - CCC: 3 letras internas (primeras consonantes internas del nombre)
         - NN: 2 caracteres para homoclave (dígitos o letras)
         - DV: 1 dígito verificador
+
+        Parámetros:
+        - check_digit (bool): Si es True, también se verifica el dígito verificador (posición 18) con el
+          algoritmo de RENAPO, en el mismo recorrido: el AFD se combina con el residuo de la suma
+          (ver _check_digit_step).
         """
+        self.check_digit = check_digit
         # Definición de estados: Necesitamos 18 estados (S0 a S17) para procesar cada uno de los 18 caracteres de la CURP,
         # más un estado S18 que es el estado de aceptación final. También se incluye el estado de error 'E'.
         states = {f'S{i}' for i in range(19)} | {'E'} 
@@ -277,16 +540,32 @@ class CURPDFA:
         for c in alphabet:
             transitions[('E', c)] = 'E'
 
+        # Con check_digit, los estados de los primeros 17 caracteres llevan además el residuo de la suma de control.
+        start_state = 'S0'
+        if check_digit:
+            states, transitions, start_state = _product_with_check_digit(transitions, start_state, self._check_digit_step)
+
         # Inicializa una instancia de la clase base DFA con la configuración específica de la CURP.
         # El estado final de aceptación para una CURP de 18 caracteres es S18.
-        self.dfa = DFA(states, alphabet, transitions, 'S0', {'S18'}) 
+        self.dfa = DFA(states, alphabet, transitions, start_state, {'S18'})
+
+    @classmethod
+    def _check_digit_step(cls, state: str, char: str, residue: int) -> Optional[int]:
+        """
+        Paso de la suma de RENAPO para _product_with_check_digit: el carácter de la posición i (0 a 16) suma su
+        valor por (18 - i), y el dígito verificador debe ser (10 - suma % 10) % 10.
+        """
+        i = int(state[1:]) # Los estados S0 a S17 leen el carácter de su misma posición.
+        if i == cls._CHECK_DIGIT_POSITION:
+            return None if char == str((10 - residue) % 10) else -1
+        return (residue + cls._CHECK_DIGIT_VALUES[char] * (18 - i)) % 10
 
     def validate(self, input_string: str) -> Tuple[bool, str, int]:
         """
         Valida una cadena de CURP.
         
         Realiza una validación preliminar de longitud y luego la validación estructural
-        completa utilizando el AFD (self.dfa.validate).
+        completa utilizando el AFD (self.dfa.validate), que con check_digit incluye el dígito verificador.
         """
         # Validación preliminar de longitud:
         # La CURP de México debe tener exactamente 18 caracteres. Esta es una verificación rápida
@@ -296,7 +575,78 @@ class CURPDFA:
         
         # Si la longitud es correcta, se procede con la validación estructural del AFD.
         # El AFD verificará si la secuencia de caracteres sigue las reglas de transición definidas.
-        return self.dfa.validate(input_string)
+        is_valid, error_msg, error_pos = self.dfa.validate(input_string)
+        # Con check_digit, en la última posición el AFD acepta cualquier letra o dígito salvo un dígito verificador incorrecto.
+        if self.check_digit and error_pos == self._CHECK_DIGIT_POSITION and error_msg.startswith("Transición"):
+            return False, "Dígito verificador inválido", error_pos
+        return is_valid, error_msg, error_pos
+
+    def validate_batch(self, strings: Sequence[str]):
+        """
+        Valida muchas CURP a la vez con NumPy, con los mismos veredictos y posiciones que validate
+        y un código de error en lugar del mensaje (ver DFA.validate_batch, que retorna lo mismo).
+
+        Las cadenas que no miden 18 caracteres reciben ERROR_LENGTH en la posición 0 sin recorrerlas;
+        las demás se recorren juntas como una matriz (N, 18).
+        """
+        return _validate_in_chunks(strings, self._validate_chunk)
+
+    def _validate_chunk(self, strings: List[str]):
+        import numpy as np # Solo validate_batch necesita NumPy.
+        valid, codes, positions = _empty_results(len(strings))
+        lengths = np.fromiter(map(len, strings), dtype=np.int64, count=len(strings))
+        codes[lengths != 18] = ERROR_LENGTH # Con valid en False y la posición 0, como en validate.
+        data, rows, other_rows = _pack(strings, np.flatnonzero(lengths == 18))
+        valid[rows], codes[rows], positions[rows] = self.dfa._walk(data, len(rows), 18)
+        if self.check_digit: # Como en validate: el error de transición en la última posición es el dígito verificador.
+            codes[(codes == ERROR_TRANSITION) & (positions == self._CHECK_DIGIT_POSITION)] = ERROR_CHECK_DIGIT
+        _validate_one_by_one(self.validate, strings, other_rows, valid, codes, positions)
+        return valid, codes, positions
+
+def error_code(error_msg: str) -> int:
+    """
+    Retorna el código de error (ERROR_*) que validate_batch da a una cadena cuyo validate retornó el mensaje
+    `error_msg` (ERROR_NONE para el mensaje vacío de una cadena válida).
+    """
+    return next((code for prefix, code in _MESSAGE_CODES if error_msg.startswith(prefix)), ERROR_NONE)
+
+# Funciones auxiliares de validate_batch, compartidas por el AFD base y los validadores específicos.
+def _validate_in_chunks(strings: Sequence[str], validate_chunk: Callable):
+    """Aplica validate_chunk a bloques de BATCH_CHUNK_ROWS cadenas y junta sus resultados."""
+    valid, codes, positions = _empty_results(len(strings))
+    for start in range(0, len(strings), BATCH_CHUNK_ROWS):
+        chunk = list(strings[start:start + BATCH_CHUNK_ROWS])
+        end = start + len(chunk)
+        valid[start:end], codes[start:end], positions[start:end] = validate_chunk(chunk)
+    return valid, codes, positions
+
+def _empty_results(count: int):
+    """Los tres arreglos de resultados de validate_batch para `count` cadenas, sin llenar."""
+    import numpy as np # Solo validate_batch necesita NumPy.
+    return np.zeros(count, dtype=bool), np.zeros(count, dtype=np.int8), np.zeros(count, dtype=np.int32)
+
+def _pack(strings: List[str], rows):
+    """
+    Codifica en latin-1 las cadenas de los índices `rows` (todas de la misma longitud) en un solo bloque
+    de bytes. Retorna el bloque, los índices que contiene y los índices de las cadenas que no caben en
+    latin-1, que se validan una por una.
+    """
+    import numpy as np # Solo validate_batch necesita NumPy.
+    selected = [strings[i] for i in rows.tolist()]
+    try:
+        return ''.join(selected).encode('latin-1'), rows, rows[:0]
+    except UnicodeEncodeError:
+        fits = np.fromiter((text.isascii() or max(text) <= '\xff' for text in selected), dtype=bool, count=len(selected))
+        packed = [text for text, fit in zip(selected, fits.tolist()) if fit]
+        return ''.join(packed).encode('latin-1'), rows[fits], rows[~fits]
+
+def _validate_one_by_one(validate: Callable, strings: List[str], rows, valid, codes, positions):
+    """Valida con `validate` las cadenas de los índices `rows` y escribe sus resultados en los arreglos."""
+    for i in rows:
+        is_valid, error_msg, error_pos = validate(strings[i])
+        valid[i] = is_valid
+        codes[i] = error_code(error_msg)
+        positions[i] = error_pos
 
 # Función para procesar un archivo de texto y validar cada línea
 # Esto cumple con el requisito del proyecto de "leer un archivo.txt con varias cadenas".
@@ -334,3 +684,173 @@ def process_file(filename: str, validator: object, validator_name: str):
     except Exception as e: # Captura cualquier otra excepción inesperada durante el procesamiento del archivo..
         print(f"Error al procesar el archivo: {e}")
 
+
+# --- Validación de archivos grandes en paralelo (ver validate_file) ---
+# validate_file reparte el archivo en bloques de aproximadamente este tamaño, terminados en un salto de línea.
+FILE_CHUNK_BYTES = 8 * 2**20
+# Columnas de cada resultado, con los mismos nombres que las respuestas de la API (api.py).
+RESULT_FIELDS = ('line_number', 'input_string', 'is_valid', 'error_message', 'error_position')
+
+def validate_file(filename: str, validator: object, output_path: str, only_invalid: bool = False,
+                  workers: int = None, chunk_bytes: int = FILE_CHUNK_BYTES) -> Dict[str, int]:
+    """
+    Valida todas las líneas de un archivo, posiblemente de varios gigabytes, y escribe los resultados en
+    output_path: en CSV si su nombre termina en '.csv', o en JSON Lines (un objeto JSON por línea) si no.
+    Es la versión para archivos grandes de process_file, con los mismos números de línea y los mismos
+    resultados, pero sin imprimir nada por línea.
+
+    El archivo se mapea en memoria (mmap) y se reparte en bloques de unos chunk_bytes bytes, cortados
+    justo después de un salto de línea, que se validan en un grupo de procesos. Una primera pasada, también
+    en paralelo, cuenta los saltos de línea de cada bloque para conocer el número de su primera línea; en la
+    segunda, cada proceso valida su bloque (con validate_batch si el validador lo tiene y NumPy está
+    instalado) y da el texto de salida ya formateado, que se escribe en orden conforme llega. Como mucho
+    2 * workers bloques están en curso a la vez, así que la memoria no depende del tamaño del archivo.
+
+    Como al leer el archivo en modo texto, los saltos de línea pueden ser LF, CR LF o CR, y se
+    ignoran las líneas vacías (tras strip()) sin dejar de contarlas. Los bytes que no son UTF-8 válido se
+    reemplazan por '�' (y la línea resulta inválida) en lugar de detener todo el archivo.
+
+    Parámetros:
+    - filename (str): La ruta del archivo a validar.
+    - validator (object): Una instancia de un validador (ej. CreditCardDFA, CURPDFA), con un método validate.
+    - output_path (str): La ruta del archivo de resultados (.csv, o JSON Lines para cualquier otro nombre).
+    - only_invalid (bool): Si es True, solo se escriben las líneas inválidas.
+    - workers (int): Cantidad de procesos (por omisión, uno por CPU). Con 1 se valida en este proceso.
+    - chunk_bytes (int): Tamaño aproximado de cada bloque.
+
+    Retorna:
+    - Dict[str, int]: Los totales {'lines': líneas validadas, 'valid': válidas, 'invalid': inválidas}.
+    """
+    import concurrent.futures # Importados aquí: solo validate_file los necesita.
+    import itertools
+    import mmap
+    import os
+
+    output_format = 'csv' if output_path.lower().endswith('.csv') else 'jsonl'
+    workers = workers or os.cpu_count() or 1
+    summary = {'lines': 0, 'valid': 0, 'invalid': 0}
+
+    with open(filename, 'rb') as file:
+        size = os.fstat(file.fileno()).st_size
+        # Límites de los bloques: cada uno termina justo después del primer '\n' a partir de su tamaño nominal,
+        # así que un '\r\n' nunca queda partido entre dos bloques.
+        bounds = [0]
+        if size: # Un archivo vacío no se puede mapear en memoria, y no tiene bloques.
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                while bounds[-1] < size:
+                    newline = data.find(b'\n', bounds[-1] + max(chunk_bytes, 1) - 1)
+                    bounds.append(size if newline == -1 else newline + 1)
+    starts, ends = bounds[:-1], bounds[1:]
+
+    with open(output_path, 'w', encoding='utf-8', newline='') as output:
+        if output_format == 'csv':
+            output.write(_format_results([RESULT_FIELDS], 'csv'))
+        if not starts: # Archivo vacío: solo el encabezado.
+            return summary
+
+        def write_chunk(result):
+            text, valid, invalid = result
+            output.write(text)
+            summary['lines'] += valid + invalid
+            summary['valid'] += valid
+            summary['invalid'] += invalid
+
+        worker_args = (filename, validator, output_format, only_invalid)
+        if workers == 1 or len(starts) <= 1: # Sin procesos: el mismo trabajo, en este proceso.
+            _init_file_worker(*worker_args)
+            try:
+                first_line = 1
+                for start, end in zip(starts, ends):
+                    write_chunk(_validate_file_chunk(start, end, first_line))
+                    first_line += _count_line_breaks(start, end)
+            finally:
+                _close_file_worker()
+            return summary
+
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=_init_file_worker,
+                                                    initargs=worker_args) as executor:
+            # Primera pasada: el número de la primera línea de cada bloque.
+            line_breaks = executor.map(_count_line_breaks, starts, ends)
+            first_lines = itertools.accumulate(line_breaks, initial=1)
+            # Segunda pasada: los bloques se validan en paralelo y se escriben en orden.
+            pending = []
+            for start, end, first_line in zip(starts, ends, first_lines):
+                pending.append(executor.submit(_validate_file_chunk, start, end, first_line))
+                if len(pending) >= 2 * workers:
+                    write_chunk(pending.pop(0).result())
+            for future in pending:
+                write_chunk(future.result())
+    return summary
+
+# Estado de cada proceso de validate_file: el archivo mapeado en memoria y la configuración de la salida.
+# Está a nivel de módulo para que ProcessPoolExecutor pueda usar las funciones de abajo.
+_file_worker_state = None
+
+def _init_file_worker(filename: str, validator: object, output_format: str, only_invalid: bool):
+    global _file_worker_state
+    import mmap
+    with open(filename, 'rb') as file: # El mapeo sigue siendo válido después de cerrar el archivo.
+        data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    _file_worker_state = (data, validator, output_format, only_invalid)
+
+def _close_file_worker():
+    global _file_worker_state
+    _file_worker_state[0].close()
+    _file_worker_state = None
+
+def _count_line_breaks(start: int, end: int) -> int:
+    """Cuenta los saltos de línea (LF, CR LF o CR) de un bloque del archivo."""
+    chunk = _file_worker_state[0][start:end]
+    return chunk.count(b'\n') + chunk.count(b'\r') - chunk.count(b'\r\n')
+
+def _validate_file_chunk(start: int, end: int, first_line: int) -> Tuple[str, int, int]:
+    """
+    Valida las líneas de un bloque del archivo, cuya primera línea es la número first_line.
+    Retorna el texto de sus resultados en el formato de salida y la cantidad de líneas válidas e inválidas.
+    """
+    data, validator, output_format, only_invalid = _file_worker_state
+    text = data[start:end].decode('utf-8', errors='replace')
+    lines = text.replace('\r\n', '\n').replace('\r', '\n').split('\n')
+    lines = [line.strip() for line in lines]
+    # Como en process_file, las líneas vacías se cuentan pero no se validan.
+    numbers = [number for number, line in enumerate(lines, first_line) if line]
+    strings = [line for line in lines if line]
+
+    results = _validate_lines(validator, strings)
+    valid = sum(1 for is_valid, _, _ in results if is_valid)
+    rows = [(number, line, is_valid, error_msg, error_pos)
+            for number, line, (is_valid, error_msg, error_pos) in zip(numbers, strings, results)
+            if not (only_invalid and is_valid)]
+    return _format_results(rows, output_format), valid, len(results) - valid
+
+def _validate_lines(validator: object, strings: List[str]) -> List[Tuple[bool, str, int]]:
+    """
+    Retorna el resultado de validator.validate para cada cadena. Si el validador tiene validate_batch y
+    NumPy está instalado, se valida todo el lote de una vez y validate solo se llama para las cadenas
+    inválidas, para obtener su mensaje de error.
+    """
+    if hasattr(validator, 'validate_batch'):
+        try:
+            import numpy # noqa: F401 -- lo usa validate_batch; aquí solo se comprueba que esté instalado.
+        except ImportError:
+            pass
+        else:
+            valid = validator.validate_batch(strings)[0].tolist()
+            return [(True, "", -1) if is_valid else validator.validate(text) for text, is_valid in zip(strings, valid)]
+    return [validator.validate(text) for text in strings]
+
+def _format_results(rows: List[Tuple], output_format: str) -> str:
+    """Da formato CSV o JSON Lines a filas con los campos de RESULT_FIELDS."""
+    import csv
+    import io
+    from json.encoder import encode_basestring # Codifica una cadena JSON en C, como json.dumps(..., ensure_ascii=False).
+    if output_format == 'csv':
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator='\n').writerows(rows)
+        return buffer.getvalue()
+    # El mismo texto que json.dumps(dict(zip(RESULT_FIELDS, row)), ensure_ascii=False) para cada fila, sin
+    # crear un diccionario y un codificador por fila, que era la mayor parte del tiempo de validate_file.
+    return ''.join(f'{{"line_number": {number}, "input_string": {encode_basestring(line)}, '
+                   f'"is_valid": {"true" if is_valid else "false"}, "error_message": {encode_basestring(error_msg)}, '
+                   f'"error_position": {error_pos}}}\n'
+                   for number, line, is_valid, error_msg, error_pos in rows)
@@ -0,0 +1,1742 @@
+import json
+from typing import List, Tuple, Dict, Optional, Set, FrozenSet, Iterator
+import array
+import collections # For deque
+import collections.abc
+import bisect
+import heapq
+import itertools
+import time
+from universe_binary import is_universe_file, load_universe
+
+# sys.setrecursionlimit(4000) # No longer needed for iterative approach
+
+# Cell flags (see InterstellarMission._build_cell_tables)
+_RECHARGE_ZONE = 1
+_GIANT_STAR = 2
+
+# Step event flags (see Solution)
+_STEP_ORIGIN = 1
+_STEP_WORMHOLE = 2
+_STEP_RECHARGE = 4
+_STEP_GIANT_STAR = 8
+
+class _SearchNode:
+    """Expanded search state stored in the solver arena (see _solve_iterative)."""
+    __slots__ = ("parent_idx", "cell", "arrival_move", "destroyed_black_hole",
+                 "energy_after_action", "black_holes_mask", "used_wormholes_mask")
+
+    def __init__(self, parent_idx: int, cell: int, arrival_move: Tuple,
+                 destroyed_black_hole: Optional[int], energy_after_action: int,
+                 black_holes_mask: int, used_wormholes_mask: int):
+        self.parent_idx = parent_idx
+        self.cell = cell
+        self.arrival_move = arrival_move
+        self.destroyed_black_hole = destroyed_black_hole
+        self.energy_after_action = energy_after_action
+        self.black_holes_mask = black_holes_mask
+        self.used_wormholes_mask = used_wormholes_mask
+
+
+class _BloomFilter:
+    """Compact set membership with false positives and no false negatives."""
+    def __init__(self, num_bits: int, num_hashes: int = 3):
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.bits = bytearray((num_bits + 7) // 8)
+
+    def _positions(self, key) -> Iterator[int]:
+        # Double hashing: h1 + i * h2 gives num_hashes well spread positions from one hash
+        h = hash(key) & 0xFFFFFFFFFFFFFFFF
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, key):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class _BoundedVisitedStates:
+    """
+    Dominance table of _record_label with at most max_states entries. When full, one state is
+    evicted to make room: the least recently used one ("lru") or the one whose best energy is the
+    lowest ("lowest_energy", the label that prunes the fewest arrivals). Evicting a label only
+    loses pruning, so the search stays correct but may expand a state again.
+
+    An optional Bloom filter remembers every state ever stored, in filter_bits bits: a state that
+    is missing from the table but in the filter is counted as a re-expansion (false positives of
+    the filter can only overcount). Counters go to search_stats["evicted"] and ["reexpanded"].
+    """
+    def __init__(self, max_states: int, policy: str, filter_bits: int, search_stats: Dict[str, int]):
+        if policy not in ("lru", "lowest_energy"):
+            raise ValueError(f"Unknown visited table eviction policy: {policy}")
+        self.max_states = max_states
+        self.lru = policy == "lru"
+        self.labels: Dict[Tuple, List[int]] = collections.OrderedDict() if self.lru else {}
+        # lowest_energy: heap of (best_energy, counter, state_key); entries whose energy no longer
+        # matches the table are stale and skipped
+        self.heap: List[Tuple] = []
+        self.counter = itertools.count()
+        self.filter = _BloomFilter(filter_bits) if filter_bits else None
+        self.search_stats = search_stats
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def get(self, state_key: Tuple) -> Optional[List[int]]:
+        labels = self.labels.get(state_key)
+        if labels is not None:
+            if self.lru:
+                self.labels.move_to_end(state_key)
+        elif self.filter is not None and state_key in self.filter:
+            self.search_stats["reexpanded"] += 1
+        return labels
+
+    def __setitem__(self, state_key: Tuple, labels: List[int]):
+        """Stores a new state (see get), evicting another one first if the table is full."""
+        if len(self.labels) >= self.max_states:
+            self._evict()
+        self.labels[state_key] = labels
+        if self.filter is not None:
+            self.filter.add(state_key)
+        self.updated(state_key, labels)
+
+    def updated(self, state_key: Tuple, labels: List[int]):
+        """Called after the labels of a state changed in place."""
+        if not self.lru:
+            heapq.heappush(self.heap, (-labels[0], next(self.counter), state_key))
+            if len(self.heap) > 4 * self.max_states: # Too many stale entries: rebuild
+                self.heap = [(-state_labels[0], next(self.counter), key) for key, state_labels in self.labels.items()]
+                heapq.heapify(self.heap)
+
+    def _evict(self):
+        if self.lru:
+            self.labels.popitem(last=False)
+        else:
+            while True:
+                best_energy, _, state_key = heapq.heappop(self.heap)
+                labels = self.labels.get(state_key)
+                if labels is not None and -labels[0] == best_energy:
+                    del self.labels[state_key]
+                    break
+        self.search_stats["evicted"] += 1
+
+
+class SearchHooks:
+    """
+    Callbacks around the phases of a search, to find hot spots on real maps without cProfile.
+    Install with InterstellarMissionCore.set_search_hooks and override the callbacks needed;
+    seconds is the time the phase took. A mission without hooks runs the unmodified search.
+    Parallel workers (workers > 1) load their own mission and are not instrumented: a parallel
+    solve reports the phases of this process's prefix expansion, and the workers only show up in
+    the merged search_stats.
+    """
+    def on_search_start(self, mode: str, objective: str):
+        pass
+
+    def on_cell_effects(self, cell: int, energy: int, result: Tuple[int, int, Optional[int]], seconds: float):
+        """A popped state's cell effects were applied; result is what _apply_cell_effects returned."""
+
+    def on_label_check(self, state_key: Tuple, capped_energy: int, accepted: bool, seconds: float):
+        """A popped state was checked against the dominance table; accepted means it gets expanded."""
+
+    def on_successors(self, cell: int, successors: List[Tuple], seconds: float):
+        """An expanded state generated its successors (see _successors for the entries)."""
+
+    def on_search_end(self, mission: "InterstellarMissionCore"):
+        pass
+
+
+class SearchStatsCollector(SearchHooks):
+    """
+    Counts and times the phases of every search. When a search ends, its report (see to_dict) is
+    kept in last_report and, if json_path is set, written there as JSON:
+        pops                      states taken from the frontier (one dominance check each)
+        pushes                    successors generated for the frontier
+        memo_hits                 pops dropped by the dominance table
+        expansions                pops that passed it
+        wormhole_jumps            wormhole moves among the successors
+        giant_star_destructions   black holes destroyed by giant stars at a pop
+        seconds                   "effects", "memo" and "expansion" phases, "total" wall time of
+                                  the search and "other" (queue handling, path reconstruction...)
+    plus the mode, objective, stop reason, number of solutions and the mission's search_stats.
+    The timers themselves add roughly a microsecond per phase call to the totals.
+    """
+    def __init__(self, json_path: Optional[str] = None):
+        self.json_path = json_path
+        self.last_report: Optional[Dict] = None
+        self.on_search_start("", "")
+
+    def on_search_start(self, mode: str, objective: str):
+        self.mode, self.objective = mode, objective
+        self.counts = dict.fromkeys(("pops", "pushes", "memo_hits", "expansions", "wormhole_jumps",
+                                     "giant_star_destructions"), 0)
+        self.seconds = dict.fromkeys(("effects", "memo", "expansion"), 0.0)
+        self._start = time.perf_counter()
+
+    def on_cell_effects(self, cell, energy, result, seconds):
+        self.seconds["effects"] += seconds
+        if result[2] is not None:
+            self.counts["giant_star_destructions"] += 1
+
+    def on_label_check(self, state_key, capped_energy, accepted, seconds):
+        self.seconds["memo"] += seconds
+        self.counts["pops"] += 1
+        self.counts["expansions" if accepted else "memo_hits"] += 1
+
+    def on_successors(self, cell, successors, seconds):
+        self.seconds["expansion"] += seconds
+        self.counts["pushes"] += len(successors)
+        self.counts["wormhole_jumps"] += sum(1 for successor in successors if successor[2][0] == "wormhole")
+
+    def on_search_end(self, mission):
+        total = time.perf_counter() - self._start
+        self.last_report = self.to_dict(mission, total)
+        if self.json_path is not None:
+            with open(self.json_path, 'w') as f:
+                json.dump(self.last_report, f, indent=2)
+
+    def to_dict(self, mission: "InterstellarMissionCore", total_seconds: float) -> Dict:
+        return {
+            "mode": self.mode,
+            "objective": self.objective,
+            "stop_reason": mission.search_stop_reason,
+            "solutions": len(mission.solutions),
+            **self.counts,
+            "seconds": {**self.seconds, "total": total_seconds,
+                        "other": max(0.0, total_seconds - sum(self.seconds.values()))},
+            "search_stats": dict(mission.search_stats),
+        }
+
+
+def _compact_ints(values: List[int]):
+    """values as an int64 array, or the list itself if some value does not fit (energy pumped by recharge loops)."""
+    try:
+        return array.array('q', values)
+    except OverflowError:
+        return values
+
+
+class Solution(collections.abc.Sequence):
+    """
+    A path found by the solver, one record per step: the cell, the energy after the step, the
+    cost paid to enter the cell and an event code (_STEP_* flags), with the payload of the rare
+    events (wormhole taken, recharge multiplier, black hole destroyed) kept in small dicts by
+    step. The black holes alive and wormholes used after each step are stored once per change,
+    and state_index maps every step to its entry, so seeking to any step is O(1) and memory
+    grows with the path length plus the number of events, not path length times black holes.
+
+    Action strings and step dicts are only built when asked for: solution[i] returns a dict with
+    "coords", "energy_before_move", "action", "energy_after_action", "black_holes_state" and
+    "used_wormholes_state". Solutions hold no reference to the mission.
+    """
+    def __init__(self, cols: int, initial_energy: int, cells: List[int], energies: List[int], costs: List[int],
+                 events: List[int], wormholes_taken: Dict[int, str], recharge_multipliers: Dict[int, int],
+                 destroyed_black_holes: Dict[int, Tuple[int, int]], states: List[Tuple[FrozenSet, FrozenSet]],
+                 state_index: List[int]):
+        self.cols = cols
+        self.initial_energy = initial_energy
+        self._cells = array.array('l', cells)
+        self._energies = _compact_ints(energies)
+        self._costs = _compact_ints(costs)
+        self._events = bytes(events)
+        self._wormholes_taken = wormholes_taken
+        self._recharge_multipliers = recharge_multipliers
+        self._destroyed_black_holes = destroyed_black_holes
+        self._states = states
+        self._state_index = array.array('l', state_index)
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        index = range(len(self))[index] # Negative indexes and bounds check
+        black_holes, used_wormholes = self.state(index)
+        return {
+            "coords": self.coords(index),
+            "energy_before_move": self.energy_before(index),
+            "action": self.action(index),
+            "energy_after_action": self._energies[index],
+            "black_holes_state": black_holes,
+            "used_wormholes_state": used_wormholes,
+        }
+
+    def coords(self, index: int) -> Tuple[int, int]:
+        return divmod(self._cells[index], self.cols)
+
+    def energy_after(self, index: int) -> int:
+        return self._energies[index]
+
+    def energy_before(self, index: int) -> int:
+        index = range(len(self))[index]
+        return self._energies[index - 1] if index > 0 else self.initial_energy
+
+    def state(self, index: int) -> Tuple[FrozenSet[Tuple[int, int]], FrozenSet[str]]:
+        """(black holes still alive, wormholes used) after the step."""
+        return self._states[self._state_index[index]]
+
+    def action(self, index: int) -> str:
+        """Description of the step, as shown in the HUD."""
+        index = range(len(self))[index]
+        r, c = self.coords(index)
+        event = self._events[index]
+        if event & _STEP_ORIGIN:
+            action = "Departed from Origin"
+        elif event & _STEP_WORMHOLE:
+            from_r, from_c = self.coords(index - 1)
+            action = f"Took wormhole {self._wormholes_taken[index]} from ({from_r},{from_c}) to ({r},{c})."
+        else:
+            move_name = {1: "Right", -1: "Left", self.cols: "Down", -self.cols: "Up"}[self._cells[index] - self._cells[index - 1]]
+            action = f"Moved {move_name} to ({r},{c}). Cost: {self._costs[index]}."
+
+        action_at_cell = ""
+        if event & _STEP_RECHARGE:
+            action_at_cell += f"Recharged at ({r},{c}) by x{self._recharge_multipliers[index]}. New E: {self._energies[index]}. "
+        if event & _STEP_GIANT_STAR:
+            if index in self._destroyed_black_holes:
+                adj_r, adj_c = self._destroyed_black_holes[index]
+                action_at_cell += f"Giant Star at ({r},{c}) destroyed BH at ({adj_r},{adj_c}). "
+            else:
+                action_at_cell += f"Giant Star at ({r},{c}), no adjacent BH to destroy. "
+        if event & _STEP_ORIGIN or action_at_cell:
+            action += " " + action_at_cell.strip()
+        return action
+
+
+def _flat_costs(matrix) -> List[int]:
+    """Row-major list of the cost grid, from JSON lists or from a binary map's NumPy array (one C-level copy)."""
+    if isinstance(matrix, list):
+        return [cost for row in matrix for cost in row]
+    return matrix.ravel().tolist()
+
+def _total_cost(matrix) -> int:
+    if isinstance(matrix, list):
+        return sum(sum(row) for row in matrix)
+    return int(matrix.sum(dtype="int64"))
+
+class InterstellarMissionCore:
+    """
+    Map model and solver, without any pygame dependency: batch jobs, the API and the parallel
+    search workers import this module only. The pygame renderer is InterstellarMission in
+    interstellar_mission.py.
+    """
+    def __init__(self, config_filepath: str = "map_config.json", map_data: Optional[Dict] = None,
+                 black_hole_bits: Optional[Dict[Tuple[int, int], int]] = None):
+        """
+        Loads config_filepath, or map_data (same schema as the JSON file) when given. black_hole_bits
+        fixes the bit of each black hole in the search masks instead of numbering them in sorted
+        order: the parallel workers get the parent's map and bits this way, so the seeds they
+        receive mean the same in both processes even after update_map.
+        """
+        self.config_filepath = config_filepath
+
+        # Search state
+        self.solutions: List[Solution] = [] # Paths found, see Solution
+        self.search_in_progress: bool = False
+        self.max_solutions: int = 1 # Find at least one solution as per prompt
+
+        # Dominance table: State: (cell, black_holes_mask, used_wormholes_mask)
+        # Energy is NOT part of the key: arriving at the same state with less or equal energy
+        # than the best seen so far can never do better, so that arrival is pruned.
+        # Maps state_key -> highest energies expanded at this state (negated, see _record_label)
+        self._visited_states: Dict[Tuple, List[int]] = {}
+        # Memory cap of the dominance table, in states (roughly 200 bytes each on CPython);
+        # None keeps it unbounded. See _BoundedVisitedStates for the policies and the filter.
+        # A cap far below what the search needs makes it expand the same states over and over
+        # (recharge loops in the "energy" objective never end), so pair it with a solve budget.
+        self.max_visited_states: Optional[int] = None
+        self.visited_eviction: str = "lru" # "lru" or "lowest_energy"
+        self.visited_filter_bits: int = 0 # Bloom filter size for counting re-expansions, 0 = none
+        # Counters of the last search (expanded states, arrivals pruned by dominance, moves below
+        # the energy bound, states evicted from a bounded table and states expanded again after that)
+        self.search_stats: Dict[str, int] = {}
+        self._reset_search_tables()
+        # Progress of the running search, republished every few hundred expansions for the HUD:
+        # expanded states, open states (frontier) and best energy left at the destination so far
+        self.search_progress: Dict[str, Optional[int]] = {"expanded": 0, "frontier": 0, "best_energy": None}
+        # Why the last search stopped before finishing: None, "cancelled", "time budget" or "expansion budget"
+        self.search_stop_reason: Optional[str] = None
+        # Limits of the running search (see _search_should_stop)
+        self._cancel_event = None
+        self._deadline: Optional[float] = None
+        self._max_expansions: Optional[int] = None
+        # Instrumentation of the searches (see set_search_hooks), None when disabled
+        self.search_hooks: Optional[SearchHooks] = None
+
+        if map_data is None:
+            self.load_map_from_json() # Load map on initialization
+        else:
+            self._load_map_data(map_data, black_hole_bits)
+
+    def load_map_from_json(self):
+        self._load_map_data(self._read_map_file())
+
+    def _read_map_file(self) -> Dict:
+        """
+        Reads config_filepath: JSON, or the binary format of universe_binary.py, whose
+        "matrizInicial" is a memory-mapped NumPy array instead of a list of lists.
+        """
+        if is_universe_file(self.config_filepath):
+            return load_universe(self.config_filepath)
+        with open(self.config_filepath, 'r') as f:
+            return json.load(f)
+
+    def _load_map_data(self, data: Dict, black_hole_bits: Optional[Dict[Tuple[int, int], int]] = None):
+        self._map_data: Dict = data # Kept to diff against on reload_map
+        self.rows: int = data['matriz']['filas']
+        self.cols: int = data['matriz']['columnas']
+        
+        self.origin: Tuple[int, int] = tuple(data['origen'])
+        self.destination: Tuple[int, int] = tuple(data['destino'])
+        self.initial_ship_energy: int = data['cargaInicial']
+        
+        self.base_black_holes: FrozenSet[Tuple[int, int]] = frozenset(map(tuple, data['agujerosNegros']))
+        self.giant_stars: Set[Tuple[int, int]] = set(map(tuple, data['estrellasGigantes']))
+        
+        self.wormholes: Dict[Tuple[int, int], Dict] = {}
+        for i, wh in enumerate(data['agujerosGusano']):
+            entry = tuple(wh['entrada'])
+            wh_id = wh.get("id", f"wh_{i}_{entry[0]}-{entry[1]}") 
+            self.wormholes[entry] = {
+                "id": wh_id, 
+                "salida": tuple(wh['salida']),
+                "entrada": entry
+            }
+
+        self.recharge_zones: Dict[Tuple[int, int], int] = {tuple(rz[:2]): rz[2] for rz in data['zonasRecarga']}
+        self.required_charge_cells: Dict[Tuple[int, int], int] = {tuple(rc['coordenada']): rc['cargaGastada'] for rc in data['celdasCargaRequerida']}
+        
+        # List of lists from JSON, or a read-only memory-mapped NumPy array from a binary map. It is
+        # kept as given: the per-cell tables of the solver are only built by the first search.
+        self.initial_energy_matrix: List[List[int]] = data['matrizInicial']
+        self._search_tables_built: bool = False # See _ensure_search_tables
+        self._poi_graph: Optional[Dict[int, List[Tuple]]] = None # Built on the first "poi" solve
+        self._origin_cell: int = self.origin[0] * self.cols + self.origin[1]
+        self._destination_cell: int = self.destination[0] * self.cols + self.destination[1]
+
+        # Bit indexes for the search state: the black holes still alive and the wormholes
+        # already used are carried as integer bitmasks instead of frozensets.
+        if black_hole_bits is None:
+            black_hole_bits = {bh: 1 << i for i, bh in enumerate(sorted(self.base_black_holes))}
+        self._black_hole_bits: Dict[Tuple[int, int], int] = dict(black_hole_bits)
+        self._all_black_holes_mask: int = sum(self._black_hole_bits.values())
+        self._wormhole_bits: Dict[str, int] = {}
+        for wh_data in self.wormholes.values():
+            self._wormhole_bits.setdefault(wh_data["id"], 1 << len(self._wormhole_bits))
+
+        # Energy saturation for the dominance table. A shortest path between two states crosses
+        # each cell at most once per black-hole/wormhole phase, and masks only ever lose black
+        # holes or gain wormholes, so with this much energy the ship can already go anywhere it
+        # can reach at all. Above the cap, energies compare as equal, which keeps recharge loops
+        # (x2, x3... on every visit) from producing an endless stream of "better" states.
+        # Only valid while recharge zones never reduce energy.
+        self._total_cost: int = _total_cost(self.initial_energy_matrix)
+        self._energy_cap = self._compute_energy_cap()
+
+        self.solutions = []
+        self.search_in_progress = False
+
+
+    def _ensure_search_tables(self):
+        """
+        Builds the per-cell tables and the bounds the searches run on, once per loaded map. Loading
+        only reads the map: on a large binary map the grid stays a memory-mapped NumPy view until
+        the first search, and a map that is only drawn or converted never pays for the tables.
+        """
+        if self._search_tables_built:
+            return
+        self._build_cell_tables()
+
+        # Only depends on the grid, the wormholes and the destination, so it survives reload_map
+        self._steps_to_destination: List[float] = self._compute_steps_to_destination()
+        # Lower bound on the energy a ship needs at each cell to get anywhere useful, and the
+        # shortest-path tree it comes from (kept for _repair_min_energy_needed)
+        self._min_energy_needed: List[float]
+        self._min_energy_parent: List[int]
+        self._min_energy_needed, self._min_energy_parent = self._compute_min_energy_needed()
+        self._search_tables_built = True
+
+    def _compute_energy_cap(self) -> float:
+        if not all(multiplier >= 1 for multiplier in self.recharge_zones.values()):
+            return float('inf')
+        phases = len(self._black_hole_bits) + len(self._wormhole_bits) + 1
+        return phases * self._total_cost + max(self.required_charge_cells.values(), default=0)
+
+    def reload_map(self) -> Optional[Set[int]]:
+        """Re-reads the map file and applies it with update_map."""
+        return self.update_map(self._read_map_file())
+
+    def update_map(self, data: Dict) -> Optional[Set[int]]:
+        """
+        Replaces the map with data (same schema as the JSON file), repairing only what the change
+        touches instead of rebuilding everything: the per-cell tables and the energy cap of the
+        changed cells, the energy bound through _repair_min_energy_needed and the POI graph
+        corridors that walked over a changed cell. Costs, black holes, giant stars, recharge zones,
+        required charges and the initial energy can change this way. Any other change (size,
+        origin, destination, wormholes) falls back to a full load.
+
+        Returns the set of changed cells, or None after a full load. The previous solutions are
+        cleared either way.
+        """
+        old = self._map_data
+        if any(data[key] != old[key] for key in ("matriz", "origen", "destino", "agujerosGusano")):
+            self._load_map_data(data)
+            return None
+
+        cols = self.cols
+        changed: Set[int] = set()
+        # Rows are compared as whole lists first, which is fast when most of them are unchanged
+        for r, (old_row, new_row) in enumerate(zip(old['matrizInicial'], data['matrizInicial'])):
+            if not isinstance(old_row, list): # Rows of a binary map are NumPy arrays
+                old_row = old_row.tolist()
+            if not isinstance(new_row, list):
+                new_row = new_row.tolist()
+            if old_row != new_row:
+                changed.update(r * cols + c for c, (a, b) in enumerate(zip(old_row, new_row)) if a != b)
+                self._total_cost += sum(new_row) - sum(old_row)
+
+        black_holes = frozenset(map(tuple, data['agujerosNegros']))
+        giant_stars = set(map(tuple, data['estrellasGigantes']))
+        recharge_zones = {tuple(rz[:2]): rz[2] for rz in data['zonasRecarga']}
+        required_charge_cells = {tuple(rc['coordenada']): rc['cargaGastada'] for rc in data['celdasCargaRequerida']}
+        changed_coords = set(black_holes ^ self.base_black_holes) | (giant_stars ^ self.giant_stars)
+        changed_coords.update(coord for coord, _ in recharge_zones.items() ^ self.recharge_zones.items())
+        changed_coords.update(coord for coord, _ in required_charge_cells.items() ^ self.required_charge_cells.items())
+        changed.update(r * cols + c for r, c in changed_coords)
+
+        # Black holes keep their bits; new ones get fresh bits above the highest one in use
+        for bh in self.base_black_holes - black_holes:
+            del self._black_hole_bits[bh]
+        next_bit = max(self._black_hole_bits.values(), default=0).bit_length()
+        for bh in sorted(black_holes - self.base_black_holes):
+            self._black_hole_bits[bh] = 1 << next_bit
+            next_bit += 1
+        self._all_black_holes_mask = sum(self._black_hole_bits.values())
+
+        self._map_data = data
+        self.initial_ship_energy = data['cargaInicial']
+        self.initial_energy_matrix = data['matrizInicial']
+        self.base_black_holes = black_holes
+        self.giant_stars = giant_stars
+        self.recharge_zones = recharge_zones
+        self.required_charge_cells = required_charge_cells
+        self._energy_cap = self._compute_energy_cap()
+
+        if self._search_tables_built: # Otherwise the first search builds them from the new map
+            for cell in changed:
+                self._update_cell_tables(cell)
+            self._repair_min_energy_needed(changed)
+            if self._poi_graph is not None:
+                self._repair_poi_graph(changed)
+
+        self.solutions = []
+        self._reset_search_tables()
+        return changed
+
+    def _get_adjacent_cells(self, r: int, c: int) -> List[Tuple[int, int]]:
+        adj = []
+        for dr, dc in [(0,1), (0,-1), (1,0), (-1,0)]:
+            nr, nc = r + dr, c + dc
+            if 0 <= nr < self.rows and 0 <= nc < self.cols:
+                adj.append((nr, nc))
+        return adj
+
+    def _build_cell_tables(self):
+        """
+        Flattens the map into per-cell tables indexed by cell = r * cols + c, so the solver's inner
+        loop only does integer indexing instead of dict lookups on coordinate tuples.
+        """
+        cols = self.cols
+        num_cells = self.rows * cols
+
+        # Effects of arriving at a cell
+        self._cell_flags: List[int] = [0] * num_cells
+        self._recharge_multiplier: List[int] = [1] * num_cells
+        for (r, c), multiplier in self.recharge_zones.items():
+            self._cell_flags[r * cols + c] |= _RECHARGE_ZONE
+            self._recharge_multiplier[r * cols + c] = multiplier
+        for r, c in self.giant_stars:
+            self._cell_flags[r * cols + c] |= _GIANT_STAR
+
+        # Conditions and cost of entering a cell (recharge zones are free to enter)
+        self._move_cost: List[int] = _flat_costs(self.initial_energy_matrix)
+        for r, c in self.recharge_zones:
+            self._move_cost[r * cols + c] = 0
+        self._required_charge: List[int] = [0] * num_cells
+        for (r, c), min_required in self.required_charge_cells.items():
+            self._required_charge[r * cols + c] = min_required
+        self._black_hole_bit_at: List[int] = [0] * num_cells
+        for (r, c), bit in self._black_hole_bits.items():
+            self._black_hole_bit_at[r * cols + c] = bit
+
+        # Wormhole entries: (exit_cell, wh_id, wh_bit)
+        self._wormhole_at: List[Optional[Tuple[int, str, int]]] = [None] * num_cells
+        for (r, c), wh_data in self.wormholes.items():
+            exit_r, exit_c = wh_data["salida"]
+            self._wormhole_at[r * cols + c] = (exit_r * cols + exit_c, wh_data["id"], self._wormhole_bits[wh_data["id"]])
+
+        # Standard moves: (neighbour_cell, move_name), in the order Right, Left, Down, Up
+        self._neighbours: List[Tuple[Tuple[int, str], ...]] = []
+        for r in range(self.rows):
+            for c in range(cols):
+                self._neighbours.append(tuple(
+                    (nr * cols + nc, move_name)
+                    for nr, nc, move_name in ((r, c + 1, "Right"), (r, c - 1, "Left"), (r + 1, c, "Down"), (r - 1, c, "Up"))
+                    if 0 <= nr < self.rows and 0 <= nc < cols))
+        self._wormhole_entries: Dict[int, List[int]] = self._wormhole_entries_by_exit()
+
+    def _update_cell_tables(self, cell: int):
+        """Refreshes the entries of one cell in the tables of _build_cell_tables (see update_map)."""
+        coord = divmod(cell, self.cols)
+        flags = 0
+        if coord in self.recharge_zones:
+            flags |= _RECHARGE_ZONE
+        if coord in self.giant_stars:
+            flags |= _GIANT_STAR
+        self._cell_flags[cell] = flags
+        self._recharge_multiplier[cell] = self.recharge_zones.get(coord, 1)
+        self._move_cost[cell] = 0 if coord in self.recharge_zones else int(self.initial_energy_matrix[coord[0]][coord[1]])
+        self._required_charge[cell] = self.required_charge_cells.get(coord, 0)
+        self._black_hole_bit_at[cell] = self._black_hole_bits.get(coord, 0)
+
+    def solve(self, mode: str = "dfs", objective: str = "steps", workers: int = 1, cancel_event=None,
+              time_budget: Optional[float] = None, max_expansions: Optional[int] = None):
+        """
+        Searches for a path from origin to destination.
+
+        mode:
+            "dfs"   -> depth-first search, stops at the first path found (any length).
+            "astar" -> best-first search driven by a priority queue, returns an optimal path.
+            "poi"   -> same as "astar", but searching the points-of-interest graph: runs of plain
+                       cost cells are collapsed into single corridor moves.
+            "bidir" -> fewest moves, searching from both ends at once (see _solve_bidirectional).
+                       Only the "steps" objective and a single solution.
+        objective (only used by "astar" and "poi"):
+            "steps"  -> fewest moves (wormhole jumps count as one move), A* with an admissible heuristic.
+            "energy" -> highest energy left at the destination.
+        workers:
+            Number of processes for "astar" and "poi" (see _solve_parallel). 1 searches in this process.
+        cancel_event, time_budget, max_expansions:
+            Stop the search early (see iter_solutions); self.solutions then holds the best
+            solutions found so far and self.search_stop_reason says why it stopped.
+        """
+        if workers > 1:
+            self._solve_parallel(mode, objective, workers, cancel_event, time_budget, max_expansions)
+        else:
+            for _ in self.iter_solutions(k=self.max_solutions, mode=mode, objective=objective, cancel_event=cancel_event,
+                                         time_budget=time_budget, max_expansions=max_expansions):
+                pass
+
+        if self.search_stop_reason:
+            print(f"Search stopped early ({self.search_stop_reason}).")
+        if self.solutions:
+            print(f"Found {len(self.solutions)} solution(s). First one shown.")
+        else:
+            print("No solution found.")
+        print(f"Expanded {self.search_stats['expanded']} states, pruned {self.search_stats['pruned']} dominated arrivals "
+              f"and {self.search_stats['bound_pruned']} moves below the energy bound.")
+        if self.max_visited_states is not None:
+            print(f"Visited table capped at {self.max_visited_states} states: {self.search_stats['evicted']} evicted, "
+                  f"{self.search_stats['reexpanded']} re-expanded.")
+
+    def iter_solutions(self, k: int = 1, mode: str = "astar", objective: str = "steps", cancel_event=None,
+                       time_budget: Optional[float] = None, max_expansions: Optional[int] = None) -> Iterator[Solution]:
+        """
+        Generator version of solve(): yields each solution (a Solution) as soon as it is
+        found and also appends it to self.solutions, so a UI can show the first path while the
+        search goes on. With mode "astar" or "poi" it enumerates the k best distinct paths for the
+        objective, best first. With mode "dfs" it yields the first k paths found. With mode "poi"
+        paths only differ in the corridors they take, and a corridor that is not better in moves or
+        cost than another one between the same points is never used.
+
+        The search stops early when cancel_event (anything with is_set(), e.g. a threading.Event)
+        is set, after time_budget seconds or after max_expansions expanded states; the limits are
+        checked every few hundred expansions. It then still yields the destinations it already
+        reached but had not proven optimal yet (objective "energy"), best first, and sets
+        self.search_stop_reason.
+        """
+        if mode not in ("dfs", "astar", "poi", "bidir"):
+            raise ValueError(f"Unknown solve mode: {mode}")
+        if objective not in ("steps", "energy"):
+            raise ValueError(f"Unknown solve objective: {objective}")
+        if mode == "bidir" and objective != "steps":
+            raise ValueError("The bidir mode only supports the steps objective")
+
+        self._ensure_search_tables()
+        self.search_in_progress = True
+        self.solutions = []
+        self._reset_search_tables() # Clear memoization cache for new search
+        self._start_budget(cancel_event, time_budget, max_expansions)
+        if self.search_hooks is not None:
+            self.search_hooks.on_search_start(mode, objective)
+        try:
+            if mode == "dfs":
+                search = self._solve_iterative(k)
+            elif mode == "bidir":
+                search = self._solve_bidirectional()
+            else:
+                search = self._solve_best_first(objective, k, use_poi_graph=(mode == "poi"))
+            for path in search:
+                self.solutions.append(path)
+                yield path
+        finally:
+            self.search_in_progress = False
+            if self.search_hooks is not None:
+                self.search_hooks.on_search_end(self)
+
+    def set_search_hooks(self, hooks: Optional[SearchHooks]):
+        """
+        Installs hooks (a SearchHooks, e.g. SearchStatsCollector) for the following searches, or
+        removes them with None. The phases are timed by shadowing _apply_cell_effects,
+        _record_label and the successor functions with wrappers on this instance only, so the
+        search loops are the same code either way and pay nothing while no hooks are installed.
+        """
+        for name in ("_apply_cell_effects", "_record_label", "_successors", "_poi_successors"):
+            self.__dict__.pop(name, None) # Back to the class methods
+        self.search_hooks = hooks
+        if hooks is None:
+            return
+        perf_counter = time.perf_counter
+        apply_cell_effects, record_label = self._apply_cell_effects, self._record_label
+
+        def timed_apply_cell_effects(cell: int, energy: int, black_holes_mask: int):
+            start = perf_counter()
+            result = apply_cell_effects(cell, energy, black_holes_mask)
+            hooks.on_cell_effects(cell, energy, result, perf_counter() - start)
+            return result
+
+        def timed_record_label(state_key: Tuple, capped_energy: int, k: int) -> bool:
+            start = perf_counter()
+            accepted = record_label(state_key, capped_energy, k)
+            hooks.on_label_check(state_key, capped_energy, accepted, perf_counter() - start)
+            return accepted
+
+        def timed(successors_function):
+            def timed_successors(cell: int, energy: int, black_holes_mask: int, used_wormholes_mask: int):
+                start = perf_counter()
+                successors = successors_function(cell, energy, black_holes_mask, used_wormholes_mask)
+                hooks.on_successors(cell, successors, perf_counter() - start)
+                return successors
+            return timed_successors
+
+        self._apply_cell_effects = timed_apply_cell_effects
+        self._record_label = timed_record_label
+        self._successors = timed(self._successors)
+        self._poi_successors = timed(self._poi_successors)
+
+    def _reset_search_tables(self):
+        """Empties the dominance table (bounded if max_visited_states is set) and the search counters."""
+        self.search_stats = {"expanded": 0, "pruned": 0, "bound_pruned": 0, "evicted": 0, "reexpanded": 0,
+                             "backward_expanded": 0}
+        if self.max_visited_states is None:
+            self._visited_states = {}
+        else:
+            self._visited_states = _BoundedVisitedStates(self.max_visited_states, self.visited_eviction,
+                                                         self.visited_filter_bits, self.search_stats)
+
+    def _start_budget(self, cancel_event, time_budget: Optional[float], max_expansions: Optional[int]):
+        """Sets the limits checked by _search_should_stop and resets the progress counters."""
+        self._cancel_event = cancel_event
+        self._deadline = time.monotonic() + time_budget if time_budget is not None else None
+        self._max_expansions = max_expansions
+        self.search_stop_reason = None
+        self.search_progress = {"expanded": 0, "frontier": 0, "best_energy": None}
+
+    def _search_should_stop(self) -> bool:
+        """Checks the cancellation token and the budgets; records the reason the first time one is hit."""
+        if self.search_stop_reason is None:
+            if self._cancel_event is not None and self._cancel_event.is_set():
+                self.search_stop_reason = "cancelled"
+            elif self._deadline is not None and time.monotonic() >= self._deadline:
+                self.search_stop_reason = "time budget"
+            elif self._max_expansions is not None and self.search_stats["expanded"] >= self._max_expansions:
+                self.search_stop_reason = "expansion budget"
+        return self.search_stop_reason is not None
+
+    def _wormhole_entries_by_exit(self) -> Dict[int, List[int]]:
+        """Reverse wormhole edges: exit cell -> entry cells that jump to it."""
+        entries_by_exit: Dict[int, List[int]] = collections.defaultdict(list)
+        for entry_cell, wormhole in enumerate(self._wormhole_at):
+            if wormhole is not None:
+                entries_by_exit[wormhole[0]].append(entry_cell)
+        return entries_by_exit
+
+    def _compute_steps_to_destination(self) -> List[float]:
+        """
+        Relaxed distance (in moves) from every cell to the destination, computed with a backward BFS
+        that ignores energy and black holes and lets every wormhole be used. It never overestimates
+        the real number of moves left, so it is an admissible (and consistent) A* heuristic.
+        Cells that cannot reach the destination even in this relaxation get float('inf').
+        """
+        steps = [float('inf')] * (self.rows * self.cols)
+        wormhole_entries_by_exit = self._wormhole_entries
+
+        steps[self._destination_cell] = 0
+        queue = collections.deque([self._destination_cell])
+        while queue:
+            cell = queue.popleft()
+            next_steps = steps[cell] + 1
+            for previous_cell in [n for n, _ in self._neighbours[cell]] + wormhole_entries_by_exit.get(cell, []):
+                if steps[previous_cell] == float('inf'):
+                    steps[previous_cell] = next_steps
+                    queue.append(previous_cell)
+        return steps
+
+    def _compute_min_energy_needed(self) -> Tuple[List[float], List[int]]:
+        """
+        Backward Dijkstra from the destination and every recharge zone. For each cell it gives the
+        minimum energy the ship must have there (after the cell's effects) to reach the destination
+        or a recharge zone, the only places where the search can still succeed or gain energy.
+
+        Entering a cell y needs energy >= cost(y) (0 for recharge zones) and >= the required charge
+        of y, so need(x) = min over neighbours y of max(required(y), cost(y) + need(y)). Wormholes
+        give need(entry) <= need(exit). Black holes are treated as passable and wormholes as always
+        available, so the value never overestimates: a state below it can be discarded.
+        Cells that cannot reach any target get float('inf').
+
+        Returns (need, parent): parent[cell] is the successor the cell's bound comes from (-1 for
+        targets and unreachable cells), i.e. the shortest-path tree used by _repair_min_energy_needed.
+        """
+        need = [float('inf')] * (self.rows * self.cols)
+        parent = [-1] * (self.rows * self.cols)
+        heap = []
+        for target in [self._destination_cell] + [r * self.cols + c for r, c in self.recharge_zones]:
+            need[target] = 0
+            heap.append((0, target))
+        heapq.heapify(heap)
+        self._relax_min_energy_needed(need, parent, heap)
+        return need, parent
+
+    def _relax_min_energy_needed(self, need: List[float], parent: List[int], heap: List[Tuple]):
+        """Dijkstra loop of _compute_min_energy_needed, from the (needed, cell) entries in heap."""
+        wormhole_entries_by_exit = self._wormhole_entries
+        while heap:
+            needed, cell = heapq.heappop(heap)
+            if needed > need[cell]:
+                continue # Stale heap entry
+            # Energy needed by a neighbour to step into this cell and continue from there
+            needed_to_enter = max(self._required_charge[cell], self._move_cost[cell] + needed)
+            for previous_cell, _ in self._neighbours[cell]:
+                if needed_to_enter < need[previous_cell]:
+                    need[previous_cell] = needed_to_enter
+                    parent[previous_cell] = cell
+                    heapq.heappush(heap, (needed_to_enter, previous_cell))
+            for previous_cell in wormhole_entries_by_exit.get(cell, []):
+                if needed < need[previous_cell]:
+                    need[previous_cell] = needed
+                    parent[previous_cell] = cell
+                    heapq.heappush(heap, (needed, previous_cell))
+
+    def _min_energy_lookahead(self, cell: int) -> Tuple[float, int]:
+        """One step of _compute_min_energy_needed: (bound, parent) of a cell from its successors' bounds."""
+        if cell == self._destination_cell or self._cell_flags[cell] & _RECHARGE_ZONE:
+            return 0, -1
+        need = self._min_energy_needed
+        best, best_parent = float('inf'), -1
+        for next_cell, _ in self._neighbours[cell]:
+            needed = max(self._required_charge[next_cell], self._move_cost[next_cell] + need[next_cell])
+            if needed < best:
+                best, best_parent = needed, next_cell
+        wormhole = self._wormhole_at[cell]
+        if wormhole is not None and need[wormhole[0]] < best:
+            best, best_parent = need[wormhole[0]], wormhole[0]
+        return best, best_parent
+
+    def _repair_min_energy_needed(self, changed_cells: Set[int]):
+        """
+        Updates _min_energy_needed after the cells in changed_cells changed, without redoing the
+        whole Dijkstra (the dynamic shortest-path repair behind LPA*, in the Ramalingam-Reps form,
+        which stays exact with the free moves of cost 0 that plain LPA* does not handle):
+          1. Every cell whose bound came, through the shortest-path tree, from a changed cell may
+             now be too low: that subtree is invalidated (set to infinity).
+          2. The invalidated cells and the cells next to a change get their bound again from
+             their successors, keeping it only if it improves.
+          3. Dijkstra from those cells settles the rest.
+        The work is proportional to the region whose bound depends on the change.
+        """
+        need = self._min_energy_needed
+        parent = self._min_energy_parent
+
+        def predecessors(cell: int) -> List[int]:
+            return [n for n, _ in self._neighbours[cell]] + self._wormhole_entries.get(cell, [])
+
+        # 1. Subtrees hanging from the changed cells (and changed cells that stopped being targets)
+        invalid: Set[int] = set()
+        stack = [cell for cell in changed_cells if need[cell] == 0 and parent[cell] == -1]
+        for cell in changed_cells:
+            stack.extend(previous_cell for previous_cell in predecessors(cell) if parent[previous_cell] == cell)
+        while stack:
+            cell = stack.pop()
+            if cell in invalid:
+                continue
+            invalid.add(cell)
+            stack.extend(previous_cell for previous_cell in predecessors(cell) if parent[previous_cell] == cell)
+        for cell in invalid:
+            need[cell] = float('inf')
+            parent[cell] = -1
+
+        # 2. New bounds at the border of the change
+        heap = []
+        border = set(invalid) | changed_cells
+        for cell in changed_cells:
+            border.update(predecessors(cell))
+        for cell in border:
+            needed, best_parent = self._min_energy_lookahead(cell)
+            if needed < need[cell]:
+                need[cell] = needed
+                parent[cell] = best_parent
+                heapq.heappush(heap, (needed, cell))
+
+        # 3. Propagate
+        self._relax_min_energy_needed(need, parent, heap)
+
+    def _apply_cell_effects(self, cell: int, energy: int, black_holes_mask: int) -> Tuple[int, int, Optional[int]]:
+        """Applies the recharge zone / giant star effects of a cell. Returns (energy, black_holes_mask, destroyed_black_hole_cell)."""
+        flags = self._cell_flags[cell]
+        destroyed_black_hole = None # Cell of the BH destroyed by a giant star, if any
+
+        # Recharge Zone effect
+        if flags & _RECHARGE_ZONE:
+            energy = energy * self._recharge_multiplier[cell]
+
+        # Giant Star effect: destroys the first alive black hole in the fixed neighbour order
+        # (Right, Left, Down, Up), so the same map always gives the same paths
+        if flags & _GIANT_STAR:
+            for adj_cell, _ in self._neighbours[cell]:
+                bit = self._black_hole_bit_at[adj_cell]
+                if black_holes_mask & bit:
+                    black_holes_mask &= ~bit
+                    destroyed_black_hole = adj_cell
+                    break
+        return energy, black_holes_mask, destroyed_black_hole
+
+    def _successors(self, cell: int, energy: int, black_holes_mask: int, used_wormholes_mask: int) -> List[Tuple]:
+        """
+        Next states reachable from a cell once its effects have been applied.
+        Each entry is (next_cell, energy_upon_arrival, arrival_move, black_holes_mask, used_wormholes_mask).
+        """
+        black_hole_bit_at = self._black_hole_bit_at
+        required_charge = self._required_charge
+        move_cost = self._move_cost
+        min_energy_needed = self._min_energy_needed
+        successors = []
+
+        # 3.1 Wormhole Travel
+        wormhole = self._wormhole_at[cell]
+        if wormhole is not None:
+            exit_cell, wh_id, wh_bit = wormhole
+            if not used_wormholes_mask & wh_bit: # Only if this wormhole hasn't been used in *this path*
+                successors.append((exit_cell, energy, ("wormhole", wh_id, cell),
+                                   black_holes_mask, used_wormholes_mask | wh_bit))
+
+        # 3.2 Standard Moves
+        for next_cell, move_name in self._neighbours[cell]:
+            if black_holes_mask & black_hole_bit_at[next_cell]:
+                continue
+
+            if energy < required_charge[next_cell]:
+                continue
+
+            cost_from_matrix = move_cost[next_cell]
+            energy_after_move = energy - cost_from_matrix
+
+            if energy_after_move < 0:
+                continue
+
+            if energy_after_move < min_energy_needed[next_cell]:
+                self.search_stats["bound_pruned"] += 1
+                continue # Not enough energy left to reach the destination or a recharge zone
+
+            successors.append((next_cell, energy_after_move, ("move", move_name, cost_from_matrix),
+                               black_holes_mask, used_wormholes_mask))
+        return successors
+
+    def _build_poi_graph(self) -> Dict[int, List[Tuple]]:
+        """
+        Collapses the grid into a graph over its points of interest (POIs): origin, destination,
+        recharge zones, giant stars, wormhole entries and exits, required-charge cells, black holes
+        and the cells next to them. Every other cell is a plain cost cell: crossing it only
+        subtracts its cost, so a run of plain cells between two POIs can be taken as one move.
+
+        For every POI a layered BFS (one layer per move) walks through plain cells only and records
+        a corridor each time it reaches a POI (itself included, for round trips) with a lower cost
+        than any shorter corridor to it. This keeps the whole Pareto front of (moves, energy cost)
+        per pair of POIs, which is what both solve objectives need.
+
+        Returns source cell -> list of corridors (target_cell, cells, costs, total_cost), where
+        cells are the cells entered in order (ending at the target) and costs what each one charged.
+        Also records the POI set and, for every cell, the sources whose BFS looked at it, which is
+        what _repair_poi_graph needs to know which corridors a changed cell can affect.
+        """
+        self._poi_cells: Set[int] = {cell for cell in range(self.rows * self.cols) if self._is_poi(cell)}
+        self._poi_sources_by_cell: Dict[int, Set[int]] = collections.defaultdict(set)
+        return {source: self._poi_corridors_from(source) for source in self._poi_cells}
+
+    def _is_poi(self, cell: int) -> bool:
+        if cell == self._origin_cell or cell == self._destination_cell:
+            return True
+        if self._cell_flags[cell] or self._required_charge[cell]:
+            return True
+        if self._wormhole_at[cell] is not None or cell in self._wormhole_entries:
+            return True
+        # Black holes and the cells next to them
+        return bool(self._black_hole_bit_at[cell]) or any(self._black_hole_bit_at[n] for n, _ in self._neighbours[cell])
+
+    def _poi_corridors_from(self, source: int) -> List[Tuple]:
+        """Layered BFS of _build_poi_graph from one POI."""
+        pois = self._poi_cells
+        sources_by_cell = self._poi_sources_by_cell
+        corridors = []
+        # The source itself is not seeded: round trips back to it (e.g. to recharge again) are corridors too
+        best_cost: Dict[int, int] = {}
+        # Label: (cell, cost_so_far, parent_label). Labels of one layer all have the same number of moves.
+        frontier = [(source, 0, None)]
+        while frontier:
+            next_layer: Dict[int, Tuple] = {}
+            for label in frontier:
+                cell, cost, _ = label
+                for next_cell, _ in self._neighbours[cell]:
+                    sources_by_cell[next_cell].add(source)
+                    new_cost = cost + self._move_cost[next_cell]
+                    # Shorter corridors were found first: only a cheaper one is worth keeping
+                    if new_cost >= best_cost.get(next_cell, float('inf')):
+                        continue
+                    if next_cell not in next_layer or new_cost < next_layer[next_cell][1]:
+                        next_layer[next_cell] = (next_cell, new_cost, label)
+
+            frontier = []
+            for next_cell, label in next_layer.items():
+                best_cost[next_cell] = label[1]
+                if next_cell in pois:
+                    corridors.append(self._corridor_from_label(label))
+                else:
+                    frontier.append(label) # Keep walking through plain cells only
+        return corridors
+
+    def _repair_poi_graph(self, changed_cells: Set[int]):
+        """
+        Drops the corridors that a change can affect (see update_map): those of every source
+        whose BFS looked at a changed cell. They are rebuilt lazily by _poi_successors, so a
+        re-solve only pays for the POIs it actually reaches. POI status depends on the cell and,
+        for black holes, on its neighbours.
+        """
+        pois = self._poi_cells
+        stale: Set[int] = set()
+        status_candidates = set(changed_cells)
+        for cell in changed_cells:
+            status_candidates.update(n for n, _ in self._neighbours[cell])
+        for cell in status_candidates:
+            is_poi = self._is_poi(cell)
+            if is_poi == (cell in pois):
+                continue
+            if is_poi:
+                pois.add(cell)
+            else:
+                pois.discard(cell)
+                self._poi_graph.pop(cell, None)
+            stale.update(self._poi_sources_by_cell.get(cell, ()))
+        for cell in changed_cells:
+            stale.update(self._poi_sources_by_cell.get(cell, ()))
+
+        # Old entries of _poi_sources_by_cell are kept: at worst they cause an extra rebuild later
+        for source in stale:
+            self._poi_graph.pop(source, None)
+
+    def _corridor_from_label(self, label: Tuple) -> Tuple:
+        cells = []
+        costs = []
+        while label[2] is not None:
+            cell, cost, parent = label
+            cells.append(cell)
+            costs.append(cost - parent[1])
+            label = parent
+        cells.reverse()
+        costs.reverse()
+        return (cells[-1], tuple(cells), tuple(costs), sum(costs))
+
+    def _poi_successors(self, cell: int, energy: int, black_holes_mask: int, used_wormholes_mask: int) -> List[Tuple]:
+        """Same contract as _successors, but moving along the corridors of the POI graph."""
+        successors = []
+
+        wormhole = self._wormhole_at[cell]
+        if wormhole is not None:
+            exit_cell, wh_id, wh_bit = wormhole
+            if not used_wormholes_mask & wh_bit:
+                successors.append((exit_cell, energy, ("wormhole", wh_id, cell),
+                                   black_holes_mask, used_wormholes_mask | wh_bit))
+
+        corridors = self._poi_graph.get(cell)
+        if corridors is None: # Dropped by _repair_poi_graph
+            corridors = self._poi_graph[cell] = self._poi_corridors_from(cell)
+        for target, cells, costs, total_cost in corridors:
+            if black_holes_mask & self._black_hole_bit_at[target]:
+                continue
+            energy_after_corridor = energy - total_cost
+            if energy_after_corridor < 0:
+                continue # Costs are never negative, so this is the lowest energy along the corridor
+            # The required charge is checked with the energy left just before entering the target cell
+            if energy_after_corridor + costs[-1] < self._required_charge[target]:
+                continue
+            if energy_after_corridor < self._min_energy_needed[target]:
+                self.search_stats["bound_pruned"] += 1
+                continue
+            successors.append((target, energy_after_corridor, ("corridor", cells, costs),
+                               black_holes_mask, used_wormholes_mask))
+        return successors
+
+    def _solve_iterative(self, k: int = 1) -> Iterator[Solution]:
+        # Generator: yields each path (a Solution) as soon as the destination is reached,
+        # at most k of them.
+
+        # Stack for DFS: (cell, current_energy_upon_arrival, parent_idx, arrival_move, black_holes_mask, used_wormholes_mask)
+        # We push states that need to be processed.
+
+        # Instead of copying the whole path on every push, every state that survives the
+        # memoization check is stored once in an arena (as a _SearchNode) together with the
+        # index of its parent. The path is only rebuilt (see _reconstruct_path)
+        # when the destination is reached, so frontier entries stay O(1) in size.
+        #
+        # arrival_move describes how the ship got to the cell:
+        #   ("origin",)                             -> starting cell
+        #   ("move", move_name, cost)               -> standard move
+        #   ("wormhole", wh_id, from_cell)          -> wormhole jump
+        #   ("corridor", cells, costs)              -> run of plain cells (POI graph only)
+        #
+        # Cells are flat indexes (r * cols + c) into the tables built by _build_cell_tables, and black
+        # holes and used wormholes are integer bitmasks, so the state key is a tuple of plain ints.
+        arena: List[_SearchNode] = []
+        energy_cap = self._energy_cap
+        search_stats = self.search_stats
+        destination_cell = self._destination_cell
+
+        # We process the 'arrival' effects of the cell when we *pop* it from the stack.
+        stack = collections.deque() # Using deque as a stack (append and pop from right)
+
+        # Initial push: The state *before* applying effects at the origin cell itself.
+        stack.append((self._origin_cell, self.initial_ship_energy, -1, ("origin",), self._all_black_holes_mask, 0))
+
+        found = 0
+        pops = 0
+        best_energy = None
+        while stack:
+            pops += 1
+            if pops & 255 == 0: # Publish progress and check the budget every 256 pops
+                self.search_progress = {"expanded": search_stats["expanded"], "frontier": len(stack), "best_energy": best_energy}
+                if self._search_should_stop():
+                    return
+
+            # Pop the current state to process
+            cell, current_energy_upon_arrival, parent_idx, arrival_move, black_holes_mask, used_wormholes_mask = stack.pop()
+
+            # --- Apply effects of the current cell AFTER arriving there ---
+            energy_for_next_moves, black_holes_mask, destroyed_black_hole = self._apply_cell_effects(
+                cell, current_energy_upon_arrival, black_holes_mask)
+
+            # --- Dominance Check AFTER applying effects at current cell ---
+            if not self._record_label((cell, black_holes_mask, used_wormholes_mask),
+                                      min(energy_for_next_moves, energy_cap), k):
+                search_stats["pruned"] += 1
+                continue # Already visited this state with equal or more energy, so prune this path.
+            search_stats["expanded"] += 1
+
+            # The state is expanded: store it once in the arena.
+            node_idx = len(arena)
+            arena.append(_SearchNode(parent_idx, cell, arrival_move, destroyed_black_hole,
+                                     energy_for_next_moves, black_holes_mask, used_wormholes_mask))
+
+            # --- Base Case: Destination Reached ---
+            if cell == destination_cell:
+                best_energy = energy_for_next_moves if best_energy is None else max(best_energy, energy_for_next_moves)
+                self.search_progress = {"expanded": search_stats["expanded"], "frontier": len(stack), "best_energy": best_energy}
+                yield self._reconstruct_path(arena, node_idx)
+                found += 1
+                if found >= k:
+                    return # Stop searching if enough solutions found
+
+            # --- Explore Next Moves (Standard moves and Wormholes) ---
+            for next_cell, energy_upon_arrival, move, next_black_holes, next_wormholes in self._successors(
+                    cell, energy_for_next_moves, black_holes_mask, used_wormholes_mask):
+                stack.append((next_cell, energy_upon_arrival, node_idx, move, next_black_holes, next_wormholes))
+
+    def _solve_bidirectional(self) -> Iterator[Solution]:
+        """
+        Fewest-moves search growing a forward breadth-first search from the origin and a backward
+        one from the destination, one layer (one move) at a time on the side with the smaller
+        frontier. Yields at most one path.
+
+        The forward side expands the same states as the other modes (with the same dominance
+        table). The backward side walks reversed moves and keeps energy-requirement labels: a label
+        at a cell is a path from that cell to the destination together with the energy the ship
+        must have there (after the cell's effects) to follow it, and the wormholes it uses. Entering
+        a cell y from x needs max(required(y), cost(y) + need upon arrival at y); a recharge zone
+        divides what is needed after it by its multiplier (rounded up); a wormhole jump passes the
+        requirement through unchanged. Per (cell, wormholes used) only labels needing strictly less
+        energy than every shorter one are kept, so the backward side is a Pareto front of
+        (moves, energy needed).
+
+        A forward state meets a backward label at the same cell when its energy covers the
+        label's requirement and they use no wormhole in common. The search stops once the two
+        depths add up to the best meeting found: any shorter path would have met by then.
+
+        Conservative parts: the backward side treats every black hole as a wall, since whether a
+        giant star has destroyed it depends on the forward path (giant stars only remove black
+        holes, so they cannot break a backward path). The path found is always valid, and it is
+        the shortest one unless every shortest path needs to cross a black hole destroyed on the
+        way, in the backward half.
+        """
+        cols = self.cols
+        energy_cap = self._energy_cap
+        search_stats = self.search_stats
+        destination_cell = self._destination_cell
+        black_hole_cells = {r * cols + c for r, c in self.base_black_holes}
+
+        # Backward label: (cell, moves, need_after_effects, used_wormholes_mask, next_label, move),
+        # where move goes from cell to next_label's cell. The destination is the root.
+        root = (destination_cell, 0, 0, 0, None, None)
+        backward_by_cell: Dict[int, List[Tuple]] = collections.defaultdict(list)
+        backward_by_cell[destination_cell].append(root)
+        best_need: Dict[Tuple[int, int], int] = {(destination_cell, 0): 0}
+        backward_layer = [root]
+        backward_depth = 0
+
+        # Forward states registered so far, by cell: (moves, energy, used_wormholes_mask, node_idx)
+        arena: List[_SearchNode] = []
+        forward_by_cell: Dict[int, List[Tuple]] = collections.defaultdict(list)
+        # Layer entries: (cell, energy_upon_arrival, parent_idx, arrival_move, black_holes_mask, used_wormholes_mask)
+        forward_layer = [(self._origin_cell, self.initial_ship_energy, -1, ("origin",), self._all_black_holes_mask, 0)]
+        forward_depth = -1 # The origin layer is registered by the first forward step
+
+        best = None # (total_moves, node_idx, energy, label)
+
+        def need_upon_arrival(cell: int, need_after: int) -> float:
+            if not self._cell_flags[cell] & _RECHARGE_ZONE:
+                return need_after
+            multiplier = self._recharge_multiplier[cell]
+            if multiplier <= 0:
+                return 0 if need_after <= 0 else float('inf')
+            return -(-need_after // multiplier)
+
+        def meet(moves: int, energy: int, used_wormholes_mask: int, node_idx: int, label: Tuple):
+            nonlocal best
+            if energy >= label[2] and not used_wormholes_mask & label[3]:
+                total_moves = moves + label[1]
+                if best is None or total_moves < best[0]:
+                    best = (total_moves, node_idx, energy, label)
+
+        while best is None or forward_depth + backward_depth < best[0]:
+            if not forward_layer and not backward_layer:
+                break
+            # Once per layer: publish progress and check the budget
+            self.search_progress = {"expanded": search_stats["expanded"] + search_stats["backward_expanded"],
+                                    "frontier": len(forward_layer) + len(backward_layer),
+                                    "best_energy": best[2] if best else None}
+            if self._search_should_stop():
+                break
+
+            if forward_layer and (not backward_layer or forward_depth < 0 or len(forward_layer) <= len(backward_layer)):
+                # Forward step: register the pending layer and generate the next one
+                forward_depth += 1
+                next_layer = []
+                for cell, energy, parent_idx, arrival_move, black_holes_mask, used_wormholes_mask in forward_layer:
+                    energy, black_holes_mask, destroyed_black_hole = self._apply_cell_effects(cell, energy, black_holes_mask)
+                    if not self._record_label((cell, black_holes_mask, used_wormholes_mask), min(energy, energy_cap), 1):
+                        search_stats["pruned"] += 1
+                        continue
+                    search_stats["expanded"] += 1
+                    node_idx = len(arena)
+                    arena.append(_SearchNode(parent_idx, cell, arrival_move, destroyed_black_hole,
+                                             energy, black_holes_mask, used_wormholes_mask))
+                    forward_by_cell[cell].append((forward_depth, energy, used_wormholes_mask, node_idx))
+                    for label in backward_by_cell.get(cell, []):
+                        meet(forward_depth, energy, used_wormholes_mask, node_idx, label)
+                    for next_cell, energy_upon_arrival, move, next_black_holes, next_wormholes in self._successors(
+                            cell, energy, black_holes_mask, used_wormholes_mask):
+                        next_layer.append((next_cell, energy_upon_arrival, node_idx, move, next_black_holes, next_wormholes))
+                forward_layer = next_layer
+            else:
+                # Backward step: labels one move further from the destination
+                backward_depth += 1
+                next_layer = []
+                for label in backward_layer:
+                    cell, moves, need_after, used_wormholes_mask, _, _ = label
+                    needed = need_upon_arrival(cell, need_after)
+                    needed_to_enter = max(self._required_charge[cell], self._move_cost[cell] + needed)
+                    predecessors = [(previous_cell, needed_to_enter, used_wormholes_mask,
+                                     ("move", self._move_name(previous_cell, cell), self._move_cost[cell]))
+                                    for previous_cell, _ in self._neighbours[cell]]
+                    for previous_cell in self._wormhole_entries.get(cell, []):
+                        _, wh_id, wh_bit = self._wormhole_at[previous_cell]
+                        if not used_wormholes_mask & wh_bit:
+                            predecessors.append((previous_cell, needed, used_wormholes_mask | wh_bit,
+                                                 ("wormhole", wh_id, previous_cell)))
+                    for previous_cell, previous_need, previous_wormholes, move in predecessors:
+                        if previous_cell in black_hole_cells or previous_cell == destination_cell:
+                            continue
+                        key = (previous_cell, previous_wormholes)
+                        if previous_need >= best_need.get(key, float('inf')):
+                            continue # A shorter label needs as little energy
+                        best_need[key] = previous_need
+                        new_label = (previous_cell, backward_depth, previous_need, previous_wormholes, label, move)
+                        search_stats["backward_expanded"] += 1
+                        backward_by_cell[previous_cell].append(new_label)
+                        next_layer.append(new_label)
+                        for moves_so_far, energy, forward_wormholes, node_idx in forward_by_cell.get(previous_cell, []):
+                            meet(moves_so_far, energy, forward_wormholes, node_idx, new_label)
+                backward_layer = next_layer
+
+        if best is None:
+            return
+        # Follow the backward label from the meeting cell to the destination, applying the effects
+        _, node_idx, energy, label = best
+        node = arena[node_idx]
+        black_holes_mask, used_wormholes_mask = node.black_holes_mask, node.used_wormholes_mask
+        while label[4] is not None:
+            next_label, move = label[4], label[5]
+            next_cell = next_label[0]
+            if move[0] == "move":
+                energy -= move[2]
+            else:
+                used_wormholes_mask |= self._wormhole_at[move[2]][2]
+            energy, black_holes_mask, destroyed_black_hole = self._apply_cell_effects(next_cell, energy, black_holes_mask)
+            arena.append(_SearchNode(node_idx, next_cell, move, destroyed_black_hole,
+                                     energy, black_holes_mask, used_wormholes_mask))
+            node_idx = len(arena) - 1
+            label = next_label
+        yield self._reconstruct_path(arena, node_idx)
+
+    def _solve_best_first(self, objective: str, k: int = 1, use_poi_graph: bool = False) -> Iterator[Solution]:
+        """Yields the k best paths of _best_first_nodes as Solutions."""
+        for arena, node_idx, _, _ in self._best_first_nodes(objective, k, use_poi_graph):
+            yield self._reconstruct_path(arena, node_idx)
+
+    def _best_first_nodes(self, objective: str, k: int = 1, use_poi_graph: bool = False,
+                          seeds: Optional[List[Tuple]] = None, incumbent=None) -> Iterator[Tuple]:
+        """
+        Best-first search over the same states as _solve_iterative, using a priority queue.
+        Generator: yields (arena, node_idx, moves, capped_energy) for the k best destination nodes
+        in order, each one as soon as it is known that no state left in the queue can lead to a
+        better one.
+
+        objective == "steps":
+            A* on the number of moves. Priority is (moves + heuristic, -energy). The heuristic is
+            consistent, so for a given (cell, black holes, wormholes) key the later pops never have
+            fewer moves, and the dominance table (best energy per key) stays exact: a later arrival
+            with less or equal energy is dominated in both criteria. The first time the destination
+            is popped the path has the minimum number of moves.
+        objective == "energy":
+            Maximises the energy left at the destination. Recharge loops can pump energy without
+            limit, so in this mode energies compare as saturated at the energy cap (see
+            load_map_from_json), which is enough to go anywhere on the map; the nodes and the
+            Solutions still carry the ship's real energy. States are popped by
+            highest upper bound on the final energy: without recharge zones energy can only go down,
+            so the bound is the current energy and destinations come out in order; with recharge
+            zones the bound is the cap, and destinations reached below it are held back until
+            nothing left in the queue can beat them.
+
+        use_poi_graph:
+            Search the points-of-interest graph (see _build_poi_graph) instead of single cells.
+            Corridor moves count as many moves as cells they cross, so both objectives keep their
+            optimal results.
+
+        seeds:
+            States to start from instead of the origin, as (cell, energy_upon_arrival, moves,
+            parent_idx, arrival_move, black_holes_mask, used_wormholes_mask). Used by the parallel
+            workers; a parent_idx below -1 points to a node outside this arena.
+        incumbent:
+            Shared value (multiprocessing.Value) with the score of the best solution found by any
+            worker: fewest moves for "steps", highest capped energy for "energy". Read every few
+            hundred pops; once the front of the queue cannot beat it the search stops. Only used
+            with k == 1.
+        """
+        arena: List[_SearchNode] = []
+        energy_cap = self._energy_cap
+        search_stats = self.search_stats
+        steps_to_destination = self._steps_to_destination
+        can_recharge = bool(self.recharge_zones)
+        if use_poi_graph:
+            if self._poi_graph is None:
+                self._poi_graph = self._build_poi_graph()
+            successors = self._poi_successors
+        else:
+            successors = self._successors
+
+        def priority(cell: int, energy: int, moves: int) -> Tuple:
+            if objective == "steps":
+                return (moves + steps_to_destination[cell], -energy)
+            capped_energy = min(energy, energy_cap)
+            upper_bound = energy_cap if can_recharge else capped_energy
+            return (-upper_bound, -capped_energy, moves)
+
+        # Heap entry: (priority, push_counter, cell, energy_upon_arrival, moves, parent_idx,
+        #              arrival_move, black_holes_mask, used_wormholes_mask)
+        # push_counter breaks ties so the heap never compares the move tuples.
+        push_counter = itertools.count()
+        heap = []
+        destination_cell = self._destination_cell
+        if seeds is None:
+            seeds = [(self._origin_cell, self.initial_ship_energy, 0, -1, ("origin",), self._all_black_holes_mask, 0)]
+        for cell, energy, moves, parent_idx, arrival_move, black_holes_mask, used_wormholes_mask in seeds:
+            if steps_to_destination[cell] == float('inf'):
+                continue # Destination unreachable even ignoring energy and black holes
+            heapq.heappush(heap, (priority(cell, energy, moves), next(push_counter), cell, energy, moves,
+                                  parent_idx, arrival_move, black_holes_mask, used_wormholes_mask))
+        use_incumbent = incumbent is not None and k == 1
+        if use_incumbent:
+            best_known = incumbent.value
+
+        # Destinations reached in "energy" mode that may still be beaten: (-energy, moves, counter, node_idx)
+        pending_solutions = []
+        found = 0
+        pops = 0
+        best_energy = None
+        while heap:
+            # Release the pending solutions that nothing left in the queue can beat
+            while pending_solutions and -pending_solutions[0][0] >= -heap[0][0][0]:
+                negated_energy, moves, _, node_idx = heapq.heappop(pending_solutions)
+                yield arena, node_idx, moves, -negated_energy
+                found += 1
+                if found >= k:
+                    return
+
+            pops += 1
+            if pops & 255 == 0: # Publish progress and check the budget every 256 pops
+                self.search_progress = {"expanded": search_stats["expanded"], "frontier": len(heap), "best_energy": best_energy}
+                if self._search_should_stop():
+                    break # Still hand out the pending solutions below: the best found so far
+                if use_incumbent:
+                    best_known = incumbent.value
+            if use_incumbent:
+                # The queue is ordered by its bound, so nothing behind the front can do better either
+                if objective == "steps" and heap[0][0][0] >= best_known:
+                    break
+                if objective == "energy" and -heap[0][0][0] <= best_known:
+                    break
+
+            (_, _, cell, current_energy_upon_arrival, moves, parent_idx, arrival_move,
+             black_holes_mask, used_wormholes_mask) = heapq.heappop(heap)
+
+            energy_for_next_moves, black_holes_mask, destroyed_black_hole = self._apply_cell_effects(
+                cell, current_energy_upon_arrival, black_holes_mask)
+            # Only the comparisons saturate at the cap: the nodes keep the ship's real energy
+            capped_energy = min(energy_for_next_moves, energy_cap)
+            if not self._record_label((cell, black_holes_mask, used_wormholes_mask), capped_energy, k):
+                search_stats["pruned"] += 1
+                continue
+            search_stats["expanded"] += 1
+
+            node_idx = len(arena)
+            arena.append(_SearchNode(parent_idx, cell, arrival_move, destroyed_black_hole,
+                                     energy_for_next_moves, black_holes_mask, used_wormholes_mask))
+
+            if cell == destination_cell:
+                best_energy = energy_for_next_moves if best_energy is None else max(best_energy, energy_for_next_moves)
+                self.search_progress = {"expanded": search_stats["expanded"], "frontier": len(heap), "best_energy": best_energy}
+                if objective == "steps":
+                    # Popped in order of moves + heuristic, and the heuristic is 0 here
+                    yield arena, node_idx, moves, capped_energy
+                    found += 1
+                    if found >= k:
+                        return
+                else:
+                    heapq.heappush(pending_solutions, (-capped_energy, moves, next(push_counter), node_idx))
+
+            for next_cell, energy_upon_arrival, move, next_black_holes, next_wormholes in successors(
+                    cell, energy_for_next_moves, black_holes_mask, used_wormholes_mask):
+                if steps_to_destination[next_cell] == float('inf'):
+                    continue # Cannot reach the destination from there
+                next_moves = moves + (len(move[1]) if move[0] == "corridor" else 1)
+                heapq.heappush(heap, (priority(next_cell, energy_upon_arrival, next_moves), next(push_counter),
+                                      next_cell, energy_upon_arrival, next_moves, node_idx, move,
+                                      next_black_holes, next_wormholes))
+
+        while pending_solutions and found < k:
+            negated_energy, moves, _, node_idx = heapq.heappop(pending_solutions)
+            yield arena, node_idx, moves, -negated_energy
+            found += 1
+
+    def _solve_parallel(self, mode: str, objective: str, workers: int, cancel_event=None,
+                        time_budget: Optional[float] = None, max_expansions: Optional[int] = None):
+        """
+        Runs a best-first search ("astar" or "poi") on a ProcessPoolExecutor.
+
+        The search tree is split by its frontier: this process expands the first levels breadth
+        first until there are enough open states to keep every worker busy, then deals them out
+        round robin (states of one first-level branch end up spread over several workers, which
+        balances uneven branches). Each worker runs _best_first_nodes from its seeds with its own
+        dominance table. The score of the best solution found so far is shared through a
+        multiprocessing.Value and read periodically by every worker, so a worker stops as soon as
+        its queue cannot beat what another worker already found. Results are merged here, the k
+        best are kept and their node chains are stitched onto the prefix arena.
+
+        cancel_event is polled here and forwarded to the workers through a multiprocessing.Event;
+        the deadline is shared as is and max_expansions is split evenly between the workers.
+        """
+        if mode not in ("astar", "poi"):
+            raise ValueError(f"Parallel search needs mode 'astar' or 'poi', not: {mode}")
+        if objective not in ("steps", "energy"):
+            raise ValueError(f"Unknown solve objective: {objective}")
+
+        k = self.max_solutions
+        use_poi_graph = mode == "poi"
+        self._ensure_search_tables()
+        self.search_in_progress = True
+        self.solutions = []
+        self._reset_search_tables()
+        self._start_budget(cancel_event, time_budget, max_expansions)
+        if self.search_hooks is not None:
+            self.search_hooks.on_search_start(mode, objective)
+        try:
+            self._parallel_search(objective, workers, k, use_poi_graph, max_expansions)
+        finally: # A failing pool or worker must not leave the mission marked busy
+            self.search_in_progress = False
+            if self.search_hooks is not None:
+                self.search_hooks.on_search_end(self)
+
+    def _parallel_search(self, objective: str, workers: int, k: int, use_poi_graph: bool, max_expansions: Optional[int]):
+        """Prefix expansion, worker pool and merge of _solve_parallel; sets self.solutions."""
+        # Imported here: they are the bulk of this module's import time and only this path needs them
+        import concurrent.futures
+        import multiprocessing
+
+        if use_poi_graph and self._poi_graph is None:
+            self._poi_graph = self._build_poi_graph()
+
+        arena, frontier, candidates = self._expand_prefix(objective, use_poi_graph, target_size=workers * 8)
+
+        if frontier and not self._search_should_stop():
+            incumbent = multiprocessing.Value('d', float('inf') if objective == "steps" else -1.0)
+            for moves, capped_energy, _ in candidates: # Solutions already found by the prefix
+                if objective == "steps":
+                    incumbent.value = min(incumbent.value, moves)
+                else:
+                    incumbent.value = max(incumbent.value, capped_energy)
+
+            worker_cancel = multiprocessing.Event()
+            # time.monotonic() is system wide, so the deadline means the same in every worker
+            worker_max_expansions = -(-max_expansions // workers) if max_expansions is not None else None
+            partitions = [frontier[i::workers] for i in range(workers)]
+            with concurrent.futures.ProcessPoolExecutor(
+                    max_workers=workers, initializer=_init_parallel_worker,
+                    initargs=(self.config_filepath, self._map_data, self._black_hole_bits, incumbent, worker_cancel,
+                              (self.max_visited_states, self.visited_eviction, self.visited_filter_bits))) as executor:
+                futures = [executor.submit(_parallel_search_worker,
+                                           [seed[:3] + (-2 - i,) + seed[4:] for i, seed in enumerate(partition)],
+                                           objective, k, use_poi_graph, self._deadline, worker_max_expansions)
+                           for partition in partitions if partition]
+                running = set(futures)
+                while running:
+                    _, running = concurrent.futures.wait(running, timeout=0.1)
+                    if self._cancel_event is not None and self._cancel_event.is_set():
+                        worker_cancel.set()
+                for future, partition in zip(futures, [p for p in partitions if p]):
+                    results, stats, stop_reason = future.result()
+                    self.search_stop_reason = self.search_stop_reason or stop_reason
+                    for key in self.search_stats:
+                        self.search_stats[key] += stats[key]
+                    for moves, capped_energy, seed_index, chain in results:
+                        # Stitch the worker's node chain onto the prefix arena
+                        parent_idx = partition[seed_index][3]
+                        for cell, arrival_move, destroyed_black_hole, energy, black_holes_mask, used_wormholes_mask in chain:
+                            arena.append(_SearchNode(parent_idx, cell, arrival_move, destroyed_black_hole,
+                                                     energy, black_holes_mask, used_wormholes_mask))
+                            parent_idx = len(arena) - 1
+                        candidates.append((moves, capped_energy, parent_idx))
+
+        if objective == "steps":
+            candidates.sort(key=lambda candidate: (candidate[0], -candidate[1]))
+        else:
+            candidates.sort(key=lambda candidate: (-candidate[1], candidate[0]))
+        self.solutions = [self._reconstruct_path(arena, node_idx) for _, _, node_idx in candidates[:k]]
+
+    def _expand_prefix(self, objective: str, use_poi_graph: bool, target_size: int) -> Tuple[List[_SearchNode], List[Tuple], List[Tuple]]:
+        """
+        Breadth-first expansion from the origin until the open frontier has at least target_size
+        states (or the search space runs out). Dead ends are dropped by the energy bound in
+        _successors, so the frontier only shrinks when the search space does. Returns (arena,
+        frontier, candidates): the frontier entries use the seed format of _best_first_nodes with parent indexes into arena, and
+        candidates are the destinations already reached as (moves, capped_energy, node_idx).
+        """
+        arena: List[_SearchNode] = []
+        candidates = []
+        successors = self._poi_successors if use_poi_graph else self._successors
+        frontier = [(self._origin_cell, self.initial_ship_energy, 0, -1, ("origin",), self._all_black_holes_mask, 0)]
+        while frontier and len(frontier) < target_size:
+            next_frontier = []
+            for cell, energy, moves, parent_idx, arrival_move, black_holes_mask, used_wormholes_mask in frontier:
+                energy, black_holes_mask, destroyed_black_hole = self._apply_cell_effects(cell, energy, black_holes_mask)
+                capped_energy = min(energy, self._energy_cap)
+                # No dominance pruning here: levels are not ordered by moves once corridors are
+                # involved, and the workers prune against their own tables anyway.
+                self.search_stats["expanded"] += 1
+                node_idx = len(arena)
+                arena.append(_SearchNode(parent_idx, cell, arrival_move, destroyed_black_hole,
+                                         energy, black_holes_mask, used_wormholes_mask))
+                if cell == self._destination_cell:
+                    candidates.append((moves, capped_energy, node_idx))
+                for next_cell, next_energy, move, next_black_holes, next_wormholes in successors(
+                        cell, energy, black_holes_mask, used_wormholes_mask):
+                    next_moves = moves + (len(move[1]) if move[0] == "corridor" else 1)
+                    next_frontier.append((next_cell, next_energy, next_moves, node_idx, move, next_black_holes, next_wormholes))
+            frontier = next_frontier
+        return arena, frontier, candidates
+
+    def _record_label(self, state_key: Tuple, capped_energy: int, k: int) -> bool:
+        """
+        Dominance check for a state about to be expanded. The table keeps, per state key, the k
+        highest energies expanded so far (negated, ascending). An arrival is dominated when k labels
+        with at least as much energy were already expanded: whatever it can still do, each of them
+        can do too, which already gives k distinct paths that are as good. Returns False in that
+        case, otherwise records the arrival and returns True. With k == 1 this is the plain
+        "best energy per state" table.
+        """
+        visited_states = self._visited_states
+        labels = visited_states.get(state_key)
+        if k == 1 and labels is not None:
+            if labels[0] <= -capped_energy:
+                return False
+            labels[0] = -capped_energy
+        elif labels is None:
+            visited_states[state_key] = [-capped_energy]
+            return True
+        else:
+            if len(labels) >= k and labels[-1] <= -capped_energy:
+                return False
+            bisect.insort(labels, -capped_energy)
+            if len(labels) > k:
+                labels.pop()
+        if self.max_visited_states is not None:
+            visited_states.updated(state_key, labels)
+        return True
+
+    def _decode_black_holes(self, black_holes_mask: int) -> FrozenSet[Tuple[int, int]]:
+        return frozenset(bh for bh, bit in self._black_hole_bits.items() if black_holes_mask & bit)
+
+    def _decode_wormholes(self, used_wormholes_mask: int) -> FrozenSet[str]:
+        return frozenset(wh_id for wh_id, bit in self._wormhole_bits.items() if used_wormholes_mask & bit)
+
+    def _reconstruct_path(self, arena: List[_SearchNode], node_idx: int) -> Solution:
+        """Walks the parent pointers from node_idx back to the origin and packs the steps into a Solution."""
+        nodes = []
+        while node_idx >= 0:
+            node = arena[node_idx]
+            nodes.append(node)
+            node_idx = node.parent_idx
+        nodes.reverse()
+
+        cells, energies, costs, events = [], [], [], []
+        wormholes_taken, recharge_multipliers, destroyed_black_holes = {}, {}, {}
+        states, state_index = [], []
+        state_masks = None
+        energy_before_move = self.initial_ship_energy
+
+        def add_step(cell: int, energy_after: int, cost: int, event: int, black_holes_mask: int, used_wormholes_mask: int):
+            nonlocal state_masks
+            if (black_holes_mask, used_wormholes_mask) != state_masks:
+                state_masks = (black_holes_mask, used_wormholes_mask)
+                states.append((self._decode_black_holes(black_holes_mask), self._decode_wormholes(used_wormholes_mask)))
+            cells.append(cell)
+            energies.append(energy_after)
+            costs.append(cost)
+            events.append(event)
+            state_index.append(len(states) - 1)
+
+        previous_node = None
+        for node in nodes:
+            arrival_move = node.arrival_move
+            if arrival_move[0] == "corridor":
+                # Expand the corridor back into single moves. Plain cells have no effects, so
+                # black holes and wormholes are the ones carried by the previous node.
+                _, corridor_cells, corridor_costs = arrival_move
+                for corridor_cell, cost in zip(corridor_cells[:-1], corridor_costs[:-1]):
+                    energy_before_move -= cost
+                    add_step(corridor_cell, energy_before_move, cost, 0,
+                             previous_node.black_holes_mask, previous_node.used_wormholes_mask)
+                arrival_move = ("move", None, corridor_costs[-1])
+
+            step = len(cells)
+            event, cost = 0, 0
+            if arrival_move[0] == "origin":
+                event |= _STEP_ORIGIN
+            elif arrival_move[0] == "wormhole":
+                event |= _STEP_WORMHOLE
+                wormholes_taken[step] = arrival_move[1]
+            else:
+                cost = arrival_move[2]
+
+            # Effects at the cell
+            coord = divmod(node.cell, self.cols)
+            if coord in self.recharge_zones:
+                event |= _STEP_RECHARGE
+                recharge_multipliers[step] = self.recharge_zones[coord]
+            if coord in self.giant_stars:
+                event |= _STEP_GIANT_STAR
+                if node.destroyed_black_hole is not None:
+                    destroyed_black_holes[step] = divmod(node.destroyed_black_hole, self.cols)
+
+            add_step(node.cell, node.energy_after_action, cost, event, node.black_holes_mask, node.used_wormholes_mask)
+            energy_before_move = node.energy_after_action
+            previous_node = node
+        return Solution(self.cols, self.initial_ship_energy, cells, energies, costs, events, wormholes_taken,
+                        recharge_multipliers, destroyed_black_holes, states, state_index)
+
+    def _move_name(self, from_cell: int, to_cell: int) -> str:
+        return {1: "Right", -1: "Left", self.cols: "Down", -self.cols: "Up"}[to_cell - from_cell]
+
+
+# --- Parallel search workers (see InterstellarMission._solve_parallel) ---
+# Module-level so ProcessPoolExecutor can pickle them. Each worker process builds the map once, from
+# the parent's current map data rather than the file, which update_map may have left behind.
+_worker_mission: Optional[InterstellarMissionCore] = None
+_worker_incumbent = None
+_worker_cancel = None
+
+def _init_parallel_worker(config_filepath: str, map_data: Dict, black_hole_bits: Dict[Tuple[int, int], int],
+                          incumbent, cancel_event, visited_table_config: Tuple):
+    global _worker_mission, _worker_incumbent, _worker_cancel
+    _worker_mission = InterstellarMissionCore(config_filepath, map_data, black_hole_bits)
+    _worker_mission._ensure_search_tables()
+    # Each worker gets the same cap as the parent's table
+    (_worker_mission.max_visited_states, _worker_mission.visited_eviction,
+     _worker_mission.visited_filter_bits) = visited_table_config
+    _worker_incumbent = incumbent
+    _worker_cancel = cancel_event
+
+def _parallel_search_worker(seeds: List[Tuple], objective: str, k: int, use_poi_graph: bool,
+                            deadline: Optional[float], max_expansions: Optional[int]) -> Tuple[List[Tuple], Dict[str, int], Optional[str]]:
+    """
+    Runs a best-first search from the given seeds (their parent indexes are -2 - seed_index).
+    Returns (results, search_stats, search_stop_reason); each result is (moves, capped_energy,
+    seed_index, chain) where chain holds the node fields from the seed to the destination.
+    """
+    mission = _worker_mission
+    mission._reset_search_tables()
+    mission._start_budget(_worker_cancel, None, max_expansions)
+    mission._deadline = deadline
+    if use_poi_graph and mission._poi_graph is None:
+        mission._poi_graph = mission._build_poi_graph()
+
+    results = []
+    for arena, node_idx, moves, capped_energy in mission._best_first_nodes(
+            objective, k, use_poi_graph, seeds=seeds, incumbent=_worker_incumbent):
+        chain = []
+        while node_idx >= 0:
+            node = arena[node_idx]
+            chain.append((node.cell, node.arrival_move, node.destroyed_black_hole, node.energy_after_action,
+                          node.black_holes_mask, node.used_wormholes_mask))
+            node_idx = node.parent_idx
+        chain.reverse()
+        results.append((moves, capped_energy, -2 - node_idx, chain))
+
+        # Share the new best score with the other workers
+        with _worker_incumbent.get_lock():
+            if objective == "steps":
+                _worker_incumbent.value = min(_worker_incumbent.value, moves)
+            else:
+                _worker_incumbent.value = max(_worker_incumbent.value, capped_energy)
+    return results, mission.search_stats, mission.search_stop_reason
@@ -1,33 +1,36 @@
+import itertools
+import math
+from typing import Dict, FrozenSet, List, Optional, Tuple
 import pygame
-import json
-import random
-import sys
-from typing import List, Tuple, Dict, Optional, Set, FrozenSet
-import collections # For deque
+from interstellar_core import InterstellarMissionCore
 
-# sys.setrecursionlimit(4000) # No longer needed for iterative approach
+try:
+    import numpy # pygame.surfarray needs it for the zoomed-out levels (see _build_lod_image)
+except ImportError:
+    numpy = None
+
+# Cell sizes in pixels the view can zoom to (see InterstellarMission.zoom). Below LOD_CELL_SIZE
+# cells are drawn without borders or icons, from an image with one pixel per cell.
+ZOOM_LEVELS = (0.125, 0.25, 0.5, 1, 2, 3, 4, 6, 8, 12, 16, 20, 28, 40)
+LOD_CELL_SIZE = 4
 
-class InterstellarMission:
-    def __init__(self, config_filepath: str = "map_config.json"):
-        self.config_filepath = config_filepath
-        self.font = None
-        self.cell_size = 20 # Adjust based on map size and screen
-        
-        # Game state variables
-        self.solutions: List[List[Dict]] = [] # Stores paths, each step is a dict with info
-        self.current_solution_idx: int = 0
-        self.show_solution_path: bool = False
-        self.show_step_by_step: bool = False
-        self.current_step: int = 0
-        self.search_in_progress: bool = False
-        self.max_solutions: int = 1 # Find at least one solution as per prompt
 
-        # Memoization: State: (r, c, current_energy, black_holes_state, used_wormholes_state)
-        # Using a tuple as key for memoization.
-        # Maps state_key -> max_energy_achieved_at_this_state
-        self._visited_states: Dict[Tuple, int] = {} 
+def _dimmed(color: Tuple[int, int, int]) -> Tuple[int, int, int]:
+    return (color[0] // 2, color[1] // 2, color[2] // 2)
 
-        self.load_map_from_json() # Load map on initialization
+
+class InterstellarMission(InterstellarMissionCore):
+    """pygame renderer on top of the headless solver core (see interstellar_core.py)."""
+    def __init__(self, config_filepath: str = "map_config.json"):
+        self.font = None
+        self.cell_size = 20 # Pixels per cell: the zoom, one of ZOOM_LEVELS (see zoom and fit_view)
+        self.hud_height = 60 # Space below the map area for the HUD text
+        # Camera: first visible row and column, and the size in pixels of the map area (set by
+        # fit_view and on every draw; None until then, meaning the whole map)
+        self.view_row: int = 0
+        self.view_col: int = 0
+        self.viewport_size: Optional[Tuple[int, int]] = None
+        super().__init__(config_filepath) # Loads the map, which also resets the display state below
 
         # Define colors and icons (basic example)
         self.colors = {
@@ -41,333 +44,304 @@ class InterstellarMission:
         self.icons = {} # Placeholder for actual icon surfaces
 
     def load_map_from_json(self):
-        with open(self.config_filepath, 'r') as f:
-            data = json.load(f)
-
-        self.rows: int = data['matriz']['filas']
-        self.cols: int = data['matriz']['columnas']
-        
-        self.origin: Tuple[int, int] = tuple(data['origen'])
-        self.destination: Tuple[int, int] = tuple(data['destino'])
-        self.initial_ship_energy: int = data['cargaInicial']
-        
-        self.base_black_holes: FrozenSet[Tuple[int, int]] = frozenset(map(tuple, data['agujerosNegros']))
-        self.giant_stars: Set[Tuple[int, int]] = set(map(tuple, data['estrellasGigantes']))
-        
-        self.wormholes: Dict[Tuple[int, int], Dict] = {}
-        for i, wh in enumerate(data['agujerosGusano']):
-            entry = tuple(wh['entrada'])
-            wh_id = wh.get("id", f"wh_{i}_{entry[0]}-{entry[1]}") 
-            self.wormholes[entry] = {
-                "id": wh_id, 
-                "salida": tuple(wh['salida']),
-                "entrada": entry
-            }
-
-        self.recharge_zones: Dict[Tuple[int, int], int] = {tuple(rz[:2]): rz[2] for rz in data['zonasRecarga']}
-        self.required_charge_cells: Dict[Tuple[int, int], int] = {tuple(rc['coordenada']): rc['cargaGastada'] for rc in data['celdasCargaRequerida']}
-        
-        self.initial_energy_matrix: List[List[int]] = data['matrizInicial']
-
-        self.solutions = []
-        self.current_solution_idx = 0
-        self.show_solution_path = False
-        self.show_step_by_step = False
-        self.current_step = 0
-        self.search_in_progress = False
-
-
-    def _get_adjacent_cells(self, r: int, c: int) -> List[Tuple[int, int]]:
-        adj = []
-        for dr, dc in [(0,1), (0,-1), (1,0), (-1,0)]:
-            nr, nc = r + dr, c + dc
-            if 0 <= nr < self.rows and 0 <= nc < self.cols:
-                adj.append((nr, nc))
-        return adj
-
-    def solve(self):
-        self.search_in_progress = True
-        self.solutions = []
-        self._visited_states = {} # Clear memoization cache for new search
-        
-        # Initial path for the starting state
-        initial_path_step = {
-            "coords": self.origin,
-            "energy_before_move": self.initial_ship_energy,
-            "action": "Departed from Origin",
-            "black_holes_state": self.base_black_holes, 
-            "used_wormholes_state": frozenset(),
-            "energy_after_action": self.initial_ship_energy # Initial energy at origin before any moves
-        }
-        
-        # Call the iterative solver
-        self._solve_iterative()
+        super().load_map_from_json()
+        self._reset_display_state()
 
-        self.search_in_progress = False
-        if self.solutions:
-            print(f"Found {len(self.solutions)} solution(s). First one shown.")
-        else:
-            print("No solution found.")
+    def update_map(self, data):
+        changed = super().update_map(data)
+        self._reset_display_state()
+        return changed
 
+    def _reset_display_state(self):
+        self.current_solution_idx: int = 0
+        self.show_solution_path: bool = False
+        self.show_step_by_step: bool = False
+        self.current_step: int = 0
+        # Rendering caches (see draw): the visible map prerendered for one camera position, cell
+        # size and font, what was drawn over it on the last frame, the zoomed-out image, rendered
+        # icon texts and the wormhole lookups. Cleared with every map load.
+        self._background: Optional[pygame.Surface] = None
+        self._background_key: Optional[Tuple] = None
+        self._drawn_screen: Optional[pygame.Surface] = None
+        self._drawn_overlays: Dict[Tuple[int, int], Tuple] = {}
+        self._drawn_hud: Optional[Tuple] = None
+        self._lod_image: Optional[pygame.Surface] = None
+        self._icon_surfaces: Dict[Tuple, pygame.Surface] = {}
+        self._wormhole_exit_ids: Optional[Dict[Tuple[int, int], str]] = None
+
+    def draw(self, screen: pygame.Surface) -> List[pygame.Rect]:
+        """
+        Draws the current frame and returns the rectangles that changed, for pygame.display.update.
+        The map area is the screen minus hud_height at the bottom, showing the cells in view (see
+        zoom and pan). The visible cells are prerendered once per camera position (see
+        _build_background); each frame only redraws the cells whose look differs from it or from
+        the previous frame (destroyed black holes, used wormholes, the path overlay) and the HUD
+        when its text changes, so the frame time depends on the screen and the path, not on the
+        map size. A new screen surface, map, camera, cell size or font redraws everything (see
+        invalidate_frame).
+        """
+        self.viewport_size = (screen.get_width(), screen.get_height() - self.hud_height)
+        self._clamp_view()
+        background_key = (self.cell_size, self.font, self.view_row, self.view_col, self.viewport_size)
+        if self._background is None or self._background_key != background_key:
+            self._build_background()
+            self._background_key = background_key
+            self._drawn_screen = None
+
+        full_redraw = screen is not self._drawn_screen
+        if full_redraw:
+            screen.fill((30,30,30)) # Dark background
+            screen.blit(self._background, (0, 0))
+            self._drawn_screen = screen
+            self._drawn_overlays = {}
+            self._drawn_hud = None
+
+        dirty_rects = []
+        overlays = self._frame_overlays()
+        stale_cells = self._drawn_overlays.keys() - overlays.keys()
+        for cell_coord in stale_cells: # Back to the static look
+            rect = self._cell_rect(cell_coord)
+            screen.blit(self._background, rect, rect)
+            dirty_rects.append(rect)
+        # Below one pixel per cell, a restored cell may share its pixel with an overlay still shown
+        redraw_all = bool(stale_cells) and self.cell_size < 1
+        for cell_coord, overlay in overlays.items():
+            if redraw_all or self._drawn_overlays.get(cell_coord) != overlay:
+                dirty_rects.append(self._draw_cell(screen, cell_coord, *overlay))
+        self._drawn_overlays = overlays
 
-    def _solve_iterative(self):
-        # Stack for DFS: (r, c, current_energy_upon_arrival, path_taken, current_black_holes, used_wormholes)
-        # We push states that need to be processed.
-        
-        # The path_taken stores the sequence of steps to reach the current (r,c)
-        # We need to make a copy of path_taken when pushing to the stack to ensure
-        # each path branch has its own history.
-        
-        # Initialize stack with the origin state.
-        # Path for origin: Only the origin step itself.
-        initial_path = [{
-            "coords": self.origin,
-            "energy_before_move": self.initial_ship_energy, 
-            "action": "Departed from Origin",
-            "black_holes_state": self.base_black_holes, 
-            "used_wormholes_state": frozenset()
-            # energy_after_action will be set when processing this 'arrival' state.
-        }]
-
-        # State on stack: (r, c, energy_upon_arrival, path_to_this_cell, black_holes_state, used_wormholes_state)
-        # We process the 'arrival' effects of (r,c) when we *pop* it from the stack.
-        stack = collections.deque() # Using deque as a stack (append and pop from right)
-        
-        # Initial push: The state *before* applying effects at the origin cell itself.
-        # The first step in path_taken represents the origin, and its effects will be applied when processing it.
-        stack.append((self.origin[0], self.origin[1], self.initial_ship_energy,
-                      initial_path, self.base_black_holes, frozenset()))
-
-        while stack and len(self.solutions) < self.max_solutions:
-            # Pop the current state to process
-            r, c, current_energy_upon_arrival, path_taken, current_black_holes, used_wormholes = stack.pop()
-
-            # --- Apply effects of the current cell (r,c) AFTER arriving there ---
-            energy_for_next_moves = current_energy_upon_arrival
-            black_holes_for_this_state = set(current_black_holes) # Mutable copy
-            wormholes_for_this_state = set(used_wormholes) # Mutable copy
-            action_at_current_cell = ""
-
-            # Recharge Zone effect
-            if (r, c) in self.recharge_zones:
-                multiplier = self.recharge_zones[(r,c)]
-                energy_for_next_moves = current_energy_upon_arrival * multiplier
-                action_at_current_cell += f"Recharged at ({r},{c}) by x{multiplier}. New E: {energy_for_next_moves}. "
-            
-            # Giant Star effect
-            if (r, c) in self.giant_stars:
-                destroyed_one = False
-                adj_cells = self._get_adjacent_cells(r, c)
-                random.shuffle(adj_cells) 
-                for adj_r, adj_c in adj_cells:
-                    if (adj_r, adj_c) in black_holes_for_this_state:
-                        black_holes_for_this_state.remove((adj_r, adj_c))
-                        action_at_current_cell += f"Giant Star at ({r},{c}) destroyed BH at ({adj_r},{adj_c}). "
-                        destroyed_one = True
-                        break
-                if not destroyed_one:
-                    action_at_current_cell += f"Giant Star at ({r},{c}), no adjacent BH to destroy. "
-            
-            # Convert back to frozenset for hashing
-            black_holes_for_this_state_frozen = frozenset(black_holes_for_this_state)
-            wormholes_for_this_state_frozen = frozenset(wormholes_for_this_state)
-
-            # Update the last step's info in path_taken with the effects at the current cell.
-            # This is crucial for correctly tracking energy and black holes on each step.
-            if path_taken: # Only if path_taken is not empty (i.e., not the very first push of origin before any path)
-                last_step_info = path_taken[-1]
-                # If it's the very first entry (origin), its action might be empty, so add to it.
-                if (r,c) == self.origin and last_step_info["action"] == "Departed from Origin":
-                     last_step_info["action"] += " " + action_at_current_cell.strip()
-                elif action_at_current_cell: # For subsequent cells, just append
-                    last_step_info["action"] += " " + action_at_current_cell.strip()
-
-                last_step_info["energy_after_action"] = energy_for_next_moves
-                last_step_info["black_holes_state"] = black_holes_for_this_state_frozen
-                last_step_info["used_wormholes_state"] = wormholes_for_this_state_frozen
-
-            # --- Memoization Check AFTER applying effects at current cell ---
-            state_key = (r, c, energy_for_next_moves, black_holes_for_this_state_frozen, wormholes_for_this_state_frozen)
-            if state_key in self._visited_states and self._visited_states[state_key] >= energy_for_next_moves:
-                continue # Already visited this state with equal or more energy, so prune this path.
-            self._visited_states[state_key] = energy_for_next_moves
-
-            # --- Base Case: Destination Reached ---
-            if (r, c) == self.destination:
-                self.solutions.append(list(path_taken)) # Append a copy of the path
-                if len(self.solutions) >= self.max_solutions:
-                    return # Stop searching if enough solutions found
-            
-            # --- Explore Next Moves (Standard moves and Wormholes) ---
-
-            # 3.1 Wormhole Travel
-            if (r, c) in self.wormholes:
-                wh_data = self.wormholes[(r,c)]
-                wh_id = wh_data["id"]
-                if wh_id not in wormholes_for_this_state_frozen: # Only if this wormhole hasn't been used in *this path*
-                    exit_r, exit_c = wh_data["salida"]
-                    new_used_wormholes = wormholes_for_this_state_frozen | {wh_id} 
-                    
-                    # Prepare the next step info for the wormhole jump
-                    next_step_info = {
-                        "coords": (exit_r, exit_c),
-                        "energy_before_move": energy_for_next_moves, # Energy before taking wormhole
-                        "action": f"Took wormhole {wh_id} from ({r},{c}) to ({exit_r},{exit_c}).",
-                        "energy_after_action": -1, # Placeholder, will be updated when this state is popped
-                        "black_holes_state": black_holes_for_this_state_frozen,
-                        "used_wormholes_state": new_used_wormholes
-                    }
-                    new_path = path_taken + [next_step_info]
-                    stack.append((exit_r, exit_c, energy_for_next_moves, new_path,
-                                  black_holes_for_this_state_frozen, new_used_wormholes))
-
-
-            # 3.2 Standard Moves
-            moves = [(0, 1, "Right"), (0, -1, "Left"), (1, 0, "Down"), (-1, 0, "Up")]
-            # No need to randomize for iterative DFS unless you want to find different solutions.
-            # For finding *any* solution, order doesn't strictly matter for correctness, just for which one is found first.
-            # Reversing for DFS-like behavior (exploring deepest first)
-            # stack.extend() would push in reverse order, so we iterate normally.
-            # If using BFS (deque.popleft()), you'd want to extend with moves in preferred order.
-            
-            for dr, dc, move_name in moves:
-                nr, nc = r + dr, c + dc
-
-                if not (0 <= nr < self.rows and 0 <= nc < self.cols):
-                    continue
-                
-                if (nr, nc) in black_holes_for_this_state_frozen:
-                    continue
-
-                if (nr, nc) in self.required_charge_cells:
-                    min_required = self.required_charge_cells[(nr, nc)]
-                    if energy_for_next_moves < min_required:
-                        continue
-
-                cost_from_matrix = self.initial_energy_matrix[nr][nc]
-                if (nr, nc) in self.recharge_zones:
-                    cost_from_matrix = 0 
-                
-                energy_after_moving_to_nr_nc = energy_for_next_moves - cost_from_matrix
-
-                if energy_after_moving_to_nr_nc < 0:
-                    continue
-
-                # Prepare the next step info for standard move
-                next_step_info = {
-                    "coords": (nr, nc),
-                    "energy_before_move": energy_for_next_moves, # Energy before consuming cost
-                    "action": f"Moved {move_name} to ({nr},{nc}). Cost: {cost_from_matrix}.",
-                    "energy_after_action": -1, # Placeholder, will be updated when this state is popped
-                    "black_holes_state": black_holes_for_this_state_frozen, 
-                    "used_wormholes_state": wormholes_for_this_state_frozen 
-                }
-                new_path = path_taken + [next_step_info]
-                
-                stack.append((nr, nc, energy_after_moving_to_nr_nc, new_path,
-                              black_holes_for_this_state_frozen, wormholes_for_this_state_frozen))
-
-    def draw(self, screen: pygame.Surface):
-        screen.fill((30,30,30)) # Dark background
-        
-        current_black_holes_for_display = self.base_black_holes # Default to original black holes
-        current_used_wormholes_for_display = frozenset() # Default to no wormholes used
-
+        if self.font:
+            hud_lines = self._hud_lines()
+            if hud_lines != self._drawn_hud:
+                hud_top = self.viewport_size[1]
+                hud_rect = pygame.Rect(0, hud_top, screen.get_width(), screen.get_height() - hud_top)
+                screen.fill((30,30,30), hud_rect)
+                for (text, color), y in zip(hud_lines, (hud_top + 10, hud_top + 30)):
+                    screen.blit(self.font.render(text, True, color), (10, y))
+                self._drawn_hud = hud_lines
+                dirty_rects.append(hud_rect)
+
+        return [screen.get_rect()] if full_redraw else dirty_rects
+
+    def invalidate_frame(self):
+        """Makes the next draw repaint the whole screen (e.g. after the window was exposed)."""
+        self._drawn_screen = None
+
+    def zoom(self, steps: int, anchor: Optional[Tuple[int, int]] = None):
+        """
+        Moves steps levels along ZOOM_LEVELS (positive zooms in), keeping the cell under anchor
+        (a pixel of the map area, by default its centre) in place. Without NumPy the levels
+        below LOD_CELL_SIZE are not available (see _build_lod_image).
+        """
+        levels = ZOOM_LEVELS if numpy is not None else tuple(level for level in ZOOM_LEVELS if level >= LOD_CELL_SIZE)
+        current = min(range(len(levels)), key=lambda i: abs(levels[i] - self.cell_size))
+        new_size = levels[max(0, min(len(levels) - 1, current + steps))]
+        width, height = self._viewport()
+        anchor_x, anchor_y = anchor if anchor is not None else (width // 2, height // 2)
+        anchor_row = self.view_row + anchor_y / self.cell_size
+        anchor_col = self.view_col + anchor_x / self.cell_size
+        self.cell_size = new_size
+        self.view_row = round(anchor_row - anchor_y / new_size)
+        self.view_col = round(anchor_col - anchor_x / new_size)
+        self._clamp_view()
+
+    def pan(self, dx: int, dy: int):
+        """Moves the camera by dx, dy pixels of the map area, rounded to whole cells (at least one)."""
+        def to_cells(pixels: int) -> int:
+            return 0 if pixels == 0 else int(math.copysign(max(1, round(abs(pixels) / self.cell_size)), pixels))
+        self.view_col += to_cells(dx)
+        self.view_row += to_cells(dy)
+        self._clamp_view()
+
+    def fit_view(self, width: int, height: int):
+        """
+        Sets the map area to width x height pixels and zooms out, from the current cell size, to
+        the largest level that shows the whole map (or the smallest level if none does).
+        """
+        self.viewport_size = (width, height)
+        levels = [level for level in ZOOM_LEVELS if level <= self.cell_size and (numpy is not None or level >= LOD_CELL_SIZE)]
+        fitting = [level for level in levels if self.cols * level <= width and self.rows * level <= height]
+        self.cell_size = fitting[-1] if fitting else levels[0]
+        self.view_row = self.view_col = 0
+
+    def _viewport(self) -> Tuple[int, int]:
+        if self.viewport_size is None: # Not drawn yet: the whole map at the current cell size
+            return math.ceil(self.cols * self.cell_size), math.ceil(self.rows * self.cell_size)
+        return self.viewport_size
+
+    def _clamp_view(self):
+        width, height = self._viewport()
+        self.view_row = max(0, min(self.view_row, self.rows - int(height / self.cell_size)))
+        self.view_col = max(0, min(self.view_col, self.cols - int(width / self.cell_size)))
+
+    def _visible_cells(self) -> Tuple[int, int, int, int]:
+        """(first_row, end_row, first_col, end_col) of the cells in view, end excluded."""
+        width, height = self._viewport()
+        end_row = min(self.rows, self.view_row + math.ceil(height / self.cell_size))
+        end_col = min(self.cols, self.view_col + math.ceil(width / self.cell_size))
+        return self.view_row, end_row, self.view_col, end_col
+
+    def _build_map_lookups(self):
+        # Wormhole exit -> id (the first wormhole ending there), and id -> its entry and exit cells
+        self._wormhole_exit_ids = {}
+        self._wormhole_cells_by_id: Dict[str, List[Tuple[int, int]]] = {}
+        for entry, wh_data in self.wormholes.items():
+            self._wormhole_exit_ids.setdefault(wh_data["salida"], wh_data["id"])
+            self._wormhole_cells_by_id.setdefault(wh_data["id"], []).extend((entry, wh_data["salida"]))
+
+    def _build_background(self):
+        """
+        Prerenders the cells in view as they look before any move (original black holes, no
+        wormhole used) into a surface the size of the map area: cell by cell, or below
+        LOD_CELL_SIZE by scaling the visible part of the one-pixel-per-cell image.
+        """
+        if self._wormhole_exit_ids is None:
+            self._build_map_lookups()
+        self._background = pygame.Surface(self._viewport())
+        self._background.fill((30,30,30))
+        first_row, end_row, first_col, end_col = self._visible_cells()
+        if self.cell_size < LOD_CELL_SIZE:
+            if self._lod_image is None:
+                self._lod_image = self._build_lod_image()
+            visible = self._lod_image.subsurface(pygame.Rect(first_col, first_row, end_col - first_col, end_row - first_row))
+            size = (math.ceil((end_col - first_col) * self.cell_size), math.ceil((end_row - first_row) * self.cell_size))
+            self._background.blit(pygame.transform.scale(visible, size), (0, 0))
+            return
+        for r_idx in range(first_row, end_row):
+            for c_idx in range(first_col, end_col):
+                look = self._cell_look((r_idx, c_idx), self.base_black_holes, frozenset())
+                self._draw_cell(self._background, (r_idx, c_idx), look, None)
+
+    def _build_lod_image(self) -> pygame.Surface:
+        """
+        One pixel per cell, for the zoomed-out levels: a grey level from the cell's cost, or the
+        colour of its feature (see _cell_look). Built once per map with NumPy and pygame.surfarray,
+        so its cost is a few array operations over the grid plus one Python step per feature cell.
+        """
+        costs = numpy.asarray(self.initial_energy_matrix, dtype=numpy.int64).clip(0, None)
+        shade = (40 + costs * 120 // max(1, int(costs.max(initial=0)))).astype(numpy.uint8)
+        rgb = numpy.repeat(shade[:, :, numpy.newaxis], 3, axis=2)
+        feature_cells = itertools.chain((self.origin, self.destination), self.base_black_holes, self.giant_stars,
+                                        self.wormholes, self._wormhole_exit_ids, self.recharge_zones,
+                                        self.required_charge_cells)
+        for r, c in feature_cells:
+            rgb[r, c] = self._cell_look((r, c), self.base_black_holes, frozenset())[0]
+        return pygame.surfarray.make_surface(rgb.swapaxes(0, 1)) # surfarray arrays are indexed [x, y]
+
+    def _frame_overlays(self) -> Dict[Tuple[int, int], Tuple]:
+        """Cells in view that differ from the background in this frame: cell -> (look, path marker)."""
+        black_holes = self.base_black_holes # Default to original black holes
+        used_wormholes = frozenset() # Default to no wormholes used
+        steps_drawn = 0 # The first steps_drawn steps of the solution are on screen
         if self.show_solution_path and self.solutions:
-            current_path_steps = self.solutions[self.current_solution_idx]
+            solution = self.solutions[self.current_solution_idx]
+            steps_drawn = len(solution)
             if self.show_step_by_step:
-                step_idx = min(self.current_step, len(current_path_steps) - 1)
-                if step_idx >= 0:
-                    current_step_data = current_path_steps[step_idx]
-                    current_black_holes_for_display = current_step_data.get("black_holes_state", self.base_black_holes)
-                    current_used_wormholes_for_display = current_step_data.get("used_wormholes_state", frozenset())
+                steps_drawn = min(self.current_step + 1, len(solution))
+            if steps_drawn:
+                black_holes, used_wormholes = solution.state(steps_drawn - 1) # O(1), see Solution
+
+        first_row, end_row, first_col, end_col = self._visible_cells()
+        overlays = {}
+        # Only destroyed black holes and used wormholes look different from the background
+        changed_cells = itertools.chain(self.base_black_holes - black_holes,
+                                        *(self._wormhole_cells_by_id.get(wh_id, ()) for wh_id in used_wormholes))
+        for cell_coord in changed_cells:
+            if first_row <= cell_coord[0] < end_row and first_col <= cell_coord[1] < end_col:
+                overlays[cell_coord] = (self._cell_look(cell_coord, black_holes, used_wormholes), None)
+        for i in range(steps_drawn):
+            cell_coord = solution.coords(i)
+            if not (first_row <= cell_coord[0] < end_row and first_col <= cell_coord[1] < end_col):
+                continue
+            if i == steps_drawn - 1 and self.show_step_by_step:
+                marker = "player"
+            elif cell_coord != self.origin:
+                marker = "path"
             else:
-                if current_path_steps:
-                    final_step_data = current_path_steps[-1]
-                    current_black_holes_for_display = final_step_data.get("black_holes_state", self.base_black_holes)
-                    current_used_wormholes_for_display = final_step_data.get("used_wormholes_state", frozenset())
-
-
-        # Draw grid and cells
-        for r_idx in range(self.rows):
-            for c_idx in range(self.cols):
-                rect = pygame.Rect(c_idx * self.cell_size, r_idx * self.cell_size, self.cell_size, self.cell_size)
-                cell_coord = (r_idx, c_idx)
-                color = self.colors['empty']
-                icon_text = None 
-
-                if cell_coord == self.origin: color = self.colors['origin']; icon_text = "O"
-                elif cell_coord == self.destination: color = self.colors['destination']; icon_text = "D"
-                elif cell_coord in current_black_holes_for_display:
-                    color = self.colors['black_hole']; icon_text = "BH"
-                elif cell_coord in self.giant_stars: color = self.colors['giant_star']; icon_text = "GS"
-                elif cell_coord in self.wormholes:
-                    wh_id = self.wormholes[cell_coord]["id"]
-                    if wh_id in current_used_wormholes_for_display:
-                        color = (self.colors['wormhole_entry'][0] // 2, self.colors['wormhole_entry'][1] // 2, self.colors['wormhole_entry'][2] // 2)
-                        icon_text = "WE(U)" 
-                    else:
-                        color = self.colors['wormhole_entry']; icon_text = "WE"
-                elif any(wh['salida'] == cell_coord for wh in self.wormholes.values()):
-                    wh_entry_for_exit = next(iter([entry for entry, wh_data in self.wormholes.items() if wh_data['salida'] == cell_coord]), None)
-                    if wh_entry_for_exit:
-                        wh_id_for_exit = self.wormholes[wh_entry_for_exit]["id"]
-                        if wh_id_for_exit in current_used_wormholes_for_display:
-                            color = (self.colors['wormhole_exit'][0] // 2, self.colors['wormhole_exit'][1] // 2, self.colors['wormhole_exit'][2] // 2)
-                            icon_text = "WX(U)" 
-                        else:
-                            color = self.colors['wormhole_exit']; icon_text = "WX"
-                elif cell_coord in self.recharge_zones: color = self.colors['recharge_zone']; icon_text = "RZ"
-                elif cell_coord in self.required_charge_cells: color = self.colors['required_charge_cell']; icon_text = "RC"
-                
-                pygame.draw.rect(screen, color, rect)
-                pygame.draw.rect(screen, self.colors['grid'], rect, 1) 
-
-                if icon_text and self.font and self.cell_size > 15:
-                    text_surf = self.font.render(icon_text, True, (200,200,200) if icon_text not in ["O", "D"] else (0,0,0))
-                    text_rect = text_surf.get_rect(center=rect.center)
-                    screen.blit(text_surf, text_rect)
-        
-        if self.show_solution_path and self.solutions:
-            current_path_steps = self.solutions[self.current_solution_idx]
-            
-            path_to_draw = current_path_steps
-            if self.show_step_by_step:
-                path_to_draw = current_path_steps[:min(self.current_step + 1, len(current_path_steps))]
-
-            for i, step_data in enumerate(path_to_draw):
-                r, c = step_data["coords"]
-                rect = pygame.Rect(c * self.cell_size, r * self.cell_size, self.cell_size, self.cell_size)
-                
-                if i == len(path_to_draw) - 1 and self.show_step_by_step:
-                    pygame.draw.rect(screen, self.colors['player'], rect, 0) 
-                    pygame.draw.rect(screen, (255,255,255), rect, 2)
-                elif (r,c) != self.origin:
-                    path_color = pygame.Color(self.colors['path'])
-                    pygame.draw.rect(screen, path_color, rect.inflate(-self.cell_size//3, -self.cell_size//3)) 
-
-        if self.font:
-            info_text = self.get_hud_info()
-            info_surf = self.font.render(info_text, True, (255, 255, 255))
-            screen.blit(info_surf, (10, self.rows * self.cell_size + 10))
-
-            if self.show_step_by_step and self.solutions and 0 <= self.current_solution_idx < len(self.solutions):
-                if 0 <= self.current_step < len(self.solutions[self.current_solution_idx]):
-                    step_detail = self.solutions[self.current_solution_idx][self.current_step]
-                    action = step_detail["action"]
-                    energy = step_detail.get("energy_after_action", step_detail.get("energy_before_move"))
-                    detail_text = f"Step Action: {action} | Energy: {energy:.0f}"
-                    detail_surf = self.font.render(detail_text, True, (220, 220, 100))
-                    screen.blit(detail_surf, (10, self.rows * self.cell_size + 30))
-
+                continue
+            overlays[cell_coord] = (self._cell_look(cell_coord, black_holes, used_wormholes), marker)
+        return overlays
+
+    def _cell_look(self, cell_coord: Tuple[int, int], black_holes: FrozenSet[Tuple[int, int]],
+                   used_wormholes: FrozenSet[str]) -> Tuple[Tuple[int, int, int], Optional[str]]:
+        """(color, icon text) of a cell given the black holes still alive and the wormholes already used."""
+        if cell_coord == self.origin: return self.colors['origin'], "O"
+        if cell_coord == self.destination: return self.colors['destination'], "D"
+        if cell_coord in black_holes: return self.colors['black_hole'], "BH"
+        if cell_coord in self.giant_stars: return self.colors['giant_star'], "GS"
+        if cell_coord in self.wormholes:
+            if self.wormholes[cell_coord]["id"] in used_wormholes:
+                return _dimmed(self.colors['wormhole_entry']), "WE(U)"
+            return self.colors['wormhole_entry'], "WE"
+        if cell_coord in self._wormhole_exit_ids:
+            if self._wormhole_exit_ids[cell_coord] in used_wormholes:
+                return _dimmed(self.colors['wormhole_exit']), "WX(U)"
+            return self.colors['wormhole_exit'], "WX"
+        if cell_coord in self.recharge_zones: return self.colors['recharge_zone'], "RZ"
+        if cell_coord in self.required_charge_cells: return self.colors['required_charge_cell'], "RC"
+        return self.colors['empty'], None
+
+    def _cell_rect(self, cell_coord: Tuple[int, int]) -> pygame.Rect:
+        """Rectangle of a cell in the map area (at least one pixel when zoomed out below that)."""
+        r, c = cell_coord
+        size = self.cell_size
+        side = max(1, int(size))
+        return pygame.Rect(int((c - self.view_col) * size), int((r - self.view_row) * size), side, side)
+
+    def _draw_cell(self, surface: pygame.Surface, cell_coord: Tuple[int, int], look: Tuple,
+                   marker: Optional[str]) -> pygame.Rect:
+        """Draws one cell (and its path marker) on surface and returns its rectangle."""
+        rect = self._cell_rect(cell_coord)
+        color, icon_text = look
+        if self.cell_size < LOD_CELL_SIZE: # Too small for borders, icons and inset markers
+            surface.fill(self.colors[marker] if marker else color, rect)
+            return rect
+        pygame.draw.rect(surface, color, rect)
+        pygame.draw.rect(surface, self.colors['grid'], rect, 1)
+
+        if icon_text and self.font and self.cell_size > 15:
+            text_surf = self._icon_surfaces.get((self.font, icon_text))
+            if text_surf is None:
+                text_surf = self._icon_surfaces[(self.font, icon_text)] = self.font.render(
+                    icon_text, True, (200,200,200) if icon_text not in ["O", "D"] else (0,0,0))
+            # Clipped to the cell: labels like "WE(U)" are wider than a cell, and text spilling into
+            # the neighbours would outlive the cell's dirty rect when it is restored (see draw)
+            previous_clip = surface.get_clip()
+            surface.set_clip(rect.clip(previous_clip))
+            surface.blit(text_surf, text_surf.get_rect(center=rect.center))
+            surface.set_clip(previous_clip)
+
+        if marker == "player":
+            pygame.draw.rect(surface, self.colors['player'], rect, 0)
+            pygame.draw.rect(surface, (255,255,255), rect, 2)
+        elif marker == "path":
+            pygame.draw.rect(surface, self.colors['path'], rect.inflate(-self.cell_size//3, -self.cell_size//3))
+        return rect
+
+    def _hud_lines(self) -> Tuple[Tuple[str, Tuple[int, int, int]], ...]:
+        """(text, color) of the HUD lines below the map."""
+        lines = [(self.get_hud_info(), (255, 255, 255))]
+        if self.show_step_by_step and self.solutions and 0 <= self.current_solution_idx < len(self.solutions):
+            if 0 <= self.current_step < len(self.solutions[self.current_solution_idx]):
+                solution = self.solutions[self.current_solution_idx]
+                action = solution.action(self.current_step) # Formatted only for the step on screen
+                energy = solution.energy_after(self.current_step)
+                lines.append((f"Step Action: {action} | Energy: {energy:.0f}", (220, 220, 100)))
+        return tuple(lines)
 
     def get_hud_info(self) -> str:
-        if self.search_in_progress:
-            return "Searching for solutions..."
+        if self.search_in_progress and not self.solutions:
+            return "Searching... " + self._search_progress_text()
         if not self.solutions:
+            if self.search_stop_reason:
+                return f"No solutions found ({self.search_stop_reason})!"
             return "No solutions found!"
         
         text = f"Solutions: {len(self.solutions)}"
+        if self.search_in_progress:
+            text += f" (searching: {self._search_progress_text()})"
+        elif self.search_stop_reason:
+            text += f" ({self.search_stop_reason}, best so far)"
         if self.show_solution_path:
             text += f" | Showing: {self.current_solution_idx + 1}/{len(self.solutions)}"
             path_len = len(self.solutions[self.current_solution_idx])
@@ -375,4 +349,11 @@ class InterstellarMission:
             if self.show_step_by_step:
                 current_display_step = min(self.current_step + 1, path_len)
                 text += f" | Animating Step: {current_display_step}/{path_len}"
-        return text
\ No newline at end of file
+        return text
+
+    def _search_progress_text(self) -> str:
+        progress = self.search_progress
+        text = f"expanded {progress['expanded']} | frontier {progress['frontier']}"
+        if progress["best_energy"] is not None:
+            text += f" | best energy {progress['best_energy']:.0f}"
+        return text
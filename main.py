@@ -1,12 +1,19 @@
 import pygame
 import sys
 import threading
+from interstellar_core import SearchStatsCollector
 from interstellar_mission import InterstellarMission
 
 # --- Pygame Configuration ---
 UI_INFO_AREA_HEIGHT = 60 # Extra space at the bottom for text
-DEFAULT_CELL_SIZE = 20 # Adjust as needed, or make dynamic
+DEFAULT_CELL_SIZE = 20 # Pixels per cell when the map fits the window; larger maps start zoomed out
+MAX_WINDOW_FRACTION = 0.9 # Largest window, as a fraction of the desktop size
+PAN_FRACTION = 0.25 # Arrow keys move the view by this fraction of the window
 ANIMATION_DELAY_MS = 200 # Milliseconds between animation steps
+K_BEST_SOLUTIONS = 5 # Number of alternative paths the N key can cycle through
+SEARCH_WORKERS = 1 # Processes used by the search; above 1 the solutions arrive all at once at the end
+SEARCH_TIME_BUDGET_S = 60 # Seconds before a search gives up and keeps the best solutions found so far
+SEARCH_STATS_PATH = None # JSON file for the phase counters and timings of each search (e.g. "search_stats.json"), None = off
 
 def run_game():
     pygame.init()
@@ -15,11 +22,18 @@ def run_game():
     # Create mission object - it will load JSON and determine map size
     # IMPORTANT CHANGE: Updated config_filepath to "matriz_universo.json"
     mission = InterstellarMission(config_filepath="matriz_universo.json")
+    if SEARCH_STATS_PATH:
+        mission.set_search_hooks(SearchStatsCollector(SEARCH_STATS_PATH))
     
-    # Dynamically set screen size based on map and cell size
-    screen_width = mission.cols * mission.cell_size
-    screen_height = mission.rows * mission.cell_size + UI_INFO_AREA_HEIGHT
-    screen = pygame.display.set_mode((screen_width, screen_height))
+    # Size the window after the map, up to a fraction of the desktop; maps that do not fit are
+    # shown zoomed out (mouse wheel or +/- to zoom, arrow keys to pan)
+    desktop = pygame.display.Info()
+    screen_width = min(mission.cols * DEFAULT_CELL_SIZE, int(desktop.current_w * MAX_WINDOW_FRACTION))
+    map_area_height = min(mission.rows * DEFAULT_CELL_SIZE, int(desktop.current_h * MAX_WINDOW_FRACTION) - UI_INFO_AREA_HEIGHT)
+    mission.cell_size = DEFAULT_CELL_SIZE
+    mission.hud_height = UI_INFO_AREA_HEIGHT
+    mission.fit_view(screen_width, map_area_height)
+    screen = pygame.display.set_mode((screen_width, map_area_height + UI_INFO_AREA_HEIGHT))
     pygame.display.set_caption("Interstellar Mission")
     
     clock = pygame.time.Clock()
@@ -27,17 +41,34 @@ def run_game():
     mission.font = font # Pass font to mission for its drawing methods
 
     search_finished_event = threading.Event()
+    search_cancel_event = threading.Event() # Set to stop the running search (R key)
     search_thread = None # Initialize thread variable
 
-    def search_task_wrapper():
-        mission.solve() # Call the main solve method
+    def search_task_wrapper(cancel_event: threading.Event):
+        # Shortest paths (fewest moves) to the destination, streamed best first: the first one is
+        # shown as soon as it is found while the next ones keep arriving for the N key.
+        if SEARCH_WORKERS > 1:
+            mission.max_solutions = K_BEST_SOLUTIONS
+            mission.solve(mode="astar", workers=SEARCH_WORKERS, cancel_event=cancel_event,
+                          time_budget=SEARCH_TIME_BUDGET_S)
+            mission.show_solution_path = bool(mission.solutions)
+        else:
+            for path in mission.iter_solutions(k=K_BEST_SOLUTIONS, mode="astar", cancel_event=cancel_event,
+                                               time_budget=SEARCH_TIME_BUDGET_S):
+                if len(mission.solutions) == 1:
+                    mission.show_solution_path = True
+                print(f"Solution {len(mission.solutions)}: {len(path)} steps.")
+            if mission.search_stop_reason:
+                print(f"Search stopped early ({mission.search_stop_reason}).")
+            if not mission.solutions:
+                print("No solution found.")
         search_finished_event.set()
 
     # Initial search
     print("Starting initial search...")
     mission.search_in_progress = True
     search_finished_event.clear()
-    search_thread = threading.Thread(target=search_task_wrapper, daemon=True)
+    search_thread = threading.Thread(target=search_task_wrapper, args=(search_cancel_event,), daemon=True)
     search_thread.start()
 
     last_animation_update_time = pygame.time.get_ticks()
@@ -48,6 +79,10 @@ def run_game():
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
+            if event.type == pygame.VIDEOEXPOSE: # The window was uncovered, repaint all of it
+                mission.invalidate_frame()
+            if event.type == pygame.MOUSEWHEEL: # Zoom around the mouse pointer
+                mission.zoom(event.y, pygame.mouse.get_pos())
             if event.type == pygame.K_ESCAPE:
                 running = False
             elif event.type == pygame.KEYDOWN: # Moved all keydown handling into this block
@@ -57,7 +92,8 @@ def run_game():
                         print("No solution to show. Starting search...")
                         mission.search_in_progress = True
                         search_finished_event.clear()
-                        search_thread = threading.Thread(target=search_task_wrapper, daemon=True)
+                        search_cancel_event = threading.Event()
+                        search_thread = threading.Thread(target=search_task_wrapper, args=(search_cancel_event,), daemon=True)
                         search_thread.start()
                 elif event.key == pygame.K_s: # Toggle step-by-step animation
                     mission.show_step_by_step = not mission.show_step_by_step
@@ -68,15 +104,29 @@ def run_game():
                         mission.current_solution_idx = (mission.current_solution_idx + 1) % len(mission.solutions)
                         mission.current_step = 0
                         last_animation_update_time = pygame.time.get_ticks() # Reset timer for new path
+                elif event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS): # Zoom in
+                    mission.zoom(1)
+                elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS): # Zoom out
+                    mission.zoom(-1)
+                elif event.key in (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN): # Pan
+                    step_x, step_y = int(screen_width * PAN_FRACTION), int(map_area_height * PAN_FRACTION)
+                    mission.pan({pygame.K_LEFT: -step_x, pygame.K_RIGHT: step_x}.get(event.key, 0),
+                               {pygame.K_UP: -step_y, pygame.K_DOWN: step_y}.get(event.key, 0))
                 elif event.key == pygame.K_r: # Reset and restart search
                     print("Resetting and starting new search...")
                     if search_thread and search_thread.is_alive():
-                        print("Warning: Previous search thread is still running. This might cause issues if map data is mutable.")
+                        # Stop the previous search before the map it reads is reloaded
+                        search_cancel_event.set()
+                        search_thread.join()
                     
-                    mission.load_map_from_json() # Reload map from JSON (clears solutions, resets state)
+                    # Reload map from JSON (clears solutions, resets state). Only the cells that
+                    # changed are repaired, unless the map size, endpoints or wormholes changed.
+                    changed_cells = mission.reload_map()
+                    print("Map reloaded." if changed_cells is None else f"Map updated: {len(changed_cells)} cell(s) changed.")
                     mission.search_in_progress = True
                     search_finished_event.clear()
-                    search_thread = threading.Thread(target=search_task_wrapper, daemon=True)
+                    search_cancel_event = threading.Event()
+                    search_thread = threading.Thread(target=search_task_wrapper, args=(search_cancel_event,), daemon=True)
                     search_thread.start()
 
         # Animation update logic
@@ -90,9 +140,8 @@ def run_game():
                     pass 
                 last_animation_update_time = current_time
 
-        # Drawing
-        mission.draw(screen)
-        pygame.display.flip()
+        # Drawing: only the parts of the screen that changed are sent to the display
+        pygame.display.update(mission.draw(screen))
         
         clock.tick(60) # Cap frame rate
 
@@ -1,10 +1,21 @@
 # main.py
 # Este archivo es el punto de entrada para ejecutar las pruebas en consola
 # de los validadores AFD definidos en dfa_validators.py.
+#
+# Uso: python main_dfa.py
+#      python main_dfa.py archivo.txt {credit_card,curp} salida.jsonl|salida.csv [--solo-invalidas] [--procesos N]
+#                         [--digito-verificador]
+# Sin argumentos se ejecutan las pruebas en consola. Con ellos, se valida un archivo (de cualquier tamaño)
+# con validate_file y los resultados se escriben en el archivo de salida, en lugar de imprimirse.
 
-# Importa las clases de los autómatas y la función process_file
+import argparse # Para leer los argumentos de la validación de archivos desde la línea de comandos.
+import sys
+# Importa las clases de los autómatas y las funciones process_file y validate_file
 # desde el módulo dfa_validators.
-from dfa_validators import CreditCardDFA, CURPDFA, process_file
+from dfa_validators import CreditCardDFA, CURPDFA, process_file, validate_file
+
+# Validadores por nombre, para la línea de comandos (los mismos nombres que las rutas de la API).
+VALIDATORS = {'credit_card': CreditCardDFA, 'curp': CURPDFA}
 
 def run_tests_in_console():
     """
@@ -34,11 +45,11 @@ def run_tests_in_console():
 
     # Conjunto de cadenas de ejemplo que deberían ser inválidas.
     invalid_cc_tests = [
-        "1234 5678 9012 3456 13/2029 336",   # Mes inválido (validación semántica de la fecha).
-        "1234 5678 9012 3456 03/2024 336",   # Año inválido (< 2025) (validación semántica de la fecha).
-        "123 4567 8901 2345 01/2025 123",    # Formato con menos dígitos (capturado por la regex preliminar).
-        "1234 5678 9012 3456 01/2025 12",    # CVV corto (capturado por la regex preliminar).
-        "ABCD 1234 5678 9012 01/2025 123",   # Carácter inválido 'A' al inicio (capturado por la regex, o por el DFA si la regex no lo atrajara).
+        "1234 5678 9012 3456 13/2029 336",   # Mes inválido (el AFD rechaza el '3' del mes, posición 21).
+        "1234 5678 9012 3456 03/2024 336",   # Año inválido (< 2025) (el AFD rechaza el '4' del año, posición 26).
+        "123 4567 8901 2345 01/2025 123",    # Formato con menos dígitos (espacio inesperado en la posición 3).
+        "1234 5678 9012 3456 01/2025 12",    # CVV corto (la cadena termina antes del estado de aceptación).
+        "ABCD 1234 5678 9012 01/2025 123",   # Carácter inválido 'A' al inicio (fuera del alfabeto del AFD).
     ]
     # Itera sobre las cadenas inválidas y muestra su resultado de validación.
     for test_cc in invalid_cc_tests:
@@ -75,7 +86,31 @@ def run_tests_in_console():
     process_file('credit_cards.txt', cc_validator, "Credit Card")
     process_file('curps.txt', curp_validator, "CURP")
 
+def validate_file_from_command_line():
+    """
+    Valida un archivo con validate_file según los argumentos de la línea de comandos
+    e imprime los totales de líneas válidas e inválidas.
+    """
+    parser = argparse.ArgumentParser(description="Valida cada línea de un archivo con un AFD y escribe los resultados.")
+    parser.add_argument("archivo", help="archivo de texto con una cadena por línea")
+    parser.add_argument("validador", choices=sorted(VALIDATORS))
+    parser.add_argument("salida", help="archivo de resultados: .csv, o JSON Lines para cualquier otra extensión")
+    parser.add_argument("--solo-invalidas", action="store_true", help="escribir solo las líneas inválidas")
+    parser.add_argument("--procesos", type=int, default=None, help="cantidad de procesos (por omisión, uno por CPU)")
+    parser.add_argument("--digito-verificador", action="store_true",
+                        help="verificar también el dígito verificador (Luhn en tarjetas, RENAPO en CURP)")
+    args = parser.parse_args()
+
+    validator = VALIDATORS[args.validador](check_digit=args.digito_verificador)
+    summary = validate_file(args.archivo, validator, args.salida,
+                            only_invalid=args.solo_invalidas, workers=args.procesos)
+    print(f"{summary['lines']} líneas validadas: {summary['valid']} válidas, {summary['invalid']} inválidas. "
+          f"Resultados en '{args.salida}'")
+
 # Este bloque asegura que la función `run_tests_in_console()` se ejecute solo cuando el script es ejecutado directamente,
-# no cuando es importado como un módulo en otro script.
+# no cuando es importado como un módulo en otro script. Con argumentos, se valida el archivo indicado.
 if __name__ == "__main__":
-    run_tests_in_console()
\ No newline at end of file
+    if len(sys.argv) > 1:
+        validate_file_from_command_line()
+    else:
+        run_tests_in_console()
\ No newline at end of file
@@ -0,0 +1,87 @@
+import copy
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from interstellar_core import InterstellarMissionCore, SearchStatsCollector
+
+
+def corridor_map() -> dict:
+    """6x8 map of cost 1 cells with the destination straight to the right of the origin."""
+    rows, cols = 6, 8
+    return {
+        "matriz": {"filas": rows, "columnas": cols},
+        "origen": [0, 0],
+        "destino": [0, 7],
+        "cargaInicial": 100,
+        "agujerosNegros": [[3, 1]],
+        "estrellasGigantes": [],
+        "agujerosGusano": [],
+        "zonasRecarga": [],
+        "celdasCargaRequerida": [],
+        "matrizInicial": [[1] * cols for _ in range(rows)],
+    }
+
+
+class ParallelSolveAfterUpdateMapTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.map_path = os.path.join(directory.name, "map.json")
+        with open(self.map_path, "w") as f:
+            json.dump(corridor_map(), f)
+
+    def test_workers_search_the_updated_map(self):
+        mission = InterstellarMissionCore(self.map_path)
+        mission.solve(mode="astar")
+        self.assertEqual(len(mission.solutions[0]) - 1, 7)
+
+        # A wall of black holes on column 4 with a single gap on the last row. The file on disk
+        # still has the straight 7-move path.
+        data = copy.deepcopy(mission._map_data)
+        wall = [[r, 4] for r in range(5)]
+        data["agujerosNegros"] += wall
+        self.assertIsNotNone(mission.update_map(data))
+
+        mission.solve(mode="astar")
+        serial = mission.solutions[0]
+        mission.solve(mode="astar", workers=2)
+        parallel = mission.solutions[0]
+
+        self.assertEqual(len(serial) - 1, 17)
+        self.assertEqual(len(parallel), len(serial))
+        cells = {parallel.coords(i) for i in range(len(parallel))}
+        self.assertFalse(cells & set(map(tuple, wall)))
+
+
+    def test_failed_parallel_solve_clears_search_in_progress(self):
+        mission = InterstellarMissionCore(self.map_path)
+
+        def fail(*args, **kwargs):
+            raise RuntimeError("worker pool failed")
+        mission._expand_prefix = fail
+        with self.assertRaises(RuntimeError):
+            mission.solve(mode="astar", workers=2)
+        self.assertFalse(mission.search_in_progress)
+
+
+    def test_parallel_solve_reports_to_search_hooks(self):
+        mission = InterstellarMissionCore(self.map_path)
+        collector = SearchStatsCollector()
+        mission.set_search_hooks(collector)
+        reports = []
+        for _ in range(2):
+            mission.solve(mode="astar", workers=2)
+            reports.append(collector.last_report)
+
+        self.assertEqual((reports[0]["mode"], reports[0]["solutions"]), ("astar", 1))
+        self.assertGreater(reports[0]["pushes"], 0)
+        # One report per solve: the prefix counts of the first solve do not carry over
+        self.assertEqual(reports[1]["pushes"], reports[0]["pushes"])
+
+
+if __name__ == "__main__":
+    unittest.main()
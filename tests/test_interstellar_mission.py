@@ -0,0 +1,91 @@
+import os
+import sys
+import unittest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+try:
+    import pygame
+    import interstellar_mission
+    from interstellar_mission import InterstellarMission
+except ImportError:
+    pygame = None
+
+MAP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "matriz_universo.json")
+
+
+@unittest.skipIf(pygame is None, "pygame is not installed")
+class DirtyRectRenderingTest(unittest.TestCase):
+    """Frames drawn with dirty rects must match a full redraw of the same state, pixel for pixel."""
+
+    @classmethod
+    def setUpClass(cls):
+        pygame.font.init()
+        cls.font = pygame.font.Font(None, 24)
+        solver = InterstellarMission(MAP_PATH)
+        solver.solve(mode="astar")
+        cls.solution = solver.solutions[0]
+
+    def make_mission(self) -> InterstellarMission:
+        mission = InterstellarMission(MAP_PATH)
+        mission.font = self.font
+        mission.solutions = [self.solution]
+        mission.show_solution_path = True
+        mission.show_step_by_step = True
+        return mission
+
+    def check_frames(self, states, screen_size=(800, 760)):
+        """
+        Draws each state (a dict of mission attributes) incrementally on one screen, and checks
+        the frame against a full redraw and the changed pixels against the returned dirty rects.
+        """
+        mission, reference = self.make_mission(), self.make_mission()
+        screen = pygame.Surface(screen_size)
+        mission.draw(screen)
+        for i, state in enumerate(states):
+            previous = screen.copy()
+            for name, value in state.items():
+                setattr(mission, name, value)
+                setattr(reference, name, value)
+            dirty_rects = mission.draw(screen)
+
+            expected = pygame.Surface(screen_size) # A new surface: the reference redraws everything
+            reference.draw(expected)
+            self.assertEqual(pygame.image.tobytes(screen, "RGB"), pygame.image.tobytes(expected, "RGB"),
+                             f"frame {i} ({state}) differs from a full redraw")
+
+            for rect in dirty_rects: # Outside the dirty rects, nothing may have changed
+                previous.blit(screen, rect, rect)
+            self.assertEqual(pygame.image.tobytes(previous, "RGB"), pygame.image.tobytes(screen, "RGB"),
+                             f"frame {i} ({state}) changed pixels outside its dirty rects")
+
+    def test_step_forward_then_back_to_start(self):
+        # Past the wormhole jump, whose used entry and exit are labelled "WE(U)" and "WX(U)", then
+        # back to step 0 as the N key does
+        steps = [{"current_step": step} for step in range(len(self.solution))]
+        self.check_frames(steps + [{"current_step": 0}, {"show_step_by_step": False}, {"show_solution_path": False}])
+
+    def test_zoom_and_pan(self):
+        # A small map area centred on the wormhole entry of the path, at every zoom level (those
+        # below LOD_CELL_SIZE need NumPy), stepping along the path and panning away and back
+        mission = self.make_mission()
+        entry = next(self.solution.coords(i) for i in range(len(self.solution))
+                     if self.solution.coords(i) in mission.wormholes)
+        width, height = 400, 300
+        levels = [level for level in interstellar_mission.ZOOM_LEVELS
+                  if interstellar_mission.numpy is not None or level >= interstellar_mission.LOD_CELL_SIZE]
+        states = []
+        for level in levels:
+            view_row = int(entry[0] - height / level / 2)
+            view_col = int(entry[1] - width / level / 2)
+            states.append({"cell_size": level, "view_row": view_row, "view_col": view_col, "current_step": 0})
+            states.extend({"current_step": step} for step in range(0, len(self.solution), 3))
+            states.append({"view_col": view_col + 2})
+            states.append({"current_step": 0})
+            states.append({"view_col": view_col})
+            states.append({"current_step": len(self.solution) - 1})
+        self.check_frames(states, screen_size=(width, height + 60))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+"""
+Binary universe maps: the matriz_universo.json schema as a fixed header, packed feature tables and
+the cost grid as one contiguous array, so loading memory-maps the grid instead of parsing (and
+boxing) millions of JSON numbers. InterstellarMissionCore recognises these files by their magic
+bytes, whatever their name.
+
+Usage: python universe_binary.py map.json [out.umap]
+
+Layout, little-endian:
+  header        _HEADER: magic, version, grid element type, size, origin, destination, initial
+                energy, feature table lengths, length of the wormhole ids and offset of the grid
+  tables        int64 rows: black holes (r, c), giant stars (r, c), wormholes (entry r, c, exit r, c),
+                recharge zones (r, c, multiplier), required charges (r, c, charge)
+  wormhole ids  UTF-8 JSON list with the explicit "id" of each wormhole or null; absent (length 0)
+                when no wormhole has one
+  grid          rows x cols costs, row-major, starting at a multiple of _GRID_ALIGNMENT
+
+Only load_universe needs NumPy, and it is imported there: JSON maps and the converter work without it.
+"""
+import array
+import json
+import os
+import struct
+import sys
+from typing import Dict, List, Optional
+
+MAGIC = b"UMAP"
+VERSION = 1
+SUFFIX = ".umap"
+
+_HEADER = struct.Struct("<4sHH II ii ii q IIIII I Q")
+_GRID_ALIGNMENT = 64
+# Grid element types, narrowest first: (array typecode, NumPy dtype, min, max)
+_GRID_TYPES = (
+    ("B", "<u1", 0, 2**8 - 1),
+    ("H", "<u2", 0, 2**16 - 1),
+    ("i", "<i4", -2**31, 2**31 - 1),
+    ("q", "<i8", -2**63, 2**63 - 1),
+)
+# Columns of each feature table, in file order
+_TABLE_WIDTHS = (2, 2, 4, 3, 3)
+
+
+def is_universe_file(path: str) -> bool:
+    with open(path, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def write_universe(data: Dict, path: str):
+    """
+    Writes a map dict (matriz_universo.json schema) in the binary format. The file is written next
+    to path and renamed over it, so processes still mapping the previous version keep reading it
+    intact: truncating a mapped file in place crashes them with SIGBUS.
+    """
+    rows, cols = data['matriz']['filas'], data['matriz']['columnas']
+    matrix = data['matrizInicial']
+    low = min((min(row) for row in matrix), default=0)
+    high = max((max(row) for row in matrix), default=0)
+    grid_type = next(i for i, (_, _, min_value, max_value) in enumerate(_GRID_TYPES)
+                     if min_value <= low and high <= max_value)
+    typecode = _GRID_TYPES[grid_type][0]
+
+    wormholes = data['agujerosGusano']
+    tables = (
+        [tuple(bh) for bh in data['agujerosNegros']],
+        [tuple(gs) for gs in data['estrellasGigantes']],
+        [(*wh['entrada'], *wh['salida']) for wh in wormholes],
+        [tuple(rz[:3]) for rz in data['zonasRecarga']],
+        [(*rc['coordenada'], rc['cargaGastada']) for rc in data['celdasCargaRequerida']],
+    )
+    table_values = array.array('q', [value for table in tables for entry in table for value in entry])
+    wormhole_ids = [wh.get("id") for wh in wormholes]
+    ids_bytes = json.dumps(wormhole_ids).encode() if any(wh_id is not None for wh_id in wormhole_ids) else b""
+
+    tables_end = _HEADER.size + table_values.itemsize * len(table_values) + len(ids_bytes)
+    grid_offset = -(-tables_end // _GRID_ALIGNMENT) * _GRID_ALIGNMENT
+    header = _HEADER.pack(MAGIC, VERSION, grid_type, rows, cols, *data['origen'], *data['destino'],
+                          data['cargaInicial'], *map(len, tables), len(ids_bytes), grid_offset)
+
+    big_endian = sys.byteorder == "big"
+    if big_endian:
+        table_values.byteswap()
+    temp_path = f"{path}.tmp{os.getpid()}"
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(header)
+            table_values.tofile(f)
+            f.write(ids_bytes)
+            f.write(bytes(grid_offset - tables_end))
+            for row in matrix: # One row at a time, so the grid is never held twice in memory
+                packed = array.array(typecode, row)
+                if big_endian:
+                    packed.byteswap()
+                packed.tofile(f)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def convert_json_to_universe(json_path: str, out_path: Optional[str] = None) -> str:
+    """Converts a JSON map to the binary format, by default next to it with the .umap suffix. Returns the output path."""
+    if out_path is None:
+        out_path = os.path.splitext(json_path)[0] + SUFFIX
+    with open(json_path, 'r') as f:
+        data = json.load(f)
+    write_universe(data, out_path)
+    return out_path
+
+
+def load_universe(path: str) -> Dict:
+    """
+    Reads a binary map into the same dict json.load returns for the original file, except that
+    "matrizInicial" is a read-only NumPy array of shape (rows, cols) memory-mapped over the grid:
+    nothing is read until it is touched, and processes mapping the same file (the parallel search
+    workers) share its pages instead of each holding a parsed copy.
+    """
+    import numpy as np # Only binary maps need NumPy
+
+    with open(path, 'rb') as f:
+        header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size or header[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a binary universe map")
+        (_, version, grid_type, rows, cols, origin_r, origin_c, destination_r, destination_c,
+         initial_energy, *table_lengths, ids_length, grid_offset) = _HEADER.unpack(header)
+        if version != VERSION:
+            raise ValueError(f"{path}: unsupported binary map version {version} (expected {VERSION})")
+        table_values = array.array('q')
+        table_values.fromfile(f, sum(length * width for length, width in zip(table_lengths, _TABLE_WIDTHS)))
+        if sys.byteorder == "big":
+            table_values.byteswap()
+        wormhole_ids = json.loads(f.read(ids_length)) if ids_length else [None] * table_lengths[2]
+
+    tables: List[List[List[int]]] = []
+    start = 0
+    for length, width in zip(table_lengths, _TABLE_WIDTHS):
+        tables.append([table_values[i:i + width].tolist() for i in range(start, start + length * width, width)])
+        start += length * width
+    black_holes, giant_stars, wormhole_rows, recharge_zones, required_charges = tables
+
+    wormholes = []
+    for (entry_r, entry_c, exit_r, exit_c), wh_id in zip(wormhole_rows, wormhole_ids):
+        wormhole = {"entrada": [entry_r, entry_c], "salida": [exit_r, exit_c]}
+        if wh_id is not None:
+            wormhole["id"] = wh_id
+        wormholes.append(wormhole)
+
+    return {
+        "matriz": {"filas": rows, "columnas": cols},
+        "origen": [origin_r, origin_c],
+        "destino": [destination_r, destination_c],
+        "agujerosNegros": black_holes,
+        "estrellasGigantes": giant_stars,
+        "agujerosGusano": wormholes,
+        "zonasRecarga": recharge_zones,
+        "celdasCargaRequerida": [{"coordenada": [r, c], "cargaGastada": charge} for r, c, charge in required_charges],
+        "cargaInicial": initial_energy,
+        "matrizInicial": np.memmap(path, dtype=_GRID_TYPES[grid_type][1], mode='r',
+                                   offset=grid_offset, shape=(rows, cols)),
+    }
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (2, 3):
+        sys.exit(__doc__.split("\n\n")[1])
+    print(convert_json_to_universe(*sys.argv[1:]))
@@ -0,0 +1,89 @@
+"""
+Seeded generator of synthetic universes in the matriz_universo.json schema, for benchmarking the
+solver on maps of any size (see benchmark_solver.py). The same arguments always give the same map.
+
+Usage: python universe_generator.py rows cols [seed] [out.json|out.umap]
+Without an output path the map goes to universe_<rows>x<cols>_<seed>.json; a .umap path writes the
+binary format of universe_binary.py instead.
+"""
+import json
+import random
+import sys
+from typing import Dict, Optional
+from universe_binary import SUFFIX, write_universe
+
+# Feature densities, as fractions of the cells. The defaults are close to the bundled 35x40 map.
+BLACK_HOLE_DENSITY = 0.002
+GIANT_STAR_DENSITY = 0.002
+WORMHOLE_DENSITY = 0.0015 # Wormholes, each taking an entry and an exit cell
+RECHARGE_ZONE_DENSITY = 0.007
+REQUIRED_CHARGE_DENSITY = 0.0015
+MAX_COST = 10
+
+
+def generate_universe(rows: int, cols: int, seed: int = 0,
+                      black_hole_density: float = BLACK_HOLE_DENSITY,
+                      giant_star_density: float = GIANT_STAR_DENSITY,
+                      wormhole_density: float = WORMHOLE_DENSITY,
+                      recharge_zone_density: float = RECHARGE_ZONE_DENSITY,
+                      required_charge_density: float = REQUIRED_CHARGE_DENSITY,
+                      max_cost: int = MAX_COST,
+                      initial_energy: Optional[int] = None) -> Dict:
+    """
+    Returns a map dict with the origin and destination in opposite corners, costs drawn uniformly
+    from 0..max_cost and every feature on its own cell. Recharge multipliers are 2..5 and required
+    charges up to four times max_cost. The initial energy defaults to a quarter of the cost of a
+    straight path at max_cost per cell, like the bundled map: most maps then need recharges, and
+    some have no path at all.
+    """
+    rnd = random.Random(seed)
+    num_cells = rows * cols
+    origin, destination = 0, num_cells - 1
+    counts = [round(density * num_cells) for density in
+              (black_hole_density, giant_star_density, wormhole_density, wormhole_density,
+               recharge_zone_density, required_charge_density)]
+    if sum(counts) > num_cells - 2:
+        raise ValueError(f"Feature densities need {sum(counts)} cells, but a {rows}x{cols} map only has {num_cells - 2} free")
+    # random.sample on a range picks without building the list of cells, which matters on huge maps
+    cells = rnd.sample(range(1, num_cells - 1), sum(counts))
+    picked = []
+    for count in counts:
+        picked.append([list(divmod(cell, cols)) for cell in cells[:count]])
+        cells = cells[count:]
+    black_holes, giant_stars, wormhole_entries, wormhole_exits, recharge_zones, required_charges = picked
+
+    if initial_energy is None:
+        initial_energy = (rows + cols) * max_cost // 4
+    return {
+        "matriz": {"filas": rows, "columnas": cols},
+        "origen": list(divmod(origin, cols)),
+        "destino": list(divmod(destination, cols)),
+        "agujerosNegros": black_holes,
+        "estrellasGigantes": giant_stars,
+        "agujerosGusano": [{"entrada": entry, "salida": exit_cell} for entry, exit_cell in zip(wormhole_entries, wormhole_exits)],
+        "zonasRecarga": [[r, c, rnd.randint(2, 5)] for r, c in recharge_zones],
+        "celdasCargaRequerida": [{"coordenada": coord, "cargaGastada": rnd.randint(max_cost, 4 * max_cost)}
+                                 for coord in required_charges],
+        "cargaInicial": initial_energy,
+        "matrizInicial": [[rnd.randint(0, max_cost) for _ in range(cols)] for _ in range(rows)],
+    }
+
+
+def write_generated_universe(path: str, rows: int, cols: int, seed: int = 0, **options) -> str:
+    """Generates a map and writes it to path, as JSON or, for a .umap path, in the binary format. Returns path."""
+    data = generate_universe(rows, cols, seed, **options)
+    if path.endswith(SUFFIX):
+        write_universe(data, path)
+    else:
+        with open(path, 'w') as f:
+            json.dump(data, f)
+    return path
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (3, 4, 5):
+        sys.exit(__doc__.split("\n\n")[1])
+    rows, cols = int(sys.argv[1]), int(sys.argv[2])
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    out_path = sys.argv[4] if len(sys.argv) > 4 else f"universe_{rows}x{cols}_{seed}.json"
+    print(write_generated_universe(out_path, rows, cols, seed))